@@ -86,24 +86,37 @@ class VecEnvRLGames(VecEnvBase):
             .clone()
         )
 
+        profiler = self._task.profiler
+        profiler.start_step()
+        profiler.start("pre_physics_step")
         self._task.pre_physics_step(actions)
+        profiler.stop("pre_physics_step")
 
         for _ in range(self._task.control_frequency_inv - 1):
+            profiler.start("physics_step")
             self._task.apply_forces()
             self._world.step(render=False)
+            profiler.stop("physics_step")
+            profiler.start("update_state")
             self._task.update_state()
+            profiler.stop("update_state")
             self.sim_frame_count += 1
 
+        profiler.start("physics_step")
         self._task.apply_forces()
         self._world.step(render=self._render)
+        profiler.stop("physics_step")
         self.sim_frame_count += 1
 
+        profiler.start("post_physics_step")
         (
             self._obs,
             self._rew,
             self._resets,
             self._extras,
         ) = self._task.post_physics_step()
+        profiler.stop("post_physics_step")
+        profiler.count_resets(self._resets)
 
         if self._task.randomize_observations:
             self._obs = self._task._dr_randomizer.apply_observations_randomization(
@@ -112,7 +125,10 @@ class VecEnvRLGames(VecEnvBase):
             )
 
         self._states = self._task.get_states()
+        profiler.start("process_data")
         self._process_data()
+        profiler.stop("process_data")
+        profiler.stop_step()
 
         obs_dict = {"obs": self._obs, "states": self._states}
 
@@ -69,25 +69,43 @@ class VecEnvRLGames(VecEnvBase):
 
         actions = torch.clamp(actions, -self._task.clip_actions, self._task.clip_actions).to(self._task.device).clone()
 
+        profiler = self._task.profiler
+        profiler.start_step()
+        profiler.start("pre_physics_step")
         self._task.pre_physics_step(actions)
+        profiler.stop("pre_physics_step")
         
         for _ in range(self._task.control_frequency_inv - 1):
+            profiler.start("physics_step")
             self._world.step(render=False)
+            profiler.stop("physics_step")
+            profiler.start("update_state")
             self._task.update_state()
+            profiler.stop("update_state")
+            profiler.start("apply_forces")
             self._task.apply_forces()
+            profiler.stop("apply_forces")
             self.sim_frame_count += 1
 
+        profiler.start("physics_step")
         self._world.step(render=self._render)
+        profiler.stop("physics_step")
         self.sim_frame_count += 1
 
+        profiler.start("post_physics_step")
         self._obs, self._rew, self._resets, self._extras = self._task.post_physics_step()
+        profiler.stop("post_physics_step")
+        profiler.count_resets(self._resets)
 
         if self._task.randomize_observations:
             self._obs = self._task._dr_randomizer.apply_observations_randomization(
                 observations=self._obs.to(device=self._task.rl_device), reset_buf=self._task.reset_buf)
 
         self._states = self._task.get_states()
+        profiler.start("process_data")
         self._process_data()
+        profiler.stop("process_data")
+        profiler.stop_step()
         
         obs_dict = {"obs": self._obs, "states": self._states}
 
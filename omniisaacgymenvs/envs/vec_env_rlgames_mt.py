@@ -31,6 +31,7 @@ from omni.isaac.gym.vec_env import VecEnvMT
 from omni.isaac.gym.vec_env import TaskStopException
 
 from .vec_env_rlgames import VecEnvRLGames
+from omniisaacgymenvs.utils.mt_exchange import DoubleBufferExchange
 
 import torch
 import numpy as np
@@ -39,7 +40,31 @@ import numpy as np
 # VecEnv Wrapper for RL training
 class VecEnvRLGamesMT(VecEnvRLGames, VecEnvMT):
 
+    _exchange = None
+
+    def set_exchange_mode(self, mode="double_buffer"):
+        """Selects how the data is handed over from the simulation thread to the training thread.
+        "queue" clones the data on every step, "double_buffer" copies it into two preallocated sets of buffers.
+        The episode-static observations of the task are only copied when they change."""
+        assert mode in ["queue", "double_buffer"], "The exchange mode must be queue or double_buffer."
+        static_keys = getattr(self._task, "static_observations", [])
+        self._exchange = DoubleBufferExchange(static_keys) if mode == "double_buffer" else None
+
+    def send_data(self, data, block=True):
+        if (self._exchange is not None) and isinstance(data, dict) and ("obs" in data):
+            data = self._exchange.write(data)
+        super().send_data(data, block)
+
     def _parse_data(self, data):
+        if "buffer" in data:
+            # the buffers are not written again until the step after next, no copy is needed
+            data = self._exchange.read(data)
+            self._obs = data["obs"]
+            self._rew = data["rew"].to(self._task.rl_device)
+            self._states = torch.clamp(data["states"], -self._task.clip_obs, self._task.clip_obs).to(self._task.rl_device)
+            self._resets = data["reset"].to(self._task.rl_device)
+            self._extras = data["extras"]
+            return
         self._obs = data["obs"].clone()
         self._rew = data["rew"].to(self._task.rl_device).clone()
         self._states = torch.clamp(data["states"], -self._task.clip_obs, self._task.clip_obs).to(self._task.rl_device).clone()
@@ -55,8 +80,14 @@ class VecEnvRLGamesMT(VecEnvRLGames, VecEnvMT):
 
         actions = torch.clamp(actions, -self._task.clip_actions, self._task.clip_actions).to(self._task.device).clone()
 
+        profiler = self._task.profiler
+        profiler.start_step()
+        profiler.start("simulation")
         self.send_actions(actions)
         data = self.get_data()
+        profiler.stop("simulation")
+        profiler.count_resets(self._resets)
+        profiler.stop_step()
 
         if self._task.randomize_observations:
             self._obs = self._task._dr_randomizer.apply_observations_randomization(observations=self._obs.to(self._task.rl_device), reset_buf=self._task.reset_buf)
@@ -21,24 +21,32 @@ from omniisaacgymenvs.mujoco_envs.controllers.discrete_LQR_controller import (
 from omniisaacgymenvs.mujoco_envs.controllers.RL_games_model_4_mujoco import (
     RLGamesModel,
 )
+from omniisaacgymenvs.mujoco_envs.controllers.telemetry import TelemetryLogger
 
 
 class BaseController:
     """
     Base class for high-level controllers."""
 
-    def __init__(self, dt: float, save_dir: str = "mujoco_experiment") -> None:
+    def __init__(
+        self,
+        dt: float,
+        save_dir: str = "mujoco_experiment",
+        telemetry_buffer_size: int = 1000,
+    ) -> None:
         """
         Initializes the controller.
 
         Args:
             dt (float): Simulation time step.
             save_dir (str, optional): Directory to save the simulation data. Defaults to "mujoco_experiment".
+            telemetry_buffer_size (int, optional): Number of steps kept in memory before being written to disk. Defaults to 1000.
         """
 
         self.save_dir = save_dir
         self.dt = dt
         self.time = 0
+        self.telemetry_buffer_size = telemetry_buffer_size
 
         self.csv_datas = []
         self.initializeLoggers()
@@ -48,30 +56,44 @@ class BaseController:
         Initializes the loggers for the simulation.
         Allowing for the simulation to be replayed/plotted."""
 
-        self.logs = {}
-        self.logs["timevals"] = []
-        self.logs["angular_velocity"] = []
-        self.logs["linear_velocity"] = []
-        self.logs["position"] = []
-        self.logs["quaternion"] = []
-        self.logs["actions"] = []
+        self.telemetry = TelemetryLogger(
+            save_dir=self.save_dir, buffer_size=self.telemetry_buffer_size
+        )
+        self.telemetry.addChannel("timevals")
+        self.telemetry.addChannel("angular_velocity")
+        self.telemetry.addChannel("linear_velocity")
+        self.telemetry.addChannel("position")
+        self.telemetry.addChannel("quaternion")
+        self.telemetry.addChannel("actions")
 
     def updateLoggers(self, state: Dict[str, np.ndarray], action: np.ndarray) -> None:
         """
         Updates the loggers for the simulation.
+        This commits the current row of the telemetry, hence controllers logging
+        additional channels must log them before calling this method.
 
         Args:
             state (Dict[str, np.ndarray]): State of the system.
             action (np.ndarray): Action taken by the controller."""
 
-        self.logs["timevals"].append(self.time)
-        self.logs["position"].append(state["position"])
-        self.logs["quaternion"].append(state["quaternion"])
-        self.logs["angular_velocity"].append(state["angular_velocity"])
-        self.logs["linear_velocity"].append(state["linear_velocity"])
-        self.logs["actions"].append(action)
+        self.telemetry.log("timevals", self.time)
+        self.telemetry.log("position", state["position"])
+        self.telemetry.log("quaternion", state["quaternion"])
+        self.telemetry.log("angular_velocity", state["angular_velocity"])
+        self.telemetry.log("linear_velocity", state["linear_velocity"])
+        self.telemetry.log("actions", action)
+        self.telemetry.step()
         self.time += self.dt
 
+    def getLogs(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the data logged so far.
+
+        Returns:
+            Dict[str, np.ndarray]: Logged data of each channel."""
+
+        return self.telemetry.read()
+
     def isDone(self) -> bool:
         """
         Checks if the simulation is done.
@@ -111,14 +133,15 @@ class BaseController:
             height (int, optional): Height of the figure. Defaults to 800."""
 
         figsize = (width / dpi, height / dpi)
+        logs = self.getLogs()
 
         fig, ax = plt.subplots(2, 1, figsize=figsize, dpi=dpi)
 
-        ax[0].plot(self.logs["timevals"], self.logs["angular_velocity"])
+        ax[0].plot(logs["timevals"], logs["angular_velocity"])
         ax[0].set_title("angular velocity")
         ax[0].set_ylabel("radians / second")
 
-        ax[1].plot(self.logs["timevals"], self.logs["linear_velocity"])
+        ax[1].plot(logs["timevals"], logs["linear_velocity"])
         ax[1].set_xlabel("time (seconds)")
         ax[1].set_ylabel("meters / second")
         _ = ax[1].set_title("linear_velocity")
@@ -129,15 +152,13 @@ class BaseController:
             print("Saving failed: ", e)
 
         fig, ax = plt.subplots(2, 1, figsize=figsize, dpi=dpi)
-        ax[0].plot(self.logs["timevals"], np.abs(self.logs["position"]))
+        ax[0].plot(logs["timevals"], np.abs(logs["position"]))
         ax[0].set_xlabel("time (seconds)")
         ax[0].set_ylabel("meters")
         _ = ax[0].set_title("position")
         ax[0].set_yscale("log")
 
-        ax[1].plot(
-            np.array(self.logs["position"])[:, 0], np.array(self.logs["position"])[:, 1]
-        )
+        ax[1].plot(logs["position"][:, 0], logs["position"][:, 1])
         ax[1].set_xlabel("meters")
         ax[1].set_ylabel("meters")
         _ = ax[1].set_title("x y coordinates")
@@ -158,15 +179,17 @@ class BaseController:
         var_name = ["x", "y", "z", "w"]
         try:
             os.makedirs(self.save_dir, exist_ok=True)
+            self.telemetry.flush()
+            logs = self.getLogs()
             csv_data = pd.DataFrame()
-            for key in self.logs.keys():
-                if len(self.logs[key]) != 0:
+            for key in logs.keys():
+                if len(logs[key]) != 0:
                     if key == "actions":
-                        data = np.array(self.logs[key])
+                        data = logs[key]
                         for i in range(data.shape[1]):
                             csv_data["t_" + str(i)] = data[:, i]
                     else:
-                        data = np.array(self.logs[key])
+                        data = logs[key]
                         if len(data.shape) > 1:
                             for i in range(data.shape[1]):
                                 csv_data[var_name[i] + "_" + key] = data[:, i]
@@ -212,6 +235,7 @@ class PoseController(BaseController):
         position_distance_threshold: float = 0.03,
         orientation_distance_threshold: float = 0.03,
         save_dir: str = "mujoco_experiment",
+        telemetry_buffer_size: int = 1000,
         **kwargs
     ) -> None:
         """
@@ -226,9 +250,10 @@ class PoseController(BaseController):
             position_distance_threshold (float, optional): Distance threshold for the position. Defaults to 0.03.
             orientation_distance_threshold (float, optional): Distance threshold for the orientation. Defaults to 0.03.
             save_dir (str, optional): Directory to save the simulation data. Defaults to "mujoco_experiment".
+            telemetry_buffer_size (int, optional): Number of steps kept in memory before being written to disk. Defaults to 1000.
             **kwargs: Additional arguments."""
 
-        super().__init__(dt, save_dir)
+        super().__init__(dt, save_dir, telemetry_buffer_size)
         # Discrete controller
         self.model = model
         # Creates an array goals
@@ -248,8 +273,8 @@ class PoseController(BaseController):
         Initializes the loggers."""
 
         super().initializeLoggers()
-        self.logs["position_target"] = []
-        self.logs["heading_target"] = []
+        self.telemetry.addChannel("position_target")
+        self.telemetry.addChannel("heading_target")
 
     def updateLoggers(self, state, actions) -> None:
         """
@@ -259,9 +284,9 @@ class PoseController(BaseController):
             state (Dict[str, np.ndarray]): State of the system.
             actions (np.ndarray): Action taken by the controller."""
 
+        self.telemetry.log("position_target", self.current_goal[:2])
+        self.telemetry.log("heading_target", self.current_goal[-1])
         super().updateLoggers(state, actions)
-        self.logs["position_target"].append(self.current_goal[:2])
-        self.logs["heading_target"].append(self.current_goal[-1])
 
     def isGoalReached(self, state: Dict[str, np.ndarray]) -> bool:
         """
@@ -354,16 +379,17 @@ class PoseController(BaseController):
             height (int, optional): Height of the figure. Defaults to 1000."""
 
         figsize = (width / dpi, height / dpi)
+        logs = self.getLogs()
 
         fig, ax = plt.subplots(2, 1, figsize=figsize, dpi=dpi)
 
-        ax[0].plot(self.logs["timevals"], self.logs["angular_velocity"])
+        ax[0].plot(logs["timevals"], logs["angular_velocity"])
         ax[0].set_title("angular velocity")
         ax[0].set_ylabel("radians / second")
 
         ax[1].plot(
-            self.logs["timevals"],
-            self.logs["linear_velocity"],
+            logs["timevals"],
+            logs["linear_velocity"],
             label="system velocities",
         )
         ax[1].legend()
@@ -378,13 +404,13 @@ class PoseController(BaseController):
 
         fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
         ax.scatter(
-            np.array(self.logs["position_target"])[:, 0],
-            np.array(self.logs["position_target"])[:, 1],
+            logs["position_target"][:, 0],
+            logs["position_target"][:, 1],
             label="position goals",
         )
         ax.plot(
-            np.array(self.logs["position"])[:, 0],
-            np.array(self.logs["position"])[:, 1],
+            logs["position"][:, 0],
+            logs["position"][:, 1],
             label="system position",
         )
         ax.legend()
@@ -400,9 +426,7 @@ class PoseController(BaseController):
             print("Saving failed: ", e)
 
         fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
-        ax.plot(
-            self.logs["timevals"], np.array(self.logs["actions"]), label="system action"
-        )
+        ax.plot(logs["timevals"], logs["actions"], label="system action")
         plt.tight_layout()
         try:
             os.makedirs(self.save_dir, exist_ok=True)
@@ -420,6 +444,7 @@ class PositionController(BaseController):
         goals_y: List[float],
         position_distance_threshold: float = 0.03,
         save_dir: str = "mujoco_experiment",
+        telemetry_buffer_size: int = 1000,
         **kwargs
     ) -> None:
         """
@@ -432,9 +457,10 @@ class PositionController(BaseController):
             goals_y (List[float]): List of y coordinates of the goals.
             position_distance_threshold (float, optional): Distance threshold for the position. Defaults to 0.03.
             save_dir (str, optional): Directory to save the simulation data. Defaults to "mujoco_experiment".
+            telemetry_buffer_size (int, optional): Number of steps kept in memory before being written to disk. Defaults to 1000.
             **kwargs: Additional arguments."""
 
-        super().__init__(dt, save_dir)
+        super().__init__(dt, save_dir, telemetry_buffer_size)
         self.model = model
         self.goals = np.array([goals_x, goals_y, [0] * len(goals_x)]).T
         self.current_goal = self.goals[0]
@@ -445,7 +471,7 @@ class PositionController(BaseController):
         Initializes the loggers."""
 
         super().initializeLoggers()
-        self.logs["position_target"] = []
+        self.telemetry.addChannel("position_target")
 
     def updateLoggers(self, state, actions) -> None:
         """
@@ -455,8 +481,8 @@ class PositionController(BaseController):
             state (Dict[str, np.ndarray]): State of the system.
             actions (np.ndarray): Action taken by the controller."""
 
+        self.telemetry.log("position_target", self.current_goal[:2])
         super().updateLoggers(state, actions)
-        self.logs["position_target"].append(self.current_goal[:2])
 
     def isGoalReached(self, state: Dict[str, np.ndarray]) -> bool:
         """
@@ -539,16 +565,17 @@ class PositionController(BaseController):
             height (int, optional): Height of the figure. Defaults to 1000."""
 
         figsize = (width / dpi, height / dpi)
+        logs = self.getLogs()
 
         fig, ax = plt.subplots(2, 1, figsize=figsize, dpi=dpi)
 
-        ax[0].plot(self.logs["timevals"], self.logs["angular_velocity"])
+        ax[0].plot(logs["timevals"], logs["angular_velocity"])
         ax[0].set_title("angular velocity")
         ax[0].set_ylabel("radians / second")
 
         ax[1].plot(
-            self.logs["timevals"],
-            self.logs["linear_velocity"],
+            logs["timevals"],
+            logs["linear_velocity"],
             label="system velocities",
         )
         ax[1].legend()
@@ -563,13 +590,13 @@ class PositionController(BaseController):
 
         fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
         ax.scatter(
-            np.array(self.logs["position_target"])[:, 0],
-            np.array(self.logs["position_target"])[:, 1],
+            logs["position_target"][:, 0],
+            logs["position_target"][:, 1],
             label="position goals",
         )
         ax.plot(
-            np.array(self.logs["position"])[:, 0],
-            np.array(self.logs["position"])[:, 1],
+            logs["position"][:, 0],
+            logs["position"][:, 1],
             label="system position",
         )
         ax.legend()
@@ -585,9 +612,7 @@ class PositionController(BaseController):
             print("Saving failed: ", e)
 
         fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
-        ax.plot(
-            self.logs["timevals"], np.array(self.logs["actions"]), label="system action"
-        )
+        ax.plot(logs["timevals"], logs["actions"], label="system action")
         plt.tight_layout()
         try:
             os.makedirs(self.save_dir, exist_ok=True)
@@ -791,6 +816,7 @@ class VelocityTracker(BaseController):
         num_loops: int = 4,
         trajectory_type: str = "circle",
         save_dir: str = "mujoco_experiment",
+        telemetry_buffer_size: int = 1000,
         **kwargs
     ) -> None:
         """
@@ -811,9 +837,10 @@ class VelocityTracker(BaseController):
             num_loops (int, optional): Number of loops. Defaults to 4.
             trajectory_type (str, optional): Type of trajectory. Defaults to "circle".
             save_dir (str, optional): Directory to save the simulation data. Defaults to "mujoco_experiment".
+            telemetry_buffer_size (int, optional): Number of steps kept in memory before being written to disk. Defaults to 1000.
             **kwargs: Additional arguments."""
 
-        super().__init__(dt, save_dir)
+        super().__init__(dt, save_dir, telemetry_buffer_size)
         self.tracker = TrajectoryTracker(
             lookahead=lookahead_dist, closed=closed, offset=(x_offset, y_offset)
         )
@@ -839,8 +866,8 @@ class VelocityTracker(BaseController):
         Initializes the loggers."""
 
         super().initializeLoggers()
-        self.logs["velocity_goal"] = []
-        self.logs["position_target"] = []
+        self.telemetry.addChannel("velocity_goal")
+        self.telemetry.addChannel("position_target")
 
     def updateLoggers(self, state, actions) -> None:
         """
@@ -850,9 +877,9 @@ class VelocityTracker(BaseController):
             state (Dict[str, np.ndarray]): State of the system.
             actions (np.ndarray): Action taken by the controller."""
 
+        self.telemetry.log("velocity_goal", self.velocity_goal[:2])
+        self.telemetry.log("position_target", self.getTargetPosition())
         super().updateLoggers(state, actions)
-        self.logs["velocity_goal"].append(self.velocity_goal[:2])
-        self.logs["position_target"].append(self.getTargetPosition())
 
     def getGoal(self) -> np.ndarray:
         """
@@ -927,16 +954,17 @@ class VelocityTracker(BaseController):
             height (int, optional): Height of the figure. Defaults to 1000."""
 
         figsize = (width / dpi, height / dpi)
+        logs = self.getLogs()
 
         fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
 
         ax.plot(
-            self.logs["timevals"],
-            self.logs["linear_velocity"],
+            logs["timevals"],
+            logs["linear_velocity"],
             label="system velocities",
         )
         ax.plot(
-            self.logs["timevals"], self.logs["velocity_goal"], label="target velocities"
+            logs["timevals"], logs["velocity_goal"], label="target velocities"
         )
         ax.legend()
         ax.set_xlabel("time (seconds)")
@@ -950,13 +978,13 @@ class VelocityTracker(BaseController):
 
         fig, ax = plt.subplots(1, 1, figsize=figsize, dpi=dpi)
         ax.plot(
-            np.array(self.logs["position_target"])[:, 0],
-            np.array(self.logs["position_target"])[:, 1],
+            logs["position_target"][:, 0],
+            logs["position_target"][:, 1],
             label="trajectory",
         )
         ax.plot(
-            np.array(self.logs["position"])[:, 0],
-            np.array(self.logs["position"])[:, 1],
+            logs["position"][:, 0],
+            logs["position"][:, 1],
             label="system position",
         )
         ax.legend()
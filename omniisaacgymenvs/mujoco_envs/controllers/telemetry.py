@@ -0,0 +1,190 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from typing import Dict
+import numpy as np
+import threading
+import datetime
+import queue
+import glob
+import os
+
+
+class TelemetryLogger:
+    """
+    Streaming telemetry logger.
+    Each channel is stored inside a preallocated NumPy buffer of fixed size. All the
+    channels share the same row index, such that a row corresponds to one control step.
+    When the buffers are full, they are handed over to a background thread that writes
+    them to disk as an append-only sequence of chunked .npz files, while logging
+    continues in a second set of buffers. This keeps the memory bounded and ensures
+    that at most one chunk of data is lost if the process crashes."""
+
+    def __init__(
+        self,
+        save_dir: str = "mujoco_experiment",
+        buffer_size: int = 1000,
+        num_buffers: int = 2,
+        session_name: str = None,
+    ) -> None:
+        """
+        Initializes the telemetry logger.
+
+        Args:
+            save_dir (str, optional): Directory to save the telemetry. Defaults to "mujoco_experiment".
+            buffer_size (int, optional): Number of rows stored in a chunk. Defaults to 1000.
+            num_buffers (int, optional): Number of buffer sets used to overlap logging and writing. Defaults to 2.
+            session_name (str, optional): Name of the telemetry folder. Defaults to a timestamped name.
+        """
+
+        assert buffer_size > 0, "The buffer size must be strictly positive."
+        assert num_buffers > 1, "At least two buffer sets are required."
+
+        if session_name is None:
+            session_name = "telemetry_" + datetime.datetime.now().strftime(
+                "%Y%m%d-%H%M%S-%f"
+            )
+        self.save_dir = os.path.join(save_dir, session_name)
+        self.buffer_size = buffer_size
+        self.channels = []
+
+        # Buffer sets. One is used for logging, the others are either free or being written.
+        self._free_buffers = queue.Queue()
+        for _ in range(num_buffers - 1):
+            self._free_buffers.put({})
+        self._buffers = {}
+        self._row = 0
+        self._num_chunks = 0
+
+        # Background writer
+        self._write_queue = queue.Queue()
+        self._writer = None
+
+    def addChannel(self, name: str) -> None:
+        """
+        Registers a new channel. The buffers of the channel are allocated on the first
+        write, once the shape and data type of the channel are known.
+
+        Args:
+            name (str): Name of the channel."""
+
+        if name not in self.channels:
+            self.channels.append(name)
+
+    def log(self, name: str, value: np.ndarray) -> None:
+        """
+        Writes a value in the current row of a channel.
+
+        Args:
+            name (str): Name of the channel.
+            value (np.ndarray): Value to be logged."""
+
+        buffer = self._buffers.get(name, None)
+        if buffer is None:
+            value = np.asarray(value)
+            buffer = np.zeros((self.buffer_size,) + value.shape, dtype=value.dtype)
+            self._buffers[name] = buffer
+            self.addChannel(name)
+        buffer[self._row] = value
+
+    def step(self) -> None:
+        """
+        Commits the current row. Once the buffers are full, they are sent to the
+        background writer."""
+
+        self._row += 1
+        if self._row == self.buffer_size:
+            self._submit()
+
+    def _submit(self) -> None:
+        """
+        Sends the current buffers to the background writer, and swaps them with a
+        free set of buffers. Blocks if the writer is lagging behind."""
+
+        if self._row == 0:
+            return
+        if self._writer is None:
+            os.makedirs(self.save_dir, exist_ok=True)
+            self._writer = threading.Thread(target=self._writeLoop, daemon=True)
+            self._writer.start()
+        self._write_queue.put((self._num_chunks, self._buffers, self._row))
+        self._num_chunks += 1
+        self._buffers = self._free_buffers.get()
+        self._row = 0
+
+    def _writeLoop(self) -> None:
+        """
+        Writes the chunks handed over by the logging thread.
+        The chunks are first written to a temporary file and then renamed, such that
+        a chunk on disk is always complete."""
+
+        while True:
+            chunk_id, buffers, num_rows = self._write_queue.get()
+            try:
+                path = os.path.join(self.save_dir, "chunk_%06d" % chunk_id)
+                np.savez(
+                    path + ".tmp.npz",
+                    **{key: value[:num_rows] for key, value in buffers.items()}
+                )
+                os.replace(path + ".tmp.npz", path + ".npz")
+            except Exception as e:
+                print("Saving failed: ", e)
+            finally:
+                self._free_buffers.put(buffers)
+                self._write_queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Writes the rows that have not been written yet, and waits for the background
+        writer to be done."""
+
+        self._submit()
+        self._write_queue.join()
+
+    def read(self) -> Dict[str, np.ndarray]:
+        """
+        Reads all the telemetry collected so far, including the rows that are not yet
+        written to disk.
+
+        Returns:
+            Dict[str, np.ndarray]: The telemetry of each channel."""
+
+        self._write_queue.join()
+        logs = loadTelemetry(self.save_dir)
+        for key in self.channels:
+            chunks = [logs[key]] if key in logs else []
+            if key in self._buffers:
+                chunks.append(self._buffers[key][: self._row])
+            if len(chunks) == 0:
+                logs[key] = np.array([])
+            else:
+                logs[key] = np.concatenate(chunks, axis=0)
+        return logs
+
+
+def loadTelemetry(path: str) -> Dict[str, np.ndarray]:
+    """
+    Loads the telemetry saved by a TelemetryLogger.
+
+    Args:
+        path (str): Path to the telemetry folder.
+
+    Returns:
+        Dict[str, np.ndarray]: The telemetry of each channel."""
+
+    chunks = {}
+    files = sorted(glob.glob(os.path.join(path, "chunk_*.npz")))
+    for file in files:
+        if file.endswith(".tmp.npz"):
+            continue
+        with np.load(file) as data:
+            for key in data.files:
+                chunks.setdefault(key, []).append(data[key])
+    return {key: np.concatenate(value, axis=0) for key, value in chunks.items()}
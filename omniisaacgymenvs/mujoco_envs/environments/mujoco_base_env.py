@@ -38,82 +38,77 @@ def parseEnvironmentConfig(
     Returns:
         Dict[str, Union[float, int, Dict]]: The parsed configuration dictionary."""
 
+    env_cfg = dict(cfg["task"]["env"])
+    # The task configs group the disturbances by type, flattens them. The forces and
+    # torques groups both define floor_* frequencies and offsets. The MuJoCo
+    # disturbances share them, so the torques must not silently override the floor.
+    groups = dict(env_cfg.get("disturbances", {}))
+    torques = groups.pop("torques", {})
+    for group in groups.values():
+        env_cfg.update(group)
+    for key, value in torques.items():
+        if key.startswith("floor_"):
+            assert env_cfg.setdefault(key, value) == value, (
+                "The MuJoCo environment uses the same " + key + " for the floor and "
+                "the torque disturbances, but the task config sets different values."
+            )
+        else:
+            env_cfg[key] = value
+
     new_cfg = {}
     new_cfg["disturbances"] = {}
     new_cfg["disturbances"]["seed"] = cfg["seed"]
-    new_cfg["disturbances"]["use_uneven_floor"] = cfg["task"]["env"]["use_uneven_floor"]
-    new_cfg["disturbances"]["use_sinusoidal_floor"] = cfg["task"]["env"][
-        "use_sinusoidal_floor"
-    ]
-    new_cfg["disturbances"]["floor_min_freq"] = cfg["task"]["env"]["floor_min_freq"]
-    new_cfg["disturbances"]["floor_max_freq"] = cfg["task"]["env"]["floor_max_freq"]
-    new_cfg["disturbances"]["floor_min_offset"] = cfg["task"]["env"]["floor_min_offset"]
-    new_cfg["disturbances"]["floor_max_offset"] = cfg["task"]["env"]["floor_max_offset"]
-    new_cfg["disturbances"]["min_floor_force"] = cfg["task"]["env"]["min_floor_force"]
-    new_cfg["disturbances"]["max_floor_force"] = cfg["task"]["env"]["max_floor_force"]
-
-    new_cfg["disturbances"]["use_torque_disturbance"] = cfg["task"]["env"][
+    new_cfg["disturbances"]["use_uneven_floor"] = env_cfg["use_uneven_floor"]
+    new_cfg["disturbances"]["use_sinusoidal_floor"] = env_cfg["use_sinusoidal_floor"]
+    new_cfg["disturbances"]["floor_min_freq"] = env_cfg["floor_min_freq"]
+    new_cfg["disturbances"]["floor_max_freq"] = env_cfg["floor_max_freq"]
+    new_cfg["disturbances"]["floor_min_offset"] = env_cfg["floor_min_offset"]
+    new_cfg["disturbances"]["floor_max_offset"] = env_cfg["floor_max_offset"]
+    new_cfg["disturbances"]["min_floor_force"] = env_cfg["min_floor_force"]
+    new_cfg["disturbances"]["max_floor_force"] = env_cfg["max_floor_force"]
+
+    new_cfg["disturbances"]["use_torque_disturbance"] = env_cfg[
         "use_torque_disturbance"
     ]
-    new_cfg["disturbances"]["use_sinusoidal_torque"] = cfg["task"]["env"][
-        "use_sinusoidal_torque"
-    ]
-    new_cfg["disturbances"]["min_torque"] = cfg["task"]["env"]["min_torque"]
-    new_cfg["disturbances"]["max_torque"] = cfg["task"]["env"]["max_torque"]
-
-    new_cfg["disturbances"]["add_noise_on_pos"] = cfg["task"]["env"]["add_noise_on_pos"]
-    new_cfg["disturbances"]["position_noise_min"] = cfg["task"]["env"][
-        "position_noise_min"
-    ]
-    new_cfg["disturbances"]["position_noise_max"] = cfg["task"]["env"][
-        "position_noise_max"
-    ]
-    new_cfg["disturbances"]["add_noise_on_vel"] = cfg["task"]["env"]["add_noise_on_vel"]
-    new_cfg["disturbances"]["velocity_noise_min"] = cfg["task"]["env"][
-        "velocity_noise_min"
-    ]
-    new_cfg["disturbances"]["velocity_noise_max"] = cfg["task"]["env"][
-        "velocity_noise_max"
-    ]
-    new_cfg["disturbances"]["add_noise_on_heading"] = cfg["task"]["env"][
-        "add_noise_on_heading"
-    ]
-    new_cfg["disturbances"]["heading_noise_min"] = cfg["task"]["env"][
-        "heading_noise_min"
-    ]
-    new_cfg["disturbances"]["heading_noise_max"] = cfg["task"]["env"][
-        "heading_noise_max"
-    ]
-
-    new_cfg["disturbances"]["add_noise_on_act"] = cfg["task"]["env"]["add_noise_on_act"]
-    new_cfg["disturbances"]["min_action_noise"] = cfg["task"]["env"]["min_action_noise"]
-    new_cfg["disturbances"]["max_action_noise"] = cfg["task"]["env"]["max_action_noise"]
+    new_cfg["disturbances"]["use_sinusoidal_torque"] = env_cfg["use_sinusoidal_torque"]
+    new_cfg["disturbances"]["min_torque"] = env_cfg["min_torque"]
+    new_cfg["disturbances"]["max_torque"] = env_cfg["max_torque"]
+
+    new_cfg["disturbances"]["add_noise_on_pos"] = env_cfg["add_noise_on_pos"]
+    new_cfg["disturbances"]["position_noise_min"] = env_cfg["position_noise_min"]
+    new_cfg["disturbances"]["position_noise_max"] = env_cfg["position_noise_max"]
+    new_cfg["disturbances"]["add_noise_on_vel"] = env_cfg["add_noise_on_vel"]
+    new_cfg["disturbances"]["velocity_noise_min"] = env_cfg["velocity_noise_min"]
+    new_cfg["disturbances"]["velocity_noise_max"] = env_cfg["velocity_noise_max"]
+    new_cfg["disturbances"]["add_noise_on_heading"] = env_cfg["add_noise_on_heading"]
+    new_cfg["disturbances"]["heading_noise_min"] = env_cfg["heading_noise_min"]
+    new_cfg["disturbances"]["heading_noise_max"] = env_cfg["heading_noise_max"]
+
+    new_cfg["disturbances"]["add_noise_on_act"] = env_cfg["add_noise_on_act"]
+    new_cfg["disturbances"]["min_action_noise"] = env_cfg["min_action_noise"]
+    new_cfg["disturbances"]["max_action_noise"] = env_cfg["max_action_noise"]
 
     new_cfg["spawn_parameters"] = {}
     new_cfg["spawn_parameters"]["seed"] = cfg["seed"]
     try:
-        new_cfg["spawn_parameters"]["max_spawn_dist"] = cfg["task"]["env"][
-            "task_parameters"
-        ]["max_spawn_dist"]
+        new_cfg["spawn_parameters"]["max_spawn_dist"] = env_cfg["task_parameters"][
+            "max_spawn_dist"
+        ]
     except:
         new_cfg["spawn_parameters"]["max_spawn_dist"] = 0
     try:
-        new_cfg["spawn_parameters"]["min_spawn_dist"] = cfg["task"]["env"][
-            "task_parameters"
-        ]["min_spawn_dist"]
+        new_cfg["spawn_parameters"]["min_spawn_dist"] = env_cfg["task_parameters"][
+            "min_spawn_dist"
+        ]
     except:
         new_cfg["spawn_parameters"]["min_spawn_dist"] = 0
 
-    new_cfg["spawn_parameters"]["kill_dist"] = cfg["task"]["env"]["task_parameters"][
-        "kill_dist"
-    ]
+    new_cfg["spawn_parameters"]["kill_dist"] = env_cfg["task_parameters"]["kill_dist"]
 
     new_cfg["step_time"] = cfg["task"]["sim"]["dt"]
-    new_cfg["duration"] = (
-        cfg["task"]["env"]["maxEpisodeLength"] * cfg["task"]["sim"]["dt"]
-    )
-    new_cfg["inv_play_rate"] = cfg["task"]["env"]["controlFrequencyInv"]
-    new_cfg["platform"] = cfg["task"]["env"]["platform"]
+    new_cfg["duration"] = env_cfg["maxEpisodeLength"] * cfg["task"]["sim"]["dt"]
+    new_cfg["inv_play_rate"] = env_cfg["controlFrequencyInv"]
+    new_cfg["platform"] = env_cfg["platform"]
     new_cfg["platform"]["seed"] = cfg["seed"]
     return new_cfg
 
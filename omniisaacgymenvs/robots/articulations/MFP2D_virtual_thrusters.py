@@ -9,7 +9,9 @@ import dataclasses
 
 import omni
 import math
-from pxr import Gf
+import inspect
+from pxr import Gf, Usd
+from omni.isaac.core.utils.stage import add_reference_to_stage
 
 from omniisaacgymenvs.robots.articulations.utils.MFP_utils import *
 from omniisaacgymenvs.tasks.virtual_floating_platform.MFP2D_thruster_generator import compute_actions
@@ -20,12 +22,13 @@ class CreatePlatform:
     """
     Creates a floating platform with a core body and a set of thrusters."""
 
-    def __init__(self, path: str, cfg: dict) -> None:
+    def __init__(self, path: str, cfg: dict, stage: Optional[Usd.Stage] = None) -> None:
         self.platform_path = path
         self.joints_path = "joints"
         self.materials_path = "materials"
         self.core_path = None
-        self.stage = omni.usd.get_context().get_stage()
+        # Builds in the current stage, unless a standalone stage is given (asset cache)
+        self.stage = omni.usd.get_context().get_stage() if stage is None else stage
 
         self.read_cfg(cfg)
 
@@ -194,7 +197,8 @@ class ModularFloatingPlatform(Robot):
         usd_path: Optional[str] = None,
         translation: Optional[np.ndarray] = None,
         orientation: Optional[np.ndarray] = None,
-        scale: Optional[np.array] = None
+        scale: Optional[np.array] = None,
+        asset_cache = None
     ) -> None:
         """[summary]
         """
@@ -202,8 +206,21 @@ class ModularFloatingPlatform(Robot):
         self._usd_path = usd_path
         self._name = name
 
-        fp = CreatePlatform(prim_path, cfg)
-        fp.build()
+        if asset_cache is not None and asset_cache.enabled:
+            # The platform is generated once per configuration, and referenced afterwards
+            def build(path: str) -> None:
+                stage = Usd.Stage.CreateNew(path)
+                fp = CreatePlatform("/" + name, cfg, stage=stage)
+                fp.build()
+                stage.SetDefaultPrim(stage.GetPrimAtPath("/" + name))
+                stage.GetRootLayer().Save()
+
+            sources = [__file__, inspect.getfile(createArticulation), inspect.getfile(compute_actions)]
+            self._usd_path = asset_cache.get(name, sources, {"cfg": cfg}, build)
+            add_reference_to_stage(self._usd_path, prim_path)
+        else:
+            fp = CreatePlatform(prim_path, cfg)
+            fp.build()
 
         super().__init__(
             prim_path=prim_path,
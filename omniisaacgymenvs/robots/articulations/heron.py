@@ -49,6 +49,7 @@ class Heron(Robot):
         translation: Optional[np.ndarray] = None,
         orientation: Optional[np.ndarray] = None,
         scale: Optional[np.array] = None,
+        asset_cache=None,
     ) -> None:
         """[summary]"""
 
@@ -61,6 +62,10 @@ class Heron(Robot):
                 carb.log_error("Could not find Isaac Sim assets folder")
             self._usd_path = assets_root_path + "/Isaac/Robots/Heron/heron.usd"
 
+        if asset_cache is not None and asset_cache.enabled:
+            # Flattened (and optionally instanceable) copy of the asset, converted once
+            self._usd_path = asset_cache.get_instanceable(name, self._usd_path)
+
         add_reference_to_stage(self._usd_path, prim_path)
         # scale = torch.tensor([0.1, 0.1, 0.1])
 
@@ -48,3 +48,5 @@ class CrazyflieView(ArticulationView):
 
         self.physics_rotors = [RigidPrimView(prim_paths_expr=f"/World/envs/.*/Crazyflie/m{i}_prop",
                                              name=f"m{i}_prop_view") for i in range(1, 5)]
+        # all the rotors in a single view, used to apply the forces at once
+        self.rotors = RigidPrimView(prim_paths_expr="/World/envs/.*/Crazyflie/m[1-4]_prop", name="rotors_view")
@@ -48,4 +48,6 @@ class IngenuityView(ArticulationView):
         )
 
         self.physics_rotors = [RigidPrimView(prim_paths_expr=f"/World/envs/.*/Ingenuity/rotor_physics_{i}", name=f"physics_rotor_{i}_view", reset_xform_properties=False) for i in range(2)]
+        # all the physics rotors in a single view, used to apply the forces at once
+        self.rotors = RigidPrimView(prim_paths_expr="/World/envs/.*/Ingenuity/rotor_physics_[0-1]", name="physics_rotors_view", reset_xform_properties=False)
         self.visual_rotors = [RigidPrimView(prim_paths_expr=f"/World/envs/.*/Ingenuity/rotor_visual_{i}", name=f"visual_rotor_{i}_view", reset_xform_properties=False) for i in range(2)]
\ No newline at end of file
@@ -0,0 +1,131 @@
+from typing import List, Tuple
+import numpy as np
+import argparse
+import os
+
+import rospy
+from std_msgs.msg import ByteMultiArray
+from geometry_msgs.msg import PoseStamped
+
+from omniisaacgymenvs.ros.ros_profiling import StageTimer
+
+def parseArgs() -> Tuple[argparse.Namespace, List[str]]:
+    """
+    Parse the arguments of the script."""
+
+    parser = argparse.ArgumentParser("Fake motion-capture system and thrusters, to exercise the ROS players without hardware.")
+    parser.add_argument("--pose_topic", type=str, default="/vrpn_client_node/FP_exp_RL/pose", help="The topic on which the fake poses are published.")
+    parser.add_argument("--thruster_topic", type=str, default="/spacer_floating_platform/valves/input", help="The topic on which the thruster commands are received.")
+    parser.add_argument("--mocap_rate", type=float, default=100.0, help="The rate at which the fake poses are published. In Hz.")
+    parser.add_argument("--radius", type=float, default=1.0, help="The radius of the circle followed by the fake platform. In meters.")
+    parser.add_argument("--angular_rate", type=float, default=0.2, help="The angular rate of the fake platform along the circle. In radians per second.")
+    parser.add_argument("--position_noise", type=float, default=0.0, help="The standard deviation of the noise added to the positions. In meters.")
+    parser.add_argument("--save_dir", type=str, default="ros_exp", help="The path to the folder in which the timings will be stored.")
+
+    args, unknown_args = parser.parse_known_args()
+    return args, unknown_args
+
+
+class FakeMocapPublisher:
+    """
+    Publishes the pose of a platform moving along a circle, in place of the motion-capture system."""
+
+    def __init__(self, topic:str, radius:float = 1.0, angular_rate:float = 0.2, position_noise:float = 0.0) -> None:
+        """
+        Args:
+            topic (str): The topic on which the poses are published.
+            radius (float): The radius of the circle. In meters.
+            angular_rate (float): The angular rate along the circle. In radians per second.
+            position_noise (float): The standard deviation of the noise added to the positions. In meters."""
+
+        self.radius = radius
+        self.angular_rate = angular_rate
+        self.position_noise = position_noise
+        self.pub = rospy.Publisher(topic, PoseStamped, queue_size=1)
+        self.msg = PoseStamped()
+        self.msg.header.frame_id = "world"
+        self.start_time = rospy.Time.now()
+        self.last_stamp = None
+
+    def publish(self) -> None:
+        """
+        Publishes the current pose of the platform."""
+
+        stamp = rospy.Time.now()
+        t = (stamp - self.start_time).to_sec()
+        theta = self.angular_rate * t
+        noise = np.random.normal(0, self.position_noise, 2) if self.position_noise > 0 else np.zeros(2)
+        self.msg.header.stamp = stamp
+        self.msg.pose.position.x = self.radius * np.cos(theta) + noise[0]
+        self.msg.pose.position.y = self.radius * np.sin(theta) + noise[1]
+        self.msg.pose.position.z = 0.0
+        # The platform faces the direction of motion.
+        yaw = theta + np.pi / 2
+        self.msg.pose.orientation.w = np.cos(yaw / 2)
+        self.msg.pose.orientation.x = 0.0
+        self.msg.pose.orientation.y = 0.0
+        self.msg.pose.orientation.z = np.sin(yaw / 2)
+        self.pub.publish(self.msg)
+        self.last_stamp = stamp
+
+
+class FakeThrusterSubscriber:
+    """
+    Receives the thruster commands, in place of the platform, and records the latency
+    between the last published pose and the reception of the command."""
+
+    def __init__(self, topic:str, mocap:FakeMocapPublisher) -> None:
+        """
+        Args:
+            topic (str): The topic on which the thruster commands are received.
+            mocap (FakeMocapPublisher): The fake motion-capture system."""
+
+        self.mocap = mocap
+        self.latency = StageTimer()
+        self.commands = []
+        self.sub = rospy.Subscriber(topic, ByteMultiArray, self.callback)
+
+    def callback(self, msg:ByteMultiArray) -> None:
+        """
+        Callback for the thruster topic.
+
+        Args:
+            msg (ByteMultiArray): The thruster command."""
+
+        if self.mocap.last_stamp is None:
+            return
+        self.latency.add((rospy.Time.now() - self.mocap.last_stamp).to_sec())
+        self.commands.append(list(msg.data))
+
+    def save(self, save_dir:str) -> None:
+        """
+        Saves the received commands and the latencies.
+
+        Args:
+            save_dir (str): The directory in which the data is saved."""
+
+        os.makedirs(save_dir, exist_ok=True)
+        np.savez(os.path.join(save_dir, "fake_hardware.npz"),
+                 commands=np.array(self.commands),
+                 latency_samples=self.latency.get_samples(),
+                 latency_histogram=self.latency.histogram,
+                 bin_edges=self.latency.bin_edges)
+
+
+if __name__ == '__main__':
+    args, _ = parseArgs()
+    assert args.mocap_rate > 0, "The mocap rate must be greater than 0."
+
+    rospy.init_node('fake_hardware')
+    mocap = FakeMocapPublisher(args.pose_topic, args.radius, args.angular_rate, args.position_noise)
+    thrusters = FakeThrusterSubscriber(args.thruster_topic, mocap)
+    rate = rospy.Rate(args.mocap_rate)
+    try:
+        while not rospy.is_shutdown():
+            mocap.publish()
+            rate.sleep()
+    except rospy.ROSInterruptException:
+        pass
+    summary = thrusters.latency.get_summary()
+    print(f"commands received: {summary['count']}, pose to command latency: mean={summary['mean']*1e3:.3f}ms p99={summary['p99']*1e3:.3f}ms max={summary['max']*1e3:.3f}ms")
+    thrusters.save(args.save_dir)
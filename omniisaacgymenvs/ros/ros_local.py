@@ -0,0 +1,96 @@
+from typing import Any, List
+
+
+class Time:
+    """
+    In-process stand-in for rospy.Time."""
+
+    def __init__(self, secs:float = 0.0) -> None:
+        self.secs = secs
+
+    def to_sec(self) -> float:
+        return self.secs
+
+    def __sub__(self, other:"Time") -> "Time":
+        return Time(self.secs - other.secs)
+
+
+class Header:
+    def __init__(self) -> None:
+        self.stamp = Time()
+        self.frame_id = ""
+
+
+class Point:
+    def __init__(self, x:float = 0.0, y:float = 0.0, z:float = 0.0) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Quaternion:
+    def __init__(self, x:float = 0.0, y:float = 0.0, z:float = 0.0, w:float = 1.0) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = w
+
+
+class Pose:
+    def __init__(self) -> None:
+        self.position = Point()
+        self.orientation = Quaternion()
+
+
+class PoseStamped:
+    def __init__(self) -> None:
+        self.header = Header()
+        self.pose = Pose()
+
+
+class ByteMultiArray:
+    def __init__(self) -> None:
+        self.data = []
+
+
+class LocalPublisher:
+    """
+    In-process stand-in for rospy.Publisher. The published messages are forwarded to the
+    registered callbacks instead of being sent to a ROS master."""
+
+    def __init__(self) -> None:
+        self.callbacks = []
+        self.num_published = 0
+
+    def register(self, callback:Any) -> None:
+        """
+        Args:
+            callback (Any): A function called with every published message."""
+
+        self.callbacks.append(callback)
+
+    def publish(self, msg:Any) -> None:
+        """
+        Args:
+            msg (Any): The message to publish."""
+
+        self.num_published += 1
+        for callback in self.callbacks:
+            callback(msg)
+
+
+def make_pose_msg(pose:List[float]) -> PoseStamped:
+    """
+    Builds a pose message from a row of the poses.npy log.
+
+    Args:
+        pose (List[float]): The time stamp, position and quaternion (t, x, y, z, qw, qx, qy, qz).
+
+    Returns:
+        PoseStamped: The pose message."""
+
+    msg = PoseStamped()
+    msg.header.stamp = Time(float(pose[0]))
+    msg.pose.position = Point(float(pose[1]), float(pose[2]), float(pose[3]))
+    msg.pose.orientation = Quaternion(float(pose[5]), float(pose[6]), float(pose[7]), float(pose[4]))
+    return msg
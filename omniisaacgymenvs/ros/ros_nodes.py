@@ -1,15 +1,22 @@
 from typing import Callable, NamedTuple, Optional, Union, List
-from collections import deque
 import numpy as np
 import datetime
 import torch
+import yaml
 import os
 
-import rospy
-from std_msgs.msg import ByteMultiArray
-from geometry_msgs.msg import PoseStamped, Point, Pose
-
-from ros.ros_utills import derive_velocities
+try:
+    import rospy
+    from std_msgs.msg import ByteMultiArray
+    from geometry_msgs.msg import PoseStamped, Point, Pose
+except ImportError:
+    # Without ROS, the node can only be used locally, see ros_replay.py.
+    rospy = None
+    from ros.ros_local import ByteMultiArray, PoseStamped, Point, Pose
+
+from ros.ros_utills import VelocityEstimator
+from ros.ros_profiling import LoopProfiler, TimedPolicy
+from ros.ros_local import LocalPublisher
 from omniisaacgymenvs.mujoco_envs.legacy.position_controller_RL import PositionController
 from omniisaacgymenvs.mujoco_envs.legacy.pose_controller_RL import PoseController
 from omniisaacgymenvs.mujoco_envs.legacy.linear_velocity_tracker_RL import VelocityTracker, TrajectoryTracker
@@ -17,22 +24,23 @@ from omniisaacgymenvs.mujoco_envs.legacy.pose_controller_DC import PoseControlle
 from omniisaacgymenvs.mujoco_envs.controllers.RL_games_model_4_mujoco import RLGamesModel
 
 class RLPlayerNode:
-    def __init__(self, model: RLGamesModel, task_id: int, exp_settings, map:List[int]=[2,5,4,7,6,1,0,3]) -> None:
+    def __init__(self, model: RLGamesModel, task_id: int, exp_settings, map:List[int]=[2,5,4,7,6,1,0,3], local:bool=False) -> None:
         """
         Args:
             model (RLGamesModel): The model used for the RL algorithm.
             task_id (int): The id of the task to be performed.
             exp_settings (NamedTuple): The settings of the experiment.
-            map (List[int]): The mapping between the thrusters of the platform and the actions of the RL algorithm."""
+            map (List[int]): The mapping between the thrusters of the platform and the actions of the RL algorithm.
+            local (bool): Whether the node runs in-process without ROS. The callbacks must then be called directly."""
 
         # Initialize variables
         self.buffer_size = 30  # Number of samples for differentiation
-        self.pose_buffer = deque(maxlen=self.buffer_size)
-        self.time_buffer = deque(maxlen=self.buffer_size)
+        self.velocity_estimator = VelocityEstimator(self.buffer_size)
         self.settings = exp_settings
 
         self.map = map
-        self.model = model
+        self.profiler = LoopProfiler(1.0 / self.settings.play_rate)
+        self.model = TimedPolicy(model, self.profiler)
         self.task_id = task_id
         self.reset()
         self.controller = self.build_controller()
@@ -40,14 +48,21 @@ class RLPlayerNode:
         for i in self.settings.killed_thruster_id:
             self.thruster_mask[i] = 0
 
-        # Initialize Subscriber and Publisher
-        self.pose_sub = rospy.Subscriber("/vrpn_client_node/FP_exp_RL/pose", PoseStamped, self.pose_callback)
-        self.goal_sub = rospy.Subscriber("/spacer_floating_platform/goal", Point, self.goal_callback)
-        self.action_pub = rospy.Publisher("/spacer_floating_platform/valves/input", ByteMultiArray, queue_size=1)
-
         # Initialize ROS message for thrusters
         self.my_msg = ByteMultiArray()
-        rospy.on_shutdown(self.shutdown)
+
+        # Initialize Subscriber and Publisher
+        self.local = local
+        if self.local:
+            self.pose_sub = None
+            self.goal_sub = None
+            self.action_pub = LocalPublisher()
+        else:
+            assert rospy is not None, "ROS is required to run the node on the platform."
+            self.pose_sub = rospy.Subscriber("/vrpn_client_node/FP_exp_RL/pose", PoseStamped, self.pose_callback)
+            self.goal_sub = rospy.Subscriber("/spacer_floating_platform/goal", Point, self.goal_callback)
+            self.action_pub = rospy.Publisher("/spacer_floating_platform/valves/input", ByteMultiArray, queue_size=1)
+            rospy.on_shutdown(self.shutdown)
 
     def build_controller(self) -> Union[PositionController, PoseController, VelocityTracker, PoseControllerDC]:
         """
@@ -102,6 +117,11 @@ class RLPlayerNode:
         self.obs_buffer = []
         self.sim_obs_buffer = []
         self.act_buffer = []
+        # Replay buffers, see ros_replay.py
+        self.pose_buffer = []
+        self.vel_buffer = []
+        self.act_pose_idx_buffer = []
+        self.state_pose_idx = -1
 
     def shutdown(self) -> None:
         """
@@ -109,7 +129,8 @@ class RLPlayerNode:
 
         self.my_msg.data = [1,0,0,0,0,0,0,0,0]
         self.action_pub.publish(self.my_msg)
-        rospy.sleep(1)
+        if not self.local:
+            rospy.sleep(1)
         self.my_msg.data = [0,0,0,0,0,0,0,0,0]
         self.action_pub.publish(self.my_msg)
 
@@ -132,17 +153,22 @@ class RLPlayerNode:
         Args:
             msg (Pose): The pose message."""
         
+        self.profiler.start("pose_callback")
         #current_time = rospy.Time.now()
         current_time = msg.header.stamp
 
-        # Add current pose and time to the buffer
-        self.pose_buffer.append(msg)
-        self.time_buffer.append(current_time)
+        # Update the velocity estimate with the current pose
+        position = [msg.pose.position.x, msg.pose.position.y, msg.pose.position.z]
+        quat = msg.pose.orientation
+        self.velocity_estimator.update(current_time.to_sec(), position, [quat.w, quat.x, quat.y, quat.z])
+        self.pose_buffer.append([current_time.to_sec()] + position + [quat.w, quat.x, quat.y, quat.z])
+        self.profiler.add("velocity_estimation", self.velocity_estimator.last_latency)
 
         # Calculate velocities if buffer is filled
-        if (len(self.pose_buffer) == self.buffer_size):
+        if self.velocity_estimator.is_ready():
             self.get_state_from_optitrack(msg)
             self.ready = True
+        self.profiler.stop("pose_callback")
 
     def get_state_from_optitrack(self, msg: Pose) -> None:
         """
@@ -165,11 +191,13 @@ class RLPlayerNode:
         cosy_cosp = 1 - 2 * (q[2] * q[2] + q[3] * q[3])
         self.heading[0] = cosy_cosp
         self.heading[1] = siny_cosp
-        linear_vel, angular_vel = derive_velocities(self.time_buffer, self.pose_buffer)
+        linear_vel = self.velocity_estimator.linear_velocity
+        angular_vel = self.velocity_estimator.angular_velocity
         if self.task_id == -1:
             self.state = {"position": np.array([x_pos, y_pos, 0]), "quaternion": q, "linear_velocity": [linear_vel[0], linear_vel[1], 0], "angular_velocity": [0, 0, angular_vel[-1]]}
         else:
             self.state = {"position": self.root_pos, "orientation": self.heading, "linear_velocity": linear_vel[:2], "angular_velocity": angular_vel[-1]}
+        self.state_pose_idx = len(self.pose_buffer) - 1
     
     def goal_callback(self, msg: Point) -> None:
         """
@@ -217,13 +245,18 @@ class RLPlayerNode:
         
         Args:
             lifting_active (int, optional): Whether or not the lifting thruster is active. Defaults to 1."""
+        # The policy stage includes the observation build and the inference.
+        self.profiler.start("policy")
         self.action = self.controller.getAction(self.state, is_deterministic=True)
+        self.profiler.stop("policy")
+        self.profiler.start("publish")
         self.action = self.action * self.thruster_mask
         action = self.remap_actions(self.action)
         lifting_active = 1
         action.insert(0, lifting_active)
         self.my_msg.data = action
         self.action_pub.publish(self.my_msg)
+        self.profiler.stop("publish")
 
     def print_logs(self) -> None:
         """
@@ -236,6 +269,7 @@ class RLPlayerNode:
         print(f"observation: {self.controller.getObs()}")
         print(f"state: {self.state}")
         print(f"action: {self.action}")
+        print(f"velocity estimation latency: {self.velocity_estimator.get_latency_stats()}")
 
     def update_loggers(self) -> None:
         """
@@ -243,6 +277,8 @@ class RLPlayerNode:
 
         self.obs_buffer.append(self.controller.getObs())
         self.act_buffer.append(self.action)
+        self.vel_buffer.append(np.concatenate([self.velocity_estimator.linear_velocity, self.velocity_estimator.angular_velocity]))
+        self.act_pose_idx_buffer.append(self.state_pose_idx)
 
     def save_logs(self) -> None:
         """
@@ -253,6 +289,12 @@ class RLPlayerNode:
         np.save(os.path.join(save_dir, "obs.npy"), np.array(self.obs_buffer))
         np.save(os.path.join(save_dir, "act.npy"), np.array(self.act_buffer))
         np.save(os.path.join(save_dir, "sim_obs.npy"), np.array(self.sim_obs_buffer))
+        np.save(os.path.join(save_dir, "poses.npy"), np.array(self.pose_buffer))
+        np.save(os.path.join(save_dir, "vel.npy"), np.array(self.vel_buffer))
+        np.save(os.path.join(save_dir, "act_pose_idx.npy"), np.array(self.act_pose_idx_buffer))
+        with open(os.path.join(save_dir, "settings.yaml"), "w") as f:
+            yaml.dump(dict(vars(self.settings), task_id=self.task_id), f)
+        self.profiler.save(save_dir)
 
     def update_controller_matrix(self) -> None:
         """
@@ -274,6 +316,7 @@ class RLPlayerNode:
         run_time = rospy.Time.now() - start_time
         while (not rospy.is_shutdown()) and (run_time.to_sec() < self.settings.exp_duration):
             if self.ready:
+                self.profiler.start_iteration()
                 if self.task_id == -1:
                     self.update_controller_matrix()
                 self.get_action()
@@ -281,9 +324,11 @@ class RLPlayerNode:
                 self.count += 1
                 if self.settings.debug:
                     self.print_logs()
+                self.profiler.stop_iteration()
             run_time = rospy.Time.now() - start_time
             self.rate.sleep()
         # Saves the logs
+        self.profiler.print_summary()
         self.save_logs()
         # Kills the thrusters once done
         self.shutdown()
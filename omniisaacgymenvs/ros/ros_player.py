@@ -22,6 +22,7 @@ from tasks.utils.fp_utils import quaternion_to_rotation_matrix
 from pdb import set_trace as bp
 import os
 from collections import deque
+from omniisaacgymenvs.ros.ros_profiling import LoopProfiler
 
     
 def get_observation_from_realsense(obs_type, task_flag, msg, lin_vel, ang_vel):
@@ -144,6 +145,7 @@ class MyNode:
         self.obs = torch.zeros((1,10), dtype=torch.float32, device='cuda')
         self.ready = False
         self.obs_type = type(self.player.observation_space.sample())
+        self.profiler = LoopProfiler(1.0 / self.play_rate)
 
         rospy.on_shutdown(self.shutdown)
         print("Node initialized")
@@ -158,6 +160,7 @@ class MyNode:
 
     def callback(self, msg):
 
+        self.profiler.start("pose_callback")
         current_time = self.rospy.Time.now()
 
         # Add current pose and time to the buffer
@@ -167,11 +170,16 @@ class MyNode:
 
         # Calculate velocities if buffer is filled
         if (len(self.pose_buffer) == self.buffer_size) and (self.act_every == self.buffer_size):
+            self.profiler.start("velocity_estimation")
             lin_vel, ang_vel = self.derive_velocities()
+            self.profiler.stop("velocity_estimation")
             self.act_every = 0
 
+            self.profiler.start("observation")
             self.obs = get_observation_from_realsense(self.obs_type, self.task_flag, msg, lin_vel, ang_vel)
+            self.profiler.stop("observation")
             self.ready = True
+        self.profiler.stop("pose_callback")
 
     def run(self):
         
@@ -179,31 +187,39 @@ class MyNode:
         while (not self.rospy.is_shutdown()) and (self.count < self.end_experiment_at_step):
             #print(f'Im in')
             if self.ready:
+                self.profiler.start_iteration()
+                self.profiler.start("inference")
                 action = self.player.get_action(self.obs, is_deterministic=True)
                 action = action.cpu().tolist()
+                self.profiler.stop("inference")
                 if self.save_trajectory:
                     self.obs_buffer.append(self.obs)
                     self.act_buffer.append(action)
 
+                self.profiler.start("publish")
                 action = self.remap_actions(action)
                 lifting_active = 1
                 action.insert(0, lifting_active)
                 self.my_msg.data = action
                 self.pub.publish(self.my_msg)
+                self.profiler.stop("publish")
                 self.count += 1
                 print(f'count: {self.count}')
                 print(self.my_msg.data)
                 print(f'optitrack obs: {self.obs["state"]}')
 
                 self.ready = False
+                self.profiler.stop_iteration()
             self.rate.sleep()
         
+        self.profiler.print_summary()
         if self.save_trajectory:
             save_dir = "./lab_tests/icra24/act_noise/"+ datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + "/"
             os.makedirs(save_dir, exist_ok=True)
             np.save(os.path.join(save_dir, "obs.npy"), np.array(self.obs_buffer))
             np.save(os.path.join(save_dir, "act.npy"), np.array(self.act_buffer))
             np.save(os.path.join(save_dir, "sim_obs.npy"), np.array(self.sim_obs_buffer))
+            self.profiler.save(save_dir)
 
         self.my_msg.data = [0,0,0,0,0,0,0,0,0]
         self.pub.publish(self.my_msg)
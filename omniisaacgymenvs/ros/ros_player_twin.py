@@ -22,6 +22,7 @@ from tasks.utils.fp_utils import quaternion_to_rotation_matrix
 from pdb import set_trace as bp
 import os
 from collections import deque
+from omniisaacgymenvs.ros.ros_profiling import LoopProfiler
 
     
 def get_observation_from_realsense(obs_type, task_flag, msg, lin_vel, ang_vel):
@@ -143,6 +144,7 @@ class MyNode:
         self.obs = torch.zeros((1,10), dtype=torch.float32, device='cuda')
         self.ready = False
         self.obs_type = type(self.player.observation_space.sample())
+        self.profiler = LoopProfiler(1.0 / self.play_rate)
 
         rospy.on_shutdown(self.shutdown)
         print("Node initialized")
@@ -157,6 +159,7 @@ class MyNode:
 
     def callback(self, msg):
 
+        self.profiler.start("pose_callback")
         current_time = self.rospy.Time.now()
 
         # Add current pose and time to the buffer
@@ -166,11 +169,16 @@ class MyNode:
 
         # Calculate velocities if buffer is filled
         if (len(self.pose_buffer) == self.buffer_size) and (self.act_every == self.buffer_size):
+            self.profiler.start("velocity_estimation")
             lin_vel, ang_vel = self.derive_velocities()
+            self.profiler.stop("velocity_estimation")
             self.act_every = 0
 
+            self.profiler.start("observation")
             self.obs = get_observation_from_realsense(self.obs_type, self.task_flag, msg, lin_vel, ang_vel)
+            self.profiler.stop("observation")
             self.ready = True
+        self.profiler.stop("pose_callback")
 
     def run(self):
         
@@ -178,6 +186,7 @@ class MyNode:
         while (not self.rospy.is_shutdown()) and (self.count < self.end_experiment_at_step):
             #print(f'Im in')
             if self.ready:
+                self.profiler.start_iteration()
                 if run_once:
                     quat = self.pose_buffer[-1].pose.orientation
                     q = [quat.w, quat.x, quat.y, quat.z]
@@ -188,6 +197,7 @@ class MyNode:
                     self.player.env._task.set_to_pose(id, position, heading)
                     run_once = False
 
+                self.profiler.start("inference")
                 action = self.player.get_action(self.obs, is_deterministic=True)
                 #action = [1, 1, 0, 1, 0, 1, 0, 1, 0]
                 #print(f'player obs: {self.player.env._obs["state"]}')
@@ -195,18 +205,21 @@ class MyNode:
                 #obs_sim, _, _, _ = self.player.env.step(action)
 
                 action = action.cpu().tolist()
+                self.profiler.stop("inference")
                 if self.save_trajectory:
                     self.obs_buffer.append(self.obs)
                    # self.sim_obs_buffer.append(obs_sim)
                     self.act_buffer.append(action)
                 #bits = "{0:009b}".format(self.count)
                 #action = [int(bits[0]),int(bits[1]),int(bits[2]),int(bits[3]),int(bits[4]),int(bits[5]),int(bits[6]),int(bits[7]),int(bits[8])]
+                self.profiler.start("publish")
                 action = self.remap_actions(action)
                 print(f'Action after remap: {action}')
                 lifting_active = 1
                 action.insert(0, lifting_active)
                 self.my_msg.data = action
                 self.pub.publish(self.my_msg)
+                self.profiler.stop("publish")
                 self.count += 1
                 print(f'count: {self.count}')
                 print(self.my_msg.data)
@@ -214,14 +227,17 @@ class MyNode:
               #  print(f'sim obs: {obs_sim["obs"]["state"]}')
 
                 self.ready = False
+                self.profiler.stop_iteration()
             self.rate.sleep()
 
+        self.profiler.print_summary()
         if self.save_trajectory:
             save_dir = "./lab_tests/new_mass/"+ datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + "/"
             os.makedirs(save_dir, exist_ok=True)
             np.save(os.path.join(save_dir, "obs.npy"), np.array(self.obs_buffer))
             np.save(os.path.join(save_dir, "act.npy"), np.array(self.act_buffer))
             np.save(os.path.join(save_dir, "sim_obs.npy"), np.array(self.sim_obs_buffer))
+            self.profiler.save(save_dir)
 
         self.my_msg.data = [0,0,0,0,0,0,0,0,0]
 
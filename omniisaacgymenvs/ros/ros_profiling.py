@@ -0,0 +1,222 @@
+from typing import Any, Dict
+import numpy as np
+import time
+import os
+
+
+class StageTimer:
+    """
+    Records the durations of a stage of the control loop.
+    The durations are stored in a fixed-size ring buffer, and accumulated in a histogram
+    with log-spaced bins, such that the memory used does not grow with the duration of
+    the experiment."""
+
+    def __init__(self, capacity:int = 100000, bin_edges:np.ndarray = None) -> None:
+        """
+        Args:
+            capacity (int): The number of raw samples kept in memory.
+            bin_edges (np.ndarray): The edges of the histogram bins, in seconds."""
+
+        if bin_edges is None:
+            bin_edges = np.logspace(-6, 1, 71)
+        self.bin_edges = bin_edges
+        self.histogram = np.zeros((len(bin_edges) + 1), dtype=np.int64)
+        self.samples = np.zeros((capacity), dtype=np.float64)
+        self.capacity = capacity
+        self.head = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, duration:float) -> None:
+        """
+        Adds a new duration.
+
+        Args:
+            duration (float): The duration of the stage in seconds."""
+
+        self.samples[self.head] = duration
+        self.head = (self.head + 1) % self.capacity
+        self.histogram[np.searchsorted(self.bin_edges, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.last = duration
+
+    def get_samples(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: The raw samples kept in memory, in chronological order."""
+
+        if self.count < self.capacity:
+            return self.samples[:self.count].copy()
+        return np.roll(self.samples, -self.head)
+
+    def get_summary(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: The count, mean, p50, p99 and max durations in seconds."""
+
+        samples = self.get_samples()
+        if len(samples) == 0:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        return {"count": self.count,
+                "mean": self.total / self.count,
+                "p50": float(np.percentile(samples, 50)),
+                "p99": float(np.percentile(samples, 99)),
+                "max": self.max}
+
+
+class LoopProfiler:
+    """
+    Per-stage timing and deadline monitoring for the control loop of the ROS players.
+    Each stage (pose callback, velocity derivation, observation build, policy inference,
+    thrust publication, ...) is timed with time.perf_counter. The duration of each
+    iteration of the control loop is compared to the control period to count the deadline
+    misses, and summaries are printed periodically."""
+
+    def __init__(self, control_period:float, summary_period:float = 10.0, tolerance:float = 0.1, capacity:int = 100000) -> None:
+        """
+        Args:
+            control_period (float): The control period in seconds, i.e. 1 / play_rate.
+            summary_period (float): The time between two printed summaries in seconds. Set to 0 to disable.
+            tolerance (float): The fraction of the control period an iteration can overrun before it counts as a deadline miss.
+            capacity (int): The number of raw samples kept in memory for each stage."""
+
+        self.control_period = control_period
+        self.summary_period = summary_period
+        self.tolerance = tolerance
+        self.capacity = capacity
+        self.stages = {}
+        self.starts = {}
+        self.deadline_misses = 0
+        self.overrun_misses = 0
+        self.iterations = 0
+        self.last_iteration_start = None
+        self.last_summary = time.perf_counter()
+
+    def get_stage(self, name:str) -> StageTimer:
+        """
+        Args:
+            name (str): The name of the stage.
+
+        Returns:
+            StageTimer: The timer of the stage, created on first use."""
+
+        if name not in self.stages:
+            self.stages[name] = StageTimer(self.capacity)
+        return self.stages[name]
+
+    def start(self, name:str) -> None:
+        """
+        Starts timing a stage.
+
+        Args:
+            name (str): The name of the stage."""
+
+        self.starts[name] = time.perf_counter()
+
+    def stop(self, name:str) -> float:
+        """
+        Stops timing a stage and records its duration.
+
+        Args:
+            name (str): The name of the stage.
+
+        Returns:
+            float: The duration of the stage in seconds."""
+
+        duration = time.perf_counter() - self.starts.pop(name)
+        self.get_stage(name).add(duration)
+        return duration
+
+    def add(self, name:str, duration:float) -> None:
+        """
+        Records the duration of a stage timed elsewhere.
+
+        Args:
+            name (str): The name of the stage.
+            duration (float): The duration of the stage in seconds."""
+
+        self.get_stage(name).add(duration)
+
+    def start_iteration(self) -> None:
+        """
+        Marks the start of an iteration of the control loop. The time between two iterations
+        is recorded as the "period" stage, and counted as a deadline miss if it exceeds the
+        control period by more than the tolerance."""
+
+        now = time.perf_counter()
+        if self.last_iteration_start is not None:
+            period = now - self.last_iteration_start
+            self.get_stage("period").add(period)
+            if period > self.control_period * (1 + self.tolerance):
+                self.deadline_misses += 1
+        self.last_iteration_start = now
+        self.starts["iteration"] = now
+
+    def stop_iteration(self) -> None:
+        """
+        Marks the end of the work done in an iteration of the control loop. An iteration
+        whose work exceeds the control period is counted as an overrun."""
+
+        if self.stop("iteration") > self.control_period:
+            self.overrun_misses += 1
+        self.iterations += 1
+        if (self.summary_period > 0) and (time.perf_counter() - self.last_summary > self.summary_period):
+            self.print_summary()
+
+    def print_summary(self) -> None:
+        """
+        Prints the timing summary of every stage, in milliseconds."""
+
+        self.last_summary = time.perf_counter()
+        print("=========================================")
+        print(f"iterations: {self.iterations}, deadline misses: {self.deadline_misses}, overruns: {self.overrun_misses}")
+        for name, stage in self.stages.items():
+            summary = stage.get_summary()
+            print(f"{name:>20}: n={summary['count']} mean={summary['mean']*1e3:.3f}ms p50={summary['p50']*1e3:.3f}ms p99={summary['p99']*1e3:.3f}ms max={summary['max']*1e3:.3f}ms")
+
+    def save(self, save_dir:str) -> None:
+        """
+        Saves the raw samples, histograms and deadline counters next to the other logs.
+
+        Args:
+            save_dir (str): The directory in which the logs are saved."""
+
+        os.makedirs(save_dir, exist_ok=True)
+        data = {"control_period": self.control_period,
+                "iterations": self.iterations,
+                "deadline_misses": self.deadline_misses,
+                "overrun_misses": self.overrun_misses}
+        for name, stage in self.stages.items():
+            data[name + "_samples"] = stage.get_samples()
+            data[name + "_histogram"] = stage.histogram
+            data["bin_edges"] = stage.bin_edges
+        np.savez(os.path.join(save_dir, "timings.npz"), **data)
+
+
+class TimedPolicy:
+    """
+    Wraps a model such that the time spent in its getAction method is recorded as the
+    "inference" stage of a LoopProfiler. All the other attributes are forwarded to the
+    wrapped model."""
+
+    def __init__(self, model:Any, profiler:LoopProfiler) -> None:
+        """
+        Args:
+            model (Any): The model to be wrapped, e.g. an RLGamesModel.
+            profiler (LoopProfiler): The profiler recording the inference time."""
+
+        self.model = model
+        self.profiler = profiler
+
+    def getAction(self, *args, **kwargs) -> np.ndarray:
+        self.profiler.start("inference")
+        action = self.model.getAction(*args, **kwargs)
+        self.profiler.stop("inference")
+        return action
+
+    def __getattr__(self, name:str) -> Any:
+        return getattr(self.model, name)
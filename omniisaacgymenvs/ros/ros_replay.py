@@ -0,0 +1,125 @@
+from typing import Dict, List, Tuple
+from argparse import Namespace
+import numpy as np
+import argparse
+import time
+import yaml
+import os
+
+from omniisaacgymenvs.ros.ros_local import make_pose_msg
+
+def parseArgs() -> Tuple[argparse.Namespace, List[str]]:
+    """
+    Parse the arguments of the script."""
+
+    parser = argparse.ArgumentParser("Replays the logs of an RLPlayerNode offline, without ROS nor the platform.")
+    parser.add_argument("--log_dir", type=str, required=True, help="The folder containing the logs saved by the RLPlayerNode.")
+    parser.add_argument("--model_path", type=str, default=None, help="The path to the model to be loaded. Defaults to the one used during the experiment.")
+    parser.add_argument("--config_path", type=str, default=None, help="The path to the network configuration to be loaded. Defaults to the one used during the experiment.")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="The largest difference between a replayed and a recorded action for them to be considered equal.")
+    parser.add_argument("--no_report", dest="save_report", action="store_false", help="Does not save the replay report in the log folder.")
+
+    args, unknown_args = parser.parse_known_args()
+    return args, unknown_args
+
+
+def load_logs(log_dir:str) -> Tuple[Namespace, Dict[str, np.ndarray]]:
+    """
+    Loads the logs saved by an RLPlayerNode.
+
+    Args:
+        log_dir (str): The folder containing the logs.
+
+    Returns:
+        Tuple(Namespace, Dict[str, np.ndarray]): The settings of the experiment and the logs."""
+
+    with open(os.path.join(log_dir, "settings.yaml"), "r") as f:
+        settings = Namespace(**yaml.safe_load(f))
+    logs = {}
+    for name in ["poses", "act", "vel", "act_pose_idx"]:
+        logs[name] = np.load(os.path.join(log_dir, name + ".npy"))
+    return settings, logs
+
+
+def replay(node, logs:Dict[str, np.ndarray], tolerance:float = 1e-6) -> Dict[str, float]:
+    """
+    Feeds the recorded poses to the node as fast as possible, and queries the policy
+    whenever it was queried during the experiment.
+
+    Args:
+        node (RLPlayerNode): A node created with local=True.
+        logs (Dict[str, np.ndarray]): The logs of the experiment.
+        tolerance (float): The largest difference between two actions for them to be considered equal.
+
+    Returns:
+        Dict[str, float]: The replay report."""
+
+    poses = logs["poses"]
+    act_pose_idx = logs["act_pose_idx"]
+    actions = np.zeros_like(logs["act"], dtype=np.float64)
+    velocities = np.zeros_like(logs["vel"], dtype=np.float64)
+    node.update_once = True
+
+    j = 0
+    start = time.perf_counter()
+    for i, pose in enumerate(poses):
+        node.pose_callback(make_pose_msg(pose))
+        while (j < len(act_pose_idx)) and (act_pose_idx[j] == i):
+            node.profiler.start_iteration()
+            if node.task_id == -1:
+                node.update_controller_matrix()
+            node.get_action()
+            node.update_loggers()
+            node.profiler.stop_iteration()
+            actions[j] = node.action
+            velocities[j] = node.vel_buffer[-1]
+            j += 1
+    duration = time.perf_counter() - start
+
+    action_error = np.abs(actions[:j] - logs["act"][:j])
+    velocity_error = np.abs(velocities[:j] - logs["vel"][:j])
+    return {"num_poses": len(poses),
+            "num_actions": j,
+            "duration": duration,
+            "poses_per_second": len(poses) / duration,
+            "actions_per_second": j / duration,
+            "action_max_error": float(action_error.max()) if j > 0 else 0.0,
+            "action_mean_error": float(action_error.mean()) if j > 0 else 0.0,
+            "action_match_rate": float(np.mean(np.all(action_error <= tolerance, axis=-1))) if j > 0 else 1.0,
+            "velocity_max_error": float(velocity_error.max()) if j > 0 else 0.0}
+
+
+if __name__ == '__main__':
+    args, _ = parseArgs()
+    assert os.path.exists(args.log_dir), "The log folder does not exist."
+
+    from omniisaacgymenvs.mujoco_envs.controllers.RL_games_model_4_mujoco import RLGamesModel
+    from omniisaacgymenvs.mujoco_envs.legacy.pose_controller_DC import DiscreteController, MuJoCoPoseControl
+    from omniisaacgymenvs.ros.ros_nodes import RLPlayerNode
+
+    settings, logs = load_logs(args.log_dir)
+    settings.debug = False
+    task_id = settings.task_id
+    if task_id == -1:
+        # Load the env to enable weight initilization
+        env = MuJoCoPoseControl(step_time=1.0/50, duration=60.0, inv_play_rate=int(50/5), mass=5.32, radius=0.31, max_thrust=1)
+        model = DiscreteController([0,0,0],[1,0,0,0], Mod=env, control_type='LQR')
+    else:
+        model_path = args.model_path if args.model_path is not None else settings.model_path
+        config_path = args.config_path if args.config_path is not None else settings.config_path
+        assert os.path.exists(model_path), "The model file does not exist."
+        assert os.path.exists(config_path), "The configuration file does not exist."
+        model = RLGamesModel(config_path=config_path, model_path=model_path)
+
+    node = RLPlayerNode(model, task_id, settings, local=True)
+    node.profiler.summary_period = 0
+    report = replay(node, logs, args.tolerance)
+
+    print("=========================================")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    node.profiler.print_summary()
+    if args.save_report:
+        with open(os.path.join(args.log_dir, "replay_report.yaml"), "w") as f:
+            yaml.dump(report, f)
+        node.profiler.save(os.path.join(args.log_dir, "replay"))
@@ -1,7 +1,8 @@
 import numpy as np
+import time
 import os
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 #from geometry_msgs.msg import Pose
 #import rospy
 
@@ -82,4 +83,106 @@ def derive_velocities(time_buffer:list, pose_buffer: list) -> Tuple[np.ndarray,
     ang_vel = angular_velocities(angular_orientations, dt_buff)
     average_angular_velocity = np.mean(ang_vel, axis=1)
 
-    return average_linear_velocity, average_angular_velocity
\ No newline at end of file
+    return average_linear_velocity, average_angular_velocity
+
+
+class VelocityEstimator:
+    """
+    Streaming estimator of the linear and angular velocities of the platform.
+    It produces the same estimates as derive_velocities over a sliding window of poses,
+    but updates them in constant time and memory: the poses are kept in preallocated
+    ring buffers, and the angular velocity terms between consecutive quaternions are
+    accumulated in a running sum."""
+
+    def __init__(self, buffer_size:int = 30) -> None:
+        """
+        Args:
+            buffer_size (int): The number of poses used to derive the velocities."""
+
+        assert buffer_size > 1, "At least two poses are required to derive velocities."
+        self.buffer_size = buffer_size
+        self.times = np.zeros((buffer_size), dtype=np.float64)
+        self.positions = np.zeros((buffer_size, 3), dtype=np.float64)
+        self.ang_terms = np.zeros((buffer_size - 1, 3), dtype=np.float64)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Resets the estimator."""
+
+        self.count = 0
+        self.head = 0
+        self.ang_head = 0
+        self.ang_sum = np.zeros((3), dtype=np.float64)
+        self.last_quat = np.zeros((4), dtype=np.float64)
+        self.linear_velocity = np.zeros((3), dtype=np.float64)
+        self.angular_velocity = np.zeros((3), dtype=np.float64)
+        # Estimation latency statistics, in seconds
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    def is_ready(self) -> bool:
+        """
+        Returns:
+            bool: True once enough poses have been received to estimate the velocities."""
+
+        return self.count >= self.buffer_size
+
+    def update(self, t:float, position:np.ndarray, quaternion:np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Adds a new pose to the estimator and updates the velocities.
+
+        Args:
+            t (float): The time stamp of the pose in seconds.
+            position (np.ndarray): The position of the platform (x, y, z).
+            quaternion (np.ndarray): The orientation of the platform (w, x, y, z).
+
+        Returns:
+            Tuple(np.ndarray, np.ndarray): The linear and angular velocities."""
+
+        start = time.perf_counter()
+        q = np.asarray(quaternion, dtype=np.float64)
+        if self.count > 0:
+            # Angular velocity term between the last two quaternions, see angular_velocities.
+            p = self.last_quat
+            term = np.array([
+                p[0]*q[1] - p[1]*q[0] - p[2]*q[3] + p[3]*q[2],
+                p[0]*q[2] + p[1]*q[3] - p[2]*q[0] - p[3]*q[1],
+                p[0]*q[3] - p[1]*q[2] + p[2]*q[1] - p[3]*q[0]])
+            if self.count >= self.buffer_size:
+                self.ang_sum -= self.ang_terms[self.ang_head]
+            self.ang_terms[self.ang_head] = term
+            self.ang_sum += term
+            self.ang_head = (self.ang_head + 1) % (self.buffer_size - 1)
+            if self.ang_head == 0:
+                # Removes the numerical drift of the running sum once per window.
+                self.ang_sum = self.ang_terms.sum(axis=0)
+        self.last_quat[:] = q
+
+        self.times[self.head] = t
+        self.positions[self.head] = position
+        self.head = (self.head + 1) % self.buffer_size
+        self.count += 1
+
+        if self.is_ready():
+            # The oldest sample is the one that will be overwritten next.
+            dt = t - self.times[self.head]
+            if dt > 0:
+                n = self.buffer_size
+                self.linear_velocity = (self.positions[self.head - 1] - self.positions[self.head]) * n / ((n - 1) * dt)
+                self.angular_velocity = 2 * self.ang_sum / dt
+
+        self.last_latency = time.perf_counter() - start
+        self.max_latency = max(self.max_latency, self.last_latency)
+        self.total_latency += self.last_latency
+        return self.linear_velocity, self.angular_velocity
+
+    def get_latency_stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: The last, mean and max estimation latency in seconds."""
+
+        return {"last": self.last_latency,
+                "mean": self.total_latency / max(self.count, 1),
+                "max": self.max_latency}
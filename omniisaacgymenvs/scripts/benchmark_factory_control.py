@@ -0,0 +1,120 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+import argparse
+import torch
+import time
+
+import omniisaacgymenvs.tasks.factory.factory_control as fc
+
+parser = argparse.ArgumentParser(
+    "Times the IK solvers of the Factory controller on random Jacobians."
+)
+parser.add_argument("--num_envs", type=int, default=4096, help="Batch size.")
+parser.add_argument("--iterations", type=int, default=200, help="Timed iterations.")
+parser.add_argument("--warmup", type=int, default=20, help="Untimed iterations.")
+parser.add_argument("--device", type=str, default="cuda:0", help="Device.")
+parser.add_argument(
+    "--methods",
+    type=str,
+    nargs="+",
+    default=["pinv", "trans", "dls", "svd"],
+    help="IK methods to benchmark.",
+)
+parser.add_argument(
+    "--compile", action="store_true", help="Also times the torch.compile version."
+)
+args = parser.parse_args()
+
+
+def reference_delta_dof_pos(delta_pose, ik_method, jacobian):
+    """
+    Inverse based implementation of the IK methods, used to check the solvers.
+
+    Args:
+        delta_pose (torch.Tensor): The (N, 6) pose error.
+        ik_method (str): The IK method.
+        jacobian (torch.Tensor): The (N, 6, 7) Jacobians.
+
+    Returns:
+        torch.Tensor: The (N, 7) DOF position deltas."""
+
+    jacobian_T = torch.transpose(jacobian, dim0=1, dim1=2)
+    if ik_method == "pinv":
+        return (torch.linalg.pinv(jacobian) @ delta_pose.unsqueeze(-1)).squeeze(-1)
+    elif ik_method == "trans":
+        return (jacobian_T @ delta_pose.unsqueeze(-1)).squeeze(-1)
+    elif ik_method == "dls":
+        lambda_matrix = (0.1**2) * torch.eye(n=jacobian.shape[1], device=jacobian.device)
+        return (
+            jacobian_T
+            @ torch.inverse(jacobian @ jacobian_T + lambda_matrix)
+            @ delta_pose.unsqueeze(-1)
+        ).squeeze(-1)
+    elif ik_method == "svd":
+        U, S, Vh = torch.linalg.svd(jacobian)
+        S_inv = torch.where(S > 1.0e-5, 1.0 / S, torch.zeros_like(S))
+        jacobian_pinv = (
+            torch.transpose(Vh, dim0=1, dim1=2)[:, :, :6]
+            @ torch.diag_embed(S_inv)
+            @ torch.transpose(U, dim0=1, dim1=2)
+        )
+        return (jacobian_pinv @ delta_pose.unsqueeze(-1)).squeeze(-1)
+
+
+def time_function(function):
+    """
+    Times a function, synchronizing the device around the timed iterations.
+
+    Args:
+        function (callable): The function to time.
+
+    Returns:
+        float: The mean duration of a call in milliseconds."""
+
+    for _ in range(args.warmup):
+        function()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        function()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) * 1e3 / args.iterations
+
+
+jacobian = torch.randn((args.num_envs, 6, 7), device=args.device)
+delta_pose = torch.randn((args.num_envs, 6), device=args.device) * 0.01
+cfg_ctrl = {}
+delta_dof_pos = fc._get_delta_dof_pos
+if args.compile and hasattr(torch, "compile"):
+    compiled_delta_dof_pos = torch.compile(fc._get_delta_dof_pos)
+
+print("=========================================")
+for method in args.methods:
+    reference = reference_delta_dof_pos(delta_pose, method, jacobian)
+    solution = delta_dof_pos(delta_pose, method, jacobian, args.device, cfg_ctrl)
+    error = (solution - reference).abs().max().item()
+    ref_ms = time_function(
+        lambda: reference_delta_dof_pos(delta_pose, method, jacobian)
+    )
+    new_ms = time_function(
+        lambda: delta_dof_pos(delta_pose, method, jacobian, args.device, cfg_ctrl)
+    )
+    line = f"{method:<6} reference: {ref_ms:.3f} ms, solver: {new_ms:.3f} ms, max error: {error:.2e}"
+    if args.compile and hasattr(torch, "compile"):
+        compiled_ms = time_function(
+            lambda: compiled_delta_dof_pos(
+                delta_pose, method, jacobian, args.device, cfg_ctrl
+            )
+        )
+        line += f", compiled: {compiled_ms:.3f} ms"
+    print(line)
@@ -0,0 +1,113 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+import argparse
+import torch
+import time
+
+from omniisaacgymenvs.utils.rlgames.mixed_precision import set_policy_precision
+
+parser = argparse.ArgumentParser(
+    "Compares the accuracy and throughput of the policy precisions, and the rollout memory of the observation layouts."
+)
+parser.add_argument("--num_envs", type=int, default=4096, help="Number of envs.")
+parser.add_argument("--horizon", type=int, default=16, help="Horizon length.")
+parser.add_argument("--num_obs", type=int, default=22, help="State size.")
+parser.add_argument("--num_thrusters", type=int, default=8, help="Max thrusters.")
+parser.add_argument("--transform_dim", type=int, default=5, help="Transform size.")
+parser.add_argument("--d_model", type=int, default=128, help="Token size.")
+parser.add_argument("--iterations", type=int, default=200, help="Timed iterations.")
+parser.add_argument("--warmup", type=int, default=20, help="Untimed iterations.")
+parser.add_argument("--device", type=str, default="cuda:0", help="Device.")
+args = parser.parse_args()
+
+
+class ThrusterPolicy(torch.nn.Module):
+    """
+    Stand-in for the dict actor-critics: the state and the thruster transforms are
+    embedded, fused by a small Transformer, and decoded into the logits and value."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.state = torch.nn.Linear(args.num_obs, args.d_model)
+        self.transforms = torch.nn.Linear(args.transform_dim, args.d_model)
+        layer = torch.nn.TransformerEncoderLayer(
+            args.d_model, 2, 4 * args.d_model, dropout=0.0, batch_first=True
+        )
+        self.encoder = torch.nn.TransformerEncoder(layer, 2)
+        self.logits = torch.nn.Linear(args.d_model, 2)
+        self.value = torch.nn.Linear(args.d_model, 1)
+
+    def forward(self, input_dict: dict) -> dict:
+        obs = input_dict["obs"]
+        tokens = torch.cat(
+            [self.state(obs["state"]).unsqueeze(1), self.transforms(obs["transforms"])],
+            dim=1,
+        )
+        padding = torch.cat(
+            [torch.zeros_like(obs["masks"][:, :1]), obs["masks"]], dim=1
+        ).bool()
+        x = self.encoder(tokens, src_key_padding_mask=padding)
+        return {"logits": self.logits(x[:, 1:]), "values": self.value(x[:, 0])}
+
+
+def make_obs() -> dict:
+    transforms = torch.rand(
+        (args.num_envs, args.num_thrusters, args.transform_dim), device=args.device
+    )
+    masks = torch.rand((args.num_envs, args.num_thrusters), device=args.device) > 0.8
+    return {
+        "state": torch.randn((args.num_envs, args.num_obs), device=args.device),
+        "transforms": transforms,
+        "masks": masks.float(),
+    }
+
+
+def rollout_bytes(obs: dict) -> int:
+    return sum(v.element_size() * v.numel() for v in obs.values()) * args.horizon
+
+
+def time_function(function) -> float:
+    for _ in range(args.warmup):
+        function()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        function()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) * 1e3 / args.iterations
+
+
+torch.manual_seed(0)
+reference_model = ThrusterPolicy().to(args.device).eval()
+obs = make_obs()
+compact_obs = dict(obs)
+compact_obs["transforms"] = obs["transforms"].half()
+compact_obs["masks"] = obs["masks"].to(torch.int8)
+with torch.no_grad():
+    reference = reference_model({"obs": obs})
+
+print("=========================================")
+print(
+    f"rollout obs memory, fp32: {rollout_bytes(obs) / 2**20:.1f} MiB, compact: {rollout_bytes(compact_obs) / 2**20:.1f} MiB"
+)
+for precision in ["fp32", "bf16", "fp16"]:
+    model = ThrusterPolicy().to(args.device).eval()
+    model.load_state_dict(reference_model.state_dict())
+    set_policy_precision(model, {"policy_precision": precision})
+    with torch.no_grad():
+        outputs = model({"obs": compact_obs})
+        error = max(
+            (outputs[k] - reference[k]).abs().max().item() for k in reference.keys()
+        )
+        duration = time_function(lambda: model({"obs": compact_obs}))
+    print(f"{precision:<5} inference: {duration:.3f} ms, max error: {error:.2e}")
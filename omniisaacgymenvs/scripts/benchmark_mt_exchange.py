@@ -0,0 +1,111 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+import threading
+import argparse
+import queue
+import torch
+import time
+
+from omniisaacgymenvs.utils.mt_exchange import DoubleBufferExchange
+
+parser = argparse.ArgumentParser(
+    "Times the hand-over between the simulation and training threads of the MT script."
+)
+parser.add_argument("--num_envs", type=int, default=4096, help="Number of envs.")
+parser.add_argument("--num_obs", type=int, default=64, help="Observation size.")
+parser.add_argument("--num_states", type=int, default=0, help="State size.")
+parser.add_argument("--steps", type=int, default=2000, help="Timed steps.")
+parser.add_argument("--warmup", type=int, default=100, help="Untimed steps.")
+parser.add_argument("--device", type=str, default="cuda:0", help="Device.")
+args = parser.parse_args()
+
+
+class FakeTask:
+    """
+    Mimics the buffers of a task, which are overwritten in place at every step."""
+
+    def __init__(self) -> None:
+        self.obs_buf = torch.zeros((args.num_envs, args.num_obs), device=args.device)
+        self.states_buf = torch.zeros(
+            (args.num_envs, args.num_states), device=args.device
+        )
+        self.rew_buf = torch.zeros(args.num_envs, device=args.device)
+        self.reset_buf = torch.zeros(args.num_envs, device=args.device, dtype=torch.long)
+        self.extras = {}
+
+    def step(self, actions: torch.Tensor) -> dict:
+        self.obs_buf.add_(actions.mean(-1, keepdim=True))
+        self.rew_buf.copy_(self.obs_buf[:, 0])
+        return {
+            "obs": self.obs_buf,
+            "rew": self.rew_buf,
+            "states": self.states_buf,
+            "reset": self.reset_buf,
+            "extras": self.extras,
+        }
+
+
+def run(mode: str) -> float:
+    """
+    Runs a simulation thread and a training thread joined by two queues of size 1,
+    like the MT script.
+
+    Args:
+        mode (str): Either "queue" or "double_buffer".
+
+    Returns:
+        float: The mean duration of a step in milliseconds."""
+
+    task = FakeTask()
+    exchange = DoubleBufferExchange()
+    action_queue = queue.Queue(1)
+    data_queue = queue.Queue(1)
+    total = args.warmup + args.steps
+
+    def simulate() -> None:
+        for _ in range(total):
+            data = task.step(action_queue.get())
+            if mode == "double_buffer":
+                data = exchange.write(data)
+            data_queue.put(data)
+
+    thread = threading.Thread(target=simulate, daemon=True)
+    thread.start()
+    actions = torch.zeros((args.num_envs, 8), device=args.device)
+    for step in range(total):
+        if step == args.warmup:
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()
+            start = time.perf_counter()
+        action_queue.put(actions)
+        data = data_queue.get()
+        if mode == "double_buffer":
+            data = exchange.read(data)
+            obs = data["obs"]
+            rew = data["rew"]
+            resets = data["reset"]
+            extras = data["extras"]
+        else:
+            obs = data["obs"].clone()
+            rew = data["rew"].clone()
+            resets = data["reset"].clone()
+            extras = data["extras"].copy()
+        # inference stand-in
+        actions = torch.tanh(obs[:, :8] + rew.unsqueeze(-1))
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    thread.join()
+    return (time.perf_counter() - start) * 1e3 / args.steps
+
+
+print("=========================================")
+for mode in ["queue", "double_buffer"]:
+    print(f"{mode:<14} {run(mode):.3f} ms/step")
@@ -0,0 +1,93 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+import numpy as np
+import mujoco
+import hydra
+import json
+import time
+import os
+
+from omegaconf import DictConfig
+
+from omniisaacgymenvs.utils.hydra_cfg.hydra_utils import *
+from omniisaacgymenvs.utils.hydra_cfg.reformat import omegaconf_to_dict
+from omniisaacgymenvs.mujoco_envs.environments.mujoco_base_env import (
+    MuJoCoFloatingPlatform,
+    parseEnvironmentConfig,
+)
+
+
+@hydra.main(config_name="config_mujoco", config_path="../cfg")
+def run(cfg: DictConfig):
+    """
+    Measures the throughput of the MuJoCo floating platform with a random or zero
+    policy, and writes a json report. CPU-only counterpart of benchmark_throughput.py.
+
+    Args:
+        cfg (DictConfig): A dictionary containing the configuration of the simulation.
+    """
+
+    cfg_dict = omegaconf_to_dict(cfg)
+    env = MuJoCoFloatingPlatform(**parseEnvironmentConfig(cfg_dict))
+    rng = np.random.default_rng(cfg.seed)
+    num_steps = cfg.benchmark.warmup + cfg.benchmark.steps
+    if cfg.benchmark.policy == "zero":
+        actions = np.zeros((num_steps, 8))
+    else:
+        actions = rng.integers(0, 2, (num_steps, 8)).astype(np.float64)
+
+    env.reset()
+    timings = {"get_obs": 0.0, "apply_forces": 0.0, "physics_step": 0.0}
+    duration = 0.0
+    for i in range(num_steps):
+        if i == cfg.benchmark.warmup:
+            timings = {key: 0.0 for key in timings.keys()}
+            duration = 0.0
+        start = time.perf_counter()
+        env.getObs()
+        t0 = time.perf_counter()
+        timings["get_obs"] += t0 - start
+        for _ in range(env.inv_play_rate):
+            t1 = time.perf_counter()
+            env.applyForces(actions[i])
+            t2 = time.perf_counter()
+            mujoco.mj_step(env.model, env.data)
+            t3 = time.perf_counter()
+            timings["apply_forces"] += t2 - t1
+            timings["physics_step"] += t3 - t2
+        duration += time.perf_counter() - start
+        if env.data.time > env.duration:
+            env.reset()
+
+    steps = cfg.benchmark.steps
+    report = {
+        "task": "MuJoCoFloatingPlatform",
+        "num_envs": 1,
+        "control_frequency_inv": env.inv_play_rate,
+        "policy": cfg.benchmark.policy,
+        "steps": steps,
+        "duration": duration,
+        "steps_per_second": steps / duration,
+        "env_steps_per_second": steps / duration,
+        "physics_steps_per_second": steps * env.inv_play_rate / duration,
+        "gpu_max_memory_allocated": 0,
+        "profiler": {
+            "time_ms/" + key: value * 1e3 / steps for key, value in timings.items()
+        },
+    }
+    print(json.dumps(report, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(cfg.benchmark.output)), exist_ok=True)
+    with open(cfg.benchmark.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    run()
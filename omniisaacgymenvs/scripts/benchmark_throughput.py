@@ -0,0 +1,121 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+import numpy as np
+import hydra
+import torch
+import json
+import time
+import os
+
+from omegaconf import DictConfig
+
+from omniisaacgymenvs.utils.hydra_cfg.hydra_utils import *
+from omniisaacgymenvs.utils.hydra_cfg.reformat import omegaconf_to_dict, print_dict
+from omniisaacgymenvs.utils.task_util import initialize_task
+from omniisaacgymenvs.envs.vec_env_rlgames import VecEnvRLGames
+
+
+def sample_actions(env: VecEnvRLGames, policy: str, device: str) -> torch.Tensor:
+    """
+    Generates the actions of the benchmark policy.
+
+    Args:
+        env (VecEnvRLGames): The environment.
+        policy (str): Either "random" or "zero".
+        device (str): The device on which the actions are generated.
+
+    Returns:
+        torch.Tensor: The actions."""
+
+    if policy == "zero":
+        return torch.zeros((env.num_envs, env._task.num_actions), device=device)
+    return torch.tensor(
+        np.array([env.action_space.sample() for _ in range(env.num_envs)]),
+        device=device,
+        dtype=torch.float32,
+    )
+
+
+@hydra.main(config_name="config", config_path="../cfg")
+def parse_hydra_configs(cfg: DictConfig):
+    """
+    Measures the throughput of a task with a random or zero policy, and writes a
+    json report. Meant to be launched headless by scripts/run_benchmarks.py."""
+
+    cfg.headless = True
+    cfg.profiler.enabled = cfg.benchmark.profile
+    cfg_dict = omegaconf_to_dict(cfg)
+    print_dict(cfg_dict)
+
+    env = VecEnvRLGames(
+        headless=True,
+        sim_device=cfg.device_id,
+        enable_livestream=False,
+        enable_viewport=False,
+    )
+    # sets seed. if seed is -1 will pick a random one
+    from omni.isaac.core.utils.torch.maths import set_seed
+
+    cfg.seed = set_seed(cfg.seed, torch_deterministic=cfg.torch_deterministic)
+    cfg_dict["seed"] = cfg.seed
+    # Scene construction: assets, physics settings, cloning and world reset
+    start = time.perf_counter()
+    task = initialize_task(cfg_dict, env)
+    scene_build_duration = time.perf_counter() - start
+
+    env.reset()
+    for _ in range(cfg.benchmark.warmup):
+        env.step(sample_actions(env, cfg.benchmark.policy, task.rl_device))
+    task.profiler.clear()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+        torch.cuda.reset_peak_memory_stats()
+
+    # Random actions are generated outside of the timed section.
+    duration = 0.0
+    for _ in range(cfg.benchmark.steps):
+        actions = sample_actions(env, cfg.benchmark.policy, task.rl_device)
+        start = time.perf_counter()
+        env.step(actions)
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+        duration += time.perf_counter() - start
+
+    report = {
+        "task": cfg.task.name,
+        "num_envs": env.num_envs,
+        "control_frequency_inv": task.control_frequency_inv,
+        "policy": cfg.benchmark.policy,
+        "steps": cfg.benchmark.steps,
+        "scene_build_duration": scene_build_duration,
+        "physics_settings_duration": task._sim_config.settings_duration,
+        "duration": duration,
+        "steps_per_second": cfg.benchmark.steps / duration,
+        "env_steps_per_second": cfg.benchmark.steps * env.num_envs / duration,
+        "physics_steps_per_second": cfg.benchmark.steps
+        * env.num_envs
+        * task.control_frequency_inv
+        / duration,
+        "gpu_max_memory_allocated": torch.cuda.max_memory_allocated()
+        if torch.cuda.is_available()
+        else 0,
+        "profiler": task.profiler.get_stats(),
+    }
+    print(json.dumps(report, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(cfg.benchmark.output)), exist_ok=True)
+    with open(cfg.benchmark.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    env.close()
+
+
+if __name__ == "__main__":
+    parse_hydra_configs()
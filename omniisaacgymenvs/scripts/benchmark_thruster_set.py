@@ -0,0 +1,121 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from rl_games.algos_torch import model_builder
+import argparse
+import torch
+import yaml
+import time
+import os
+
+from omniisaacgymenvs.utils.rlgames.thruster_set_network import register_networks
+
+CFG_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "cfg", "train", "virtual_floating_platform"
+)
+
+parser = argparse.ArgumentParser(
+    "Times the rollout and training passes of the MFP2D actor-critics on random observations."
+)
+parser.add_argument("--num_envs", type=int, default=4096, help="Rollout batch size.")
+parser.add_argument("--minibatch", type=int, default=8192, help="Training batch size.")
+parser.add_argument("--num_obs", type=int, default=22, help="State size.")
+parser.add_argument("--num_thrusters", type=int, default=8, help="Max thrusters.")
+parser.add_argument(
+    "--usable", type=float, default=0.5, help="Share of usable thrusters."
+)
+parser.add_argument("--iterations", type=int, default=100, help="Timed iterations.")
+parser.add_argument("--warmup", type=int, default=10, help="Untimed iterations.")
+parser.add_argument("--device", type=str, default="cuda:0", help="Device.")
+parser.add_argument(
+    "--configs",
+    type=str,
+    nargs="+",
+    default=[
+        "MFP2D_PPOmulti_dict_MLP_thruster.yaml",
+        "MFP2D_PPOmulti_dict_Transformer.yaml",
+        "MFP2D_PPOmulti_dict_ThrusterSet.yaml",
+    ],
+    help="Train configs to benchmark.",
+)
+args = parser.parse_args()
+
+
+def make_obs(batch_size: int) -> dict:
+    """
+    Random observations, the unusable thrusters are moved to the end of the sequence
+    like in the thruster generator."""
+
+    usable = torch.rand((batch_size, args.num_thrusters), device=args.device) < args.usable
+    usable = usable.sort(dim=1, descending=True)[0]
+    masks = 1 - usable.float()
+    transforms = torch.rand(
+        (batch_size, args.num_thrusters, 5), device=args.device
+    ) * usable.unsqueeze(-1)
+    return {
+        "state": torch.randn((batch_size, args.num_obs), device=args.device),
+        "transforms": transforms,
+        "masks": masks,
+    }
+
+
+def time_function(function) -> float:
+    for _ in range(args.warmup):
+        function()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        function()
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) * 1e3 / args.iterations
+
+
+register_networks()
+builder = model_builder.ModelBuilder()
+rollout_obs = make_obs(args.num_envs)
+train_obs = make_obs(args.minibatch)
+
+print("=========================================")
+for name in args.configs:
+    with open(os.path.join(CFG_DIR, name), "r") as f:
+        params = yaml.safe_load(f)["params"]
+    try:
+        model = builder.load(params).build(
+            {
+                "actions_num": [2] * args.num_thrusters,
+                "input_shape": {
+                    "state": (args.num_obs,),
+                    "transforms": (args.num_thrusters, 5),
+                    "masks": (args.num_thrusters,),
+                },
+                "num_seqs": 1,
+                "value_size": 1,
+                "normalize_value": False,
+                "normalize_input": False,
+            }
+        )
+    except Exception as e:
+        print(f"{name:<40} skipped: {e}")
+        continue
+    network = model.a2c_network.to(args.device)
+
+    def rollout():
+        with torch.no_grad():
+            network({"obs": rollout_obs})
+
+    def train():
+        logits, value, _ = network({"obs": train_obs})
+        (sum(l.sum() for l in logits) + value.sum()).backward()
+
+    print(
+        f"{name:<40} rollout: {time_function(rollout):.3f} ms, train: {time_function(train):.3f} ms"
+    )
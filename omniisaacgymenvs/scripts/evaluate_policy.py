@@ -14,6 +14,7 @@ from omegaconf import DictConfig
 from omniisaacgymenvs.utils.hydra_cfg.hydra_utils import *
 from omniisaacgymenvs.utils.hydra_cfg.reformat import omegaconf_to_dict, print_dict
 from omniisaacgymenvs.utils.rlgames.rlgames_utils import RLGPUAlgoObserver
+from omniisaacgymenvs.utils.rlgames.mixed_precision import set_policy_precision
 
 from rlgames_train import RLGTrainer
 from rl_games.torch_runner import Runner
@@ -49,6 +50,7 @@ def eval_multi_agents(cfg, horizon):
 
     agent = runner.create_player()
     agent.restore(cfg.checkpoint)
+    set_policy_precision(agent.model, agent.config)
 
     store_all_agents = (
         True  # store all agents generated data, if false only the first agent is stored
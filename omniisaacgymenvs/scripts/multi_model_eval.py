@@ -4,6 +4,7 @@ from omegaconf import DictConfig
 from omniisaacgymenvs.utils.hydra_cfg.hydra_utils import *
 from omniisaacgymenvs.utils.hydra_cfg.reformat import omegaconf_to_dict, print_dict
 from omniisaacgymenvs.utils.rlgames.rlgames_utils import RLGPUAlgoObserver
+from omniisaacgymenvs.utils.rlgames.mixed_precision import set_policy_precision
 
 from rlgames_train import RLGTrainer
 from rl_games.torch_runner import Runner
@@ -194,6 +195,7 @@ def parse_hydra_configs(cfg: DictConfig):
     runner.reset()
 
     agent = runner.create_player()
+    set_policy_precision(agent.model, agent.config)
     plot_intermediate = False
     eval_multi_agents(cfg, agent, models, horizon, plot_intermediate)
 
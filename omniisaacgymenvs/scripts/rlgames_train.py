@@ -30,6 +30,7 @@
 from omniisaacgymenvs.utils.hydra_cfg.hydra_utils import *
 from omniisaacgymenvs.utils.hydra_cfg.reformat import omegaconf_to_dict, print_dict
 from omniisaacgymenvs.utils.rlgames.rlgames_utils import RLGPUAlgoObserver, RLGPUEnv
+from omniisaacgymenvs.utils.rlgames.thruster_set_network import register_networks
 from omniisaacgymenvs.utils.task_util import initialize_task
 from omniisaacgymenvs.utils.config_utils.path_utils import retrieve_checkpoint_path
 from omniisaacgymenvs.envs.vec_env_rlgames import VecEnvRLGames
@@ -55,6 +56,8 @@ class RLGTrainer:
         # We use the helper function here to specify the environment config.
         self.cfg_dict["task"]["test"] = self.cfg.test
 
+        # register the networks of this repo in rl-games
+        register_networks()
         # register the rl-games adapter to use inside the runner
         vecenv.register(
             "RLGPU",
@@ -30,6 +30,7 @@
 from omniisaacgymenvs.utils.hydra_cfg.hydra_utils import *
 from omniisaacgymenvs.utils.hydra_cfg.reformat import omegaconf_to_dict, print_dict
 from omniisaacgymenvs.utils.rlgames.rlgames_utils import RLGPUAlgoObserver, RLGPUEnv
+from omniisaacgymenvs.utils.rlgames.thruster_set_network import register_networks
 from omniisaacgymenvs.utils.task_util import initialize_task
 from omniisaacgymenvs.utils.config_utils.path_utils import retrieve_checkpoint_path
 from omniisaacgymenvs.envs.vec_env_rlgames_mt import VecEnvRLGamesMT
@@ -59,6 +60,8 @@ class RLGTrainer():
         # We use the helper function here to specify the environment config.
         self.cfg_dict["task"]["test"] = self.cfg.test
 
+        # register the networks of this repo in rl-games
+        register_networks()
         # register the rl-games adapter to use inside the runner
         vecenv.register('RLGPU',
                         lambda config_name, num_actors, **kwargs: RLGPUEnv(config_name, num_actors, **kwargs))
@@ -139,6 +142,7 @@ class Trainer(TrainerMT):
             self.env.initialize(self.action_queue, self.data_queue, self.trainer.cfg_dict["mt_timeout"])
         else:
             self.env.initialize(self.action_queue, self.data_queue)
+        self.env.set_exchange_mode(self.trainer.cfg_dict.get("mt_exchange", "double_buffer"))
         self.ppo_thread = PPOTrainer(self.env, self.task, self.trainer)
         self.ppo_thread.daemon = True
         self.ppo_thread.start()
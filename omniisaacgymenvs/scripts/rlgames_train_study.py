@@ -1,6 +1,7 @@
 from omniisaacgymenvs.utils.hydra_cfg.hydra_utils import *
 from omniisaacgymenvs.utils.hydra_cfg.reformat import omegaconf_to_dict, print_dict
 from omniisaacgymenvs.utils.rlgames.rlgames_utils import RLGPUAlgoObserver, RLGPUEnv
+from omniisaacgymenvs.utils.rlgames.thruster_set_network import register_networks
 from omniisaacgymenvs.utils.task_util import initialize_task
 from omniisaacgymenvs.utils.config_utils.path_utils import retrieve_checkpoint_path
 from omniisaacgymenvs.envs.vec_env_rlgames import VecEnvRLGames
@@ -23,6 +24,7 @@ class RLGTrainer:
 
     def launch_rlg_hydra(self, env):
         self.cfg_dict["task"]["test"] = self.cfg.test
+        register_networks()
         vecenv.register(
             "RLGPU",
             lambda config_name, num_actors, **kwargs: RLGPUEnv(
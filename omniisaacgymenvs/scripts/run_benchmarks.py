@@ -0,0 +1,104 @@
+import subprocess
+import itertools
+import argparse
+import json
+import sys
+import os
+
+parser = argparse.ArgumentParser("Runs a sweep of throughput benchmarks, and compares them to a baseline.")
+parser.add_argument("--sweeps", type=str, nargs="+", required=True, help="List of path to the sweeps' config to be ran.")
+parser.add_argument("--isaac_path", type=str, default=None, help="Path to the python exec of isaac.")
+parser.add_argument("--cpu", action="store_true", help="Benchmarks the MuJoCo floating platform instead of the Isaac tasks. Does not require a GPU.")
+parser.add_argument("--output", type=str, default="benchmarks/report.json", help="Path to the report.")
+parser.add_argument("--baseline", type=str, default=None, help="Path to a previous report to compare against.")
+parser.add_argument("--tolerance", type=float, default=0.1, help="Relative drop in env steps per second counted as a regression.")
+args, unknown_args = parser.parse_known_args()
+
+WORKINGDIR = os.getcwd()
+s = WORKINGDIR.split("/")[:3]
+s = "/".join(s)
+if args.cpu:
+    python_path = sys.executable
+    script = 'scripts/benchmark_mujoco.py'
+elif args.isaac_path is None:
+    python_path = os.path.join(s, '.local/share/ov/pkg/isaac_sim-2022.2.1/python.sh')
+    script = 'scripts/benchmark_throughput.py'
+else:
+    python_path = args.isaac_path
+    script = 'scripts/benchmark_throughput.py'
+
+
+def expand_sweep(arguments):
+    """
+    Expands a sweep into the list of its runs. Arguments given as lists are swept over,
+    the others are shared by all the runs."""
+
+    keys = list(arguments.keys())
+    values = [v if isinstance(v, list) else [v] for v in arguments.values()]
+    return [dict(zip(keys, combination)) for combination in itertools.product(*values)]
+
+
+def run_key(sweep_name, arguments):
+    return sweep_name + "|" + ",".join(f"{k}={v}" for k, v in sorted(arguments.items()))
+
+
+runs = {}
+tmp_dir = os.path.join(os.path.dirname(os.path.abspath(args.output)), "runs")
+os.makedirs(tmp_dir, exist_ok=True)
+for sweep in args.sweeps:
+    # Load the configuration file
+    with open(sweep, 'r') as f:
+        sweeps = json.load(f)
+
+    # Loop through each run and execute it
+    for sweep_name, arguments in sweeps.items():
+        for i, run in enumerate(expand_sweep(arguments)):
+            run_output = os.path.join(tmp_dir, f"{sweep_name}_{i}.json")
+            if os.path.exists(run_output):
+                os.remove(run_output)
+            cmd = [python_path, script]
+            for arg, value in run.items():
+                cmd.extend(['{}'.format(arg)+"="+str(value)])
+            cmd.extend(["benchmark.output=" + run_output])
+            print(f'Running command: {" ".join(cmd)}')
+            subprocess.run(cmd)
+
+            key = run_key(sweep_name, run)
+            if not os.path.exists(run_output):
+                print(f"Benchmark failed: {key}")
+                runs[key] = {"arguments": run, "failed": True}
+                continue
+            with open(run_output, 'r') as f:
+                runs[key] = {"arguments": run, "failed": False, "results": json.load(f)}
+
+with open(args.output, 'w') as f:
+    json.dump(runs, f, indent=2, sort_keys=True)
+print(f"Report saved to {args.output}")
+
+# Scene construction time versus number of environments
+print("=========================================")
+for key, run in sorted(runs.items()):
+    if not run["failed"] and "scene_build_duration" in run["results"]:
+        results = run["results"]
+        print(f"{key}: {results['num_envs']} envs, scene build {results['scene_build_duration']:.2f} s, physics settings {results['physics_settings_duration']:.2f} s")
+
+# Compare against the baseline
+if args.baseline is not None:
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = 0
+    print("=========================================")
+    for key, run in runs.items():
+        if (key not in baseline) or baseline[key]["failed"]:
+            continue
+        if run["failed"]:
+            print(f"FAILED     {key}")
+            regressions += 1
+            continue
+        ref = baseline[key]["results"]["env_steps_per_second"]
+        new = run["results"]["env_steps_per_second"]
+        change = (new - ref) / ref
+        status = "REGRESSION" if change < -args.tolerance else "ok"
+        regressions += status == "REGRESSION"
+        print(f"{status:<10} {key}: {ref:.1f} -> {new:.1f} env steps/s ({change*100:+.1f}%)")
+    sys.exit(1 if regressions > 0 else 0)
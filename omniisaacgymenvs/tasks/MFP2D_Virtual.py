@@ -17,6 +17,10 @@ from omniisaacgymenvs.robots.articulations.views.mfp2d_virtual_thrusters_view im
 )
 from omniisaacgymenvs.utils.pin import VisualPin
 from omniisaacgymenvs.utils.arrow import VisualArrow
+from omniisaacgymenvs.utils.randomization_ledger import RandomizationLedger
+from omniisaacgymenvs.utils.observation_history import ObservationHistory
+from omniisaacgymenvs.utils.marker_updater import MarkerUpdater
+from omniisaacgymenvs.utils.usd_utils.asset_cache import AssetCache
 
 from omniisaacgymenvs.tasks.virtual_floating_platform.MFP2D_thruster_generator import (
     VirtualPlatform,
@@ -98,6 +102,23 @@ class MFP2DVirtual(RLTask):
         self.MDD = MassDistributionDisturbances(
             self._task_cfg["env"]["disturbances"]["mass"], self.num_envs, self._device
         )
+        # Records, or replays, the parameters randomized at reset
+        self.ledger = RandomizationLedger(
+            self._task_cfg["env"].get("randomization_ledger", {}),
+            self._num_envs,
+            self._device,
+        )
+        self.register_ledger_parameters()
+        # Stores the thruster transforms in fp16 and the masks in int8 to halve the rollout memory
+        self._compact_observations = self._task_cfg["env"].get(
+            "compact_observations", False
+        )
+        self._transforms_dtype = (
+            torch.float16 if self._compact_observations else torch.float32
+        )
+        self._masks_dtype = torch.int8 if self._compact_observations else torch.float32
+        # Observations written at reset only, their buffers are not copied every step
+        self.static_observations = ["transforms", "masks"]
         # Collects the platform parameters
         self.dt = self._task_cfg["sim"]["dt"]
         # Collects the task parameters
@@ -106,6 +127,10 @@ class MFP2DVirtual(RLTask):
         penalty_cfg = self._task_cfg["env"]["penalties_parameters"]
         # Instantiate the task, reward and platform
         self.task = task_factory.get(task_cfg, reward_cfg, self._num_envs, self._device)
+        # Length of the history of each observation key, 1 (state) or 0 (actions) disables it
+        history_cfg = self._task_cfg["env"].get("observation_history", {})
+        self.task.set_history(history_cfg.get("state", 1))
+        self._action_history_length = history_cfg.get("actions", 0)
         self._penalties = parse_data_dict(Penalties(), penalty_cfg)
         self.virtual_platform = VirtualPlatform(
             self._num_envs, self._platform_cfg, self._device
@@ -120,6 +145,15 @@ class MFP2DVirtual(RLTask):
         self._fp_position = torch.tensor([0, 0.0, 0.5])
         self._default_marker_position = torch.tensor([0, 0, 1.0])
         self._marker = None
+        # Reuses the assets built by previous runs, and times the scene setup
+        self._asset_cache = AssetCache(self._task_cfg["env"].get("asset_cache", {}))
+        # Skips the markers when nothing is rendered, and batches their pose writes
+        self._markers = MarkerUpdater(
+            self._task_cfg["env"].get("markers", {}),
+            self._env._render,
+            self._num_envs,
+            self._device,
+        )
         # Preallocate tensors
         self.actions = torch.zeros(
             (self._num_envs, self._max_actions),
@@ -151,10 +185,25 @@ class MFP2DVirtual(RLTask):
                     np.ones(self._num_observations) * -np.Inf,
                     np.ones(self._num_observations) * np.Inf,
                 ),
-                "transforms": spaces.Box(low=-1, high=1, shape=(self._max_actions, 5)),
-                "masks": spaces.Box(low=0, high=1, shape=(self._max_actions,)),
+                "transforms": spaces.Box(
+                    low=-1,
+                    high=1,
+                    shape=(self._max_actions, 5),
+                    dtype=np.float16 if self._compact_observations else np.float32,
+                ),
+                "masks": spaces.Box(
+                    low=0,
+                    high=1,
+                    shape=(self._max_actions,),
+                    dtype=np.int8 if self._compact_observations else np.float32,
+                ),
             }
         )
+        if self._action_history_length > 0:
+            self.observation_space.spaces["actions"] = spaces.Box(
+                np.ones(self._action_history_length * self._num_actions) * -np.Inf,
+                np.ones(self._action_history_length * self._num_actions) * np.Inf,
+            )
 
         # Defines the action space
         if self._discrete_actions == "MultiDiscrete":
@@ -200,15 +249,25 @@ class MFP2DVirtual(RLTask):
             "transforms": torch.zeros(
                 (self._num_envs, self._max_actions, 5),
                 device=self._device,
-                dtype=torch.float,
+                dtype=self._transforms_dtype,
             ),
             "masks": torch.zeros(
                 (self._num_envs, self._max_actions),
                 device=self._device,
-                dtype=torch.float,
+                dtype=self._masks_dtype,
             ),
         }
 
+        self._action_history = None
+        if self._action_history_length > 0:
+            self._action_history = ObservationHistory(
+                self._num_envs,
+                self._num_actions,
+                self._action_history_length,
+                self._device,
+            )
+            self.obs_buf["actions"] = self._action_history.get()
+
         self.states_buf = torch.zeros(
             (self._num_envs, self.num_states), device=self._device, dtype=torch.float
         )
@@ -231,10 +290,13 @@ class MFP2DVirtual(RLTask):
             scene (Usd.Stage): the USD scene to be set up."""
 
         # Add the floating platform, and the marker
-        self.get_floating_platform()
-        self.get_target()
+        with self._asset_cache.timed("robot"):
+            self.get_floating_platform()
+        if self._markers.enabled:
+            self.get_target()
 
-        RLTask.set_up_scene(self, scene, replicate_physics=False)
+        with self._asset_cache.timed("clone"):
+            RLTask.set_up_scene(self, scene, replicate_physics=False)
 
         # Collects the interactive elements in the scene
         root_path = "/World/envs/.*/Modular_floating_platform"
@@ -249,7 +311,10 @@ class MFP2DVirtual(RLTask):
         scene.add(self._platforms.thrusters)
 
         # Add arrows to scene if task is go to pose
-        scene, self._marker = self.task.add_visual_marker_to_scene(scene)
+        if self._markers.enabled:
+            scene, self._marker = self.task.add_visual_marker_to_scene(scene)
+        self._markers.set_view(self._marker)
+        self._asset_cache.report()
         return
 
     def get_floating_platform(self):
@@ -261,6 +326,7 @@ class MFP2DVirtual(RLTask):
             name="modular_floating_platform",
             translation=self._fp_position,
             cfg=self._platform_cfg,
+            asset_cache=self._asset_cache,
         )
         self._sim_config.apply_articulation_settings(
             "modular_floating_platform",
@@ -276,6 +342,24 @@ class MFP2DVirtual(RLTask):
             self.default_zero_env_path, self._default_marker_position
         )
 
+    def register_ledger_parameters(self) -> None:
+        """
+        Registers the parameters randomized at reset in the ledger."""
+
+        self.ledger.register("mass", self.MDD, "platforms_mass")
+        if self.UF._use_sinusoidal_floor:
+            self.ledger.register("floor_x_freq", self.UF, "_floor_x_freq")
+            self.ledger.register("floor_y_freq", self.UF, "_floor_y_freq")
+            self.ledger.register("floor_x_offset", self.UF, "_floor_x_offset")
+            self.ledger.register("floor_y_offset", self.UF, "_floor_y_offset")
+        else:
+            self.ledger.register("floor_forces", self.UF, "floor_forces")
+        if self.TD._use_sinusoidal_torque:
+            self.ledger.register("torque_freq", self.TD, "_torque_freq")
+            self.ledger.register("torque_offset", self.TD, "_torque_offset")
+        else:
+            self.ledger.register("torque_forces", self.TD, "torque_forces")
+
     def update_state(self) -> None:
         """
         Updates the state of the system."""
@@ -324,14 +408,32 @@ class MFP2DVirtual(RLTask):
         # Get the state
         self.obs_buf["state"] = self.task.get_state_observations(self.current_state)
         # Get thruster transforms
-        self.obs_buf["transforms"] = self.virtual_platform.current_transforms
-        # Get the action masks
-        self.obs_buf["masks"] = self.virtual_platform.action_masks
+        # The thruster transforms and masks are static, see update_static_observations
+
+        if self._action_history is not None:
+            self.obs_buf["actions"] = self._action_history.push(self.actions.float())
 
         observations = {self._platforms.name: {"obs_buf": self.obs_buf}}
 
         return observations
 
+    def update_static_observations(self, env_ids: torch.Tensor) -> None:
+        """
+        Writes the episode-static observations, the thruster transforms and masks, of
+        the given environments. They only change when the thrusters are randomized at
+        reset, so they are kept in persistent buffers that get_observations does not
+        rewrite.
+
+        Args:
+            env_ids (torch.Tensor): the indices of the environments that were reset."""
+
+        self.obs_buf["transforms"][env_ids] = self.virtual_platform.current_transforms[
+            env_ids
+        ].to(self._transforms_dtype)
+        self.obs_buf["masks"][env_ids] = self.virtual_platform.action_masks[
+            env_ids
+        ].to(self._masks_dtype)
+
     def pre_physics_step(self, actions: torch.Tensor) -> None:
         """
         This function implements the logic to be performed before physics steps.
@@ -347,6 +449,8 @@ class MFP2DVirtual(RLTask):
         # Reset the environments (Robots)
         if len(reset_env_ids) > 0:
             self.reset_idx(reset_env_ids)
+        # Writes the staged marker poses when they are due
+        self._markers.step()
         # Collect actions
         actions = actions.clone().to(self._device)
         self.actions = actions
@@ -391,6 +495,11 @@ class MFP2DVirtual(RLTask):
         )
         floor_forces = self.UF.get_floor_forces(self.root_pos)
         torque_disturbance = self.TD.get_torque_disturbance(self.root_pos)
+        if self.task.disturbance_scale is not None:
+            # Scale of the disturbances sampled by the adaptive curriculum
+            scale = self.task.disturbance_scale.unsqueeze(-1)
+            floor_forces = floor_forces * scale
+            torque_disturbance = torque_disturbance * scale
         self._platforms.base.apply_forces_and_torques_at_pos(
             forces=floor_forces,
             torques=torque_disturbance,
@@ -443,12 +552,11 @@ class MFP2DVirtual(RLTask):
         )
         target_positions[env_long, 2] = torch.ones(num_sets, device=self._device) * 2.0
         # Apply the new goals
-        if self._marker:
-            self._marker.set_world_poses(
-                target_positions[env_long],
-                target_orientation[env_long],
-                indices=env_long,
-            )
+        self._markers.set_world_poses(
+            target_positions[env_long],
+            target_orientation[env_long],
+            indices=env_long,
+        )
 
     def set_to_pose(
         self, env_ids: torch.Tensor, positions: torch.Tensor, heading: torch.Tensor
@@ -465,7 +573,11 @@ class MFP2DVirtual(RLTask):
         num_resets = len(env_ids)
         # Resets the counter of steps for which the goal was reached
         self.task.reset(env_ids)
+        self.task.reset_history(env_ids)
+        if self._action_history is not None:
+            self._action_history.reset(env_ids)
         self.virtual_platform.randomize_thruster_state(env_ids, num_resets)
+        self.update_static_observations(env_ids)
         # Randomizes the starting position of the platform within a disk around the target
         root_pos = torch.zeros_like(self.root_pos)
         root_pos[env_ids, :2] = positions
@@ -496,12 +608,22 @@ class MFP2DVirtual(RLTask):
             env_ids (torch.Tensor): the indices of the environments to be reset."""
 
         num_resets = len(env_ids)
+        # Records the parameters of the episodes that just ended
+        self.ledger.record_episodes(
+            env_ids, {"episode_length": self.progress_buf, **self.episode_sums}
+        )
         # Resets the counter of steps for which the goal was reached
         self.task.reset(env_ids)
+        self.task.reset_history(env_ids)
+        if self._action_history is not None:
+            self._action_history.reset(env_ids)
         self.virtual_platform.randomize_thruster_state(env_ids, num_resets)
+        self.update_static_observations(env_ids)
         self.UF.generate_floor(env_ids, num_resets)
         self.TD.generate_torque(env_ids, num_resets)
         self.MDD.randomize_masses(env_ids, num_resets)
+        # Replaces the randomized parameters by the ones of a previous run
+        self.ledger.replay_episodes(env_ids)
         self.MDD.set_masses(self._platforms.base, env_ids)
         # Randomizes the starting position of the platform within a disk around the target
         root_pos, root_rot = self.task.get_spawns(
@@ -535,6 +657,8 @@ class MFP2DVirtual(RLTask):
                 torch.mean(self.episode_sums[key][env_ids]) / self._max_episode_length
             )
             self.episode_sums[key][env_ids] = 0.0
+        self.extras["episode"].update(self.task.get_curriculum_stats())
+        self.extras["episode"].update(self._markers.get_stats())
 
     def update_state_statistics(self) -> None:
         """
@@ -38,6 +38,10 @@ from omniisaacgymenvs.tasks.virtual_floating_platform.MFP3D_disturbances import
 )
 
 from omniisaacgymenvs.tasks.MFP2D_Virtual import MFP2DVirtual
+from omniisaacgymenvs.utils.randomization_ledger import RandomizationLedger
+from omniisaacgymenvs.utils.observation_history import ObservationHistory
+from omniisaacgymenvs.utils.marker_updater import MarkerUpdater
+from omniisaacgymenvs.utils.usd_utils.asset_cache import AssetCache
 
 from omni.isaac.core.utils.torch.rotations import *
 from omni.isaac.core.utils.prims import get_prim_at_path
@@ -99,6 +103,23 @@ class MFP3DVirtual(MFP2DVirtual):
         self.MDD = MassDistributionDisturbances(
             self._task_cfg["env"]["disturbances"]["mass"], self.num_envs, self._device
         )
+        # Records, or replays, the parameters randomized at reset
+        self.ledger = RandomizationLedger(
+            self._task_cfg["env"].get("randomization_ledger", {}),
+            self._num_envs,
+            self._device,
+        )
+        self.register_ledger_parameters()
+        # Stores the thruster transforms in fp16 and the masks in int8 to halve the rollout memory
+        self._compact_observations = self._task_cfg["env"].get(
+            "compact_observations", False
+        )
+        self._transforms_dtype = (
+            torch.float16 if self._compact_observations else torch.float32
+        )
+        self._masks_dtype = torch.int8 if self._compact_observations else torch.float32
+        # Observations written at reset only, their buffers are not copied every step
+        self.static_observations = ["transforms", "masks"]
         # Collects the platform parameters
         self.dt = self._task_cfg["sim"]["dt"]
         # Collects the task parameters
@@ -107,6 +128,10 @@ class MFP3DVirtual(MFP2DVirtual):
         penalty_cfg = self._task_cfg["env"]["penalties_parameters"]
         # Instantiate the task, reward and platform
         self.task = task_factory.get(task_cfg, reward_cfg, self._num_envs, self._device)
+        # Length of the history of each observation key, 1 (state) or 0 (actions) disables it
+        history_cfg = self._task_cfg["env"].get("observation_history", {})
+        self.task.set_history(history_cfg.get("state", 1))
+        self._action_history_length = history_cfg.get("actions", 0)
         self._penalties = parse_data_dict(Penalties(), penalty_cfg)
         self.virtual_platform = VirtualPlatform(
             self._num_envs, self._platform_cfg, self._device
@@ -121,6 +146,15 @@ class MFP3DVirtual(MFP2DVirtual):
         self._fp_position = torch.tensor([0.0, 0.0, 0.5])
         self._default_marker_position = torch.tensor([0.0, 0.0, 0.0])
         self._marker = None
+        # Reuses the assets built by previous runs, and times the scene setup
+        self._asset_cache = AssetCache(self._task_cfg["env"].get("asset_cache", {}))
+        # Skips the markers when nothing is rendered, and batches their pose writes
+        self._markers = MarkerUpdater(
+            self._task_cfg["env"].get("markers", {}),
+            self._env._render,
+            self._num_envs,
+            self._device,
+        )
         # Preallocate tensors
         self.actions = torch.zeros(
             (self._num_envs, self._max_actions),
@@ -152,10 +186,25 @@ class MFP3DVirtual(MFP2DVirtual):
                     np.ones(self._num_observations) * -np.Inf,
                     np.ones(self._num_observations) * np.Inf,
                 ),
-                "transforms": spaces.Box(low=-1, high=1, shape=(self._max_actions, 10)),
-                "masks": spaces.Box(low=0, high=1, shape=(self._max_actions,)),
+                "transforms": spaces.Box(
+                    low=-1,
+                    high=1,
+                    shape=(self._max_actions, 10),
+                    dtype=np.float16 if self._compact_observations else np.float32,
+                ),
+                "masks": spaces.Box(
+                    low=0,
+                    high=1,
+                    shape=(self._max_actions,),
+                    dtype=np.int8 if self._compact_observations else np.float32,
+                ),
             }
         )
+        if self._action_history_length > 0:
+            self.observation_space.spaces["actions"] = spaces.Box(
+                np.ones(self._action_history_length * self._num_actions) * -np.Inf,
+                np.ones(self._action_history_length * self._num_actions) * np.Inf,
+            )
 
         # Defines the action space
         if self._discrete_actions == "MultiDiscrete":
@@ -178,10 +227,13 @@ class MFP3DVirtual(MFP2DVirtual):
             scene: The USD stage to setup."""
 
         # Add the floating platform, and the marker
-        self.get_floating_platform()
-        self.get_target()
+        with self._asset_cache.timed("robot"):
+            self.get_floating_platform()
+        if self._markers.enabled:
+            self.get_target()
 
-        RLTask.set_up_scene(self, scene)
+        with self._asset_cache.timed("clone"):
+            RLTask.set_up_scene(self, scene)
 
         # Collects the interactive elements in the scene
         root_path = "/World/envs/.*/Modular_floating_platform"
@@ -196,7 +248,10 @@ class MFP3DVirtual(MFP2DVirtual):
         scene.add(self._platforms.thrusters)
 
         # Add arrows to scene if task is go to pose
-        scene, self._marker = self.task.add_visual_marker_to_scene(scene)
+        if self._markers.enabled:
+            scene, self._marker = self.task.add_visual_marker_to_scene(scene)
+        self._markers.set_view(self._marker)
+        self._asset_cache.report()
         return
 
     def cleanup(self) -> None:
@@ -213,15 +268,25 @@ class MFP3DVirtual(MFP2DVirtual):
             "transforms": torch.zeros(
                 (self._num_envs, self._max_actions, 10),
                 device=self._device,
-                dtype=torch.float,
+                dtype=self._transforms_dtype,
             ),
             "masks": torch.zeros(
                 (self._num_envs, self._max_actions),
                 device=self._device,
-                dtype=torch.float,
+                dtype=self._masks_dtype,
             ),
         }
 
+        self._action_history = None
+        if self._action_history_length > 0:
+            self._action_history = ObservationHistory(
+                self._num_envs,
+                self._num_actions,
+                self._action_history_length,
+                self._device,
+            )
+            self.obs_buf["actions"] = self._action_history.get()
+
         self.states_buf = torch.zeros(
             (self._num_envs, self.num_states), device=self._device, dtype=torch.float
         )
@@ -245,6 +310,7 @@ class MFP3DVirtual(MFP2DVirtual):
             name="modular_floating_platform",
             translation=self._fp_position,
             cfg=self._platform_cfg,
+            asset_cache=self._asset_cache,
         )
         self._sim_config.apply_articulation_settings(
             "modular_floating_platform",
@@ -252,6 +318,26 @@ class MFP3DVirtual(MFP2DVirtual):
             self._sim_config.parse_actor_config("modular_floating_platform"),
         )
 
+    def register_ledger_parameters(self) -> None:
+        """
+        Registers the parameters randomized at reset in the ledger."""
+
+        self.ledger.register("mass", self.MDD, "platforms_mass")
+        if self.UF._use_sinusoidal_floor:
+            for axis in ["x", "y", "z"]:
+                for parameter in ["freq", "offset"]:
+                    name = "floor_" + axis + "_" + parameter
+                    self.ledger.register(name, self.UF, "_" + name)
+        else:
+            self.ledger.register("floor_forces", self.UF, "floor_forces")
+        if self.TD._use_sinusoidal_torque:
+            for axis in ["x", "y", "z"]:
+                for parameter in ["freq", "offset"]:
+                    name = "torque_" + axis + "_" + parameter
+                    self.ledger.register(name, self.TD, "_" + name)
+        else:
+            self.ledger.register("torque_forces", self.TD, "torque_forces")
+
     def update_state(self) -> None:
         """
         Updates the state of the system."""
@@ -269,6 +355,7 @@ class MFP3DVirtual(MFP2DVirtual):
         root_velocities = self.ON.add_noise_on_vel(root_velocities)
         # Compute the heading
         heading = quat_to_mat(self.root_quats)
+        self.state_velocities = root_velocities
         # Dump to state
         self.current_state = {
             "position": root_positions,
@@ -290,21 +377,18 @@ class MFP3DVirtual(MFP2DVirtual):
             env_long, self.initial_pin_pos.clone(), self.initial_pin_rot.clone()
         )
         # Apply the new goals
-        if self._marker:
-            self._marker.set_world_poses(
-                target_positions[env_long],
-                target_orientation[env_long],
-                indices=env_long,
-            )
+        self._markers.set_world_poses(
+            target_positions[env_long],
+            target_orientation[env_long],
+            indices=env_long,
+        )
 
     def update_state_statistics(self) -> None:
         """
         Updates the statistics of the state of the training."""
 
-        self.episode_sums["normed_linear_vel"] += torch.norm(
-            self.current_state["linear_velocity"], dim=-1
-        )
-        self.episode_sums["normed_angular_vel"] += torch.norm(
-            self.current_state["angular_velocity"], dim=-1
-        )
+        # Both norms in one reduction over the (noisy) velocities of the state
+        speeds = torch.linalg.vector_norm(self.state_velocities.view(-1, 2, 3), dim=-1)
+        self.episode_sums["normed_linear_vel"] += speeds[:, 0]
+        self.episode_sums["normed_angular_vel"] += speeds[:, 1]
         self.episode_sums["actions_sum"] += torch.sum(self.actions, dim=-1)
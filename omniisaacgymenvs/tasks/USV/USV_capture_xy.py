@@ -19,6 +19,7 @@ from omniisaacgymenvs.tasks.USV.USV_task_parameters import (
     CaptureXYParameters,
 )
 from omniisaacgymenvs.utils.pin import VisualPin
+from omniisaacgymenvs.utils.adaptive_curriculum import AdaptiveCurriculum
 
 from omni.isaac.core.prims import XFormPrimView
 
@@ -59,6 +60,41 @@ class CaptureXYTask(Core):
         # Initialize prev_position_dist with None
         self.prev_position_dist = None
 
+        # Adaptive curriculum over the spawn distance, heading and disturbance scale
+        self._curriculum = None
+        if (
+            self._task_parameters.spawn_curriculum
+            and self._task_parameters.spawn_curriculum_mode.lower() == "adaptive"
+        ):
+            ranges = [
+                (
+                    self._task_parameters.min_spawn_dist,
+                    self._task_parameters.max_spawn_dist,
+                ),
+                (0.0, math.pi),
+            ]
+            num_bins = [
+                self._task_parameters.adaptive_curriculum_distance_bins,
+                self._task_parameters.adaptive_curriculum_heading_bins,
+            ]
+            if self._task_parameters.adaptive_curriculum_disturbance_bins > 0:
+                ranges.append((0.0, 1.0))
+                num_bins.append(
+                    self._task_parameters.adaptive_curriculum_disturbance_bins
+                )
+                self.disturbance_scale = torch.ones(
+                    (self._num_envs), device=self._device, dtype=torch.float32
+                )
+            self._curriculum = AdaptiveCurriculum(
+                num_envs,
+                ranges,
+                num_bins,
+                metric=self._task_parameters.adaptive_curriculum_metric,
+                uniform_ratio=self._task_parameters.adaptive_curriculum_uniform_ratio,
+                ema=self._task_parameters.adaptive_curriculum_ema,
+                device=self._device,
+            )
+
     def create_stats(self, stats: dict) -> dict:
         """
         Creates a dictionary to store the training statistics for the task."""
@@ -172,7 +208,7 @@ class CaptureXYTask(Core):
         ones = torch.ones_like(self._goal_reached, dtype=torch.long)
 
         # Run curriculum if selected
-        if self._task_parameters.spawn_curriculum:
+        if self._task_parameters.spawn_curriculum and self._curriculum is None:
             if step < self._task_parameters.spawn_curriculum_warmup:
                 kill_dist = self._task_parameters.spawn_curriculum_kill_dist
             elif step > self._task_parameters.spawn_curriculum_end:
@@ -217,6 +253,12 @@ class CaptureXYTask(Core):
         """
         Resets the goal_reached_flag when an agent manages to solve its task."""
 
+        if self._curriculum is not None:
+            self._curriculum.update(
+                env_ids,
+                self._goal_reached[env_ids]
+                >= self._task_parameters.kill_after_n_steps_in_tolerance,
+            )
         self._goal_reached[env_ids] = 0
         self.just_had_been_reset = env_ids.clone()
 
@@ -256,7 +298,10 @@ class CaptureXYTask(Core):
         # Debug : print the step
         # print(f"step: {step}")
         # Run curriculum if selected
-        if self._task_parameters.spawn_curriculum:
+        if self._curriculum is not None:
+            rmax = self._task_parameters.max_spawn_dist
+            rmin = self._task_parameters.min_spawn_dist
+        elif self._task_parameters.spawn_curriculum:
             if step < self._task_parameters.spawn_curriculum_warmup:
                 rmax = self._task_parameters.spawn_curriculum_max_dist
                 rmin = self._task_parameters.spawn_curriculum_min_dist
@@ -289,7 +334,15 @@ class CaptureXYTask(Core):
             rmin = self._task_parameters.min_spawn_dist
 
         # Randomizes the starting position of the platform
-        r = torch.rand((num_resets,), device=self._device) * (rmax - rmin) + rmin
+        if self._curriculum is not None:
+            spawn = self._curriculum.sample(env_ids)
+            r = spawn[:, 0]
+            random_orient = spawn[:, 1]
+            if self.disturbance_scale is not None:
+                self.disturbance_scale[env_ids] = spawn[:, -1]
+        else:
+            r = torch.rand((num_resets,), device=self._device) * (rmax - rmin) + rmin
+            random_orient = torch.rand(num_resets, device=self._device) * math.pi
         theta = torch.rand((num_resets,), device=self._device) * 2 * math.pi
         initial_position[env_ids, 0] += (r) * torch.cos(theta) + self._target_positions[
             env_ids, 0
@@ -300,11 +353,18 @@ class CaptureXYTask(Core):
         initial_position[env_ids, 2] += 0
 
         # Randomizes the heading of the platform
-        random_orient = torch.rand(num_resets, device=self._device) * math.pi
         initial_orientation[env_ids, 0] = torch.cos(random_orient * 0.5)
         initial_orientation[env_ids, 3] = torch.sin(random_orient * 0.5)
         return initial_position, initial_orientation
 
+    def get_curriculum_stats(self) -> dict:
+        """
+        Returns the statistics of the adaptive curriculum, if the task uses one."""
+
+        if self._curriculum is None:
+            return {}
+        return self._curriculum.get_stats()
+
     def generate_target(self, path, position):
         """
         Generates a visual marker to help visualize the performance of the agent from the UI.
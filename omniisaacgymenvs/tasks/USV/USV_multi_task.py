@@ -0,0 +1,260 @@
+__author__ = "Antoine Richard, Junghwan Ro, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Junghwan Ro"
+__email__ = "jro37@gatech.edu"
+__status__ = "development"
+
+from omniisaacgymenvs.tasks.USV.USV_core import Core, TaskDict
+
+import torch
+
+task_dict = TaskDict()
+# Labels of the tasks in the observations
+TASK_IDS = {
+    "CaptureXY": task_dict.capturexy,
+    "GoToXY": task_dict.gotoxy,
+    "GoToPose": task_dict.gotopose,
+    "KeepXY": task_dict.keepxy,
+    "TrackXYVelocity": task_dict.trackxyvel,
+    "TrackXYOVelocity": task_dict.trackxyovel,
+}
+
+
+class MultiTask(Core):
+    """
+    Runs several tasks in the same launch. Every environment is assigned one of the
+    tasks at reset. All the tasks are evaluated on all the environments, and the
+    observations, rewards and kills of each environment are selected from the task
+    it was assigned. The tasks are only reset, and only draw goals and spawns, for
+    the environments they are assigned, such that their curricula only see their
+    own episodes. The TaskDict id of the task replaces the task label of the
+    observations. The success rate, the time spent in tolerance and the reward of
+    every task are reported separately."""
+
+    def __init__(
+        self, task_param: dict, reward_param: dict, num_envs: int, device: str, factory
+    ) -> None:
+        super(MultiTask, self).__init__(num_envs, device)
+        assert len(task_param["tasks"]) == len(
+            reward_param["tasks"]
+        ), "Each task must have its reward parameters."
+        self._tasks = [
+            factory.get(task_cfg, reward_cfg, num_envs, device)
+            for task_cfg, reward_cfg in zip(task_param["tasks"], reward_param["tasks"])
+        ]
+        self._names = [task_cfg["name"] for task_cfg in task_param["tasks"]]
+        assert len(set(self._names)) == len(
+            self._names
+        ), "Each task can only be used once."
+        assert all(
+            name in TASK_IDS for name in self._names
+        ), "The multi-task only supports the tasks in TASK_IDS."
+        assert all(
+            task._num_observations == self._num_observations for task in self._tasks
+        ), "All the tasks must have the same observations."
+        weights = task_param.get("weights", [1.0] * len(self._tasks))
+        assert len(weights) == len(self._tasks), "Each task must have a weight."
+        self._weights = torch.tensor(weights, device=self._device, dtype=torch.float32)
+
+        # Task of each environment, and its label in the observations
+        self._env_range = torch.arange(self._num_envs, device=self._device)
+        self._task_ids = torch.multinomial(
+            self._weights, self._num_envs, replacement=True
+        )
+        self._task_labels = torch.tensor(
+            [TASK_IDS[name] for name in self._names],
+            device=self._device,
+            dtype=torch.float32,
+        )
+        # Scale of the disturbances, forwarded from the curricula of the tasks
+        if any(task.disturbance_scale is not None for task in self._tasks):
+            self.disturbance_scale = torch.ones(
+                self._num_envs, device=self._device, dtype=torch.float32
+            )
+        # Per-task statistics buffers, reused at every step
+        self._task_stats = [task.create_stats({}) for task in self._tasks]
+        # Accumulators of the current episode of every environment
+        self._episode_steps = torch.zeros(
+            self._num_envs, device=self._device, dtype=torch.float32
+        )
+        self._episode_reward = torch.zeros_like(self._episode_steps)
+        self._episode_in_tolerance = torch.zeros_like(self._episode_steps)
+        self._in_tolerance = torch.zeros(
+            self._num_envs, device=self._device, dtype=torch.bool
+        )
+        self._reward = torch.zeros_like(self._episode_steps)
+        self._last_episode_stats = {}
+
+    def _select(self, values: list) -> torch.Tensor:
+        """
+        Selects the value of the task of every environment."""
+
+        return torch.stack(values)[self._task_ids, self._env_range]
+
+    def _split(self, env_ids: torch.Tensor) -> list:
+        """
+        Splits the environments by the task they are assigned."""
+
+        task_ids = self._task_ids[env_ids.long()]
+        return [env_ids[task_ids == i] for i in range(len(self._tasks))]
+
+    def create_stats(self, stats: dict) -> dict:
+        """
+        Creates a dictionary to store the training statistics of all the tasks."""
+
+        for task in self._tasks:
+            stats = task.create_stats(stats)
+        return stats
+
+    def get_state_observations(
+        self, current_state: dict, observation_frame: str
+    ) -> torch.Tensor:
+        """
+        Computes the observation tensor from the current state of the robot."""
+
+        self._obs_buffer[:] = self._select(
+            [
+                task.get_state_observations(current_state, observation_frame)
+                for task in self._tasks
+            ]
+        )
+        # The label of the task replaces the one of the world frame, and uses a free
+        # slot in the local one
+        label_index = 5 if observation_frame == "world" else 8
+        self._obs_buffer[:, label_index] = self._task_labels[self._task_ids]
+        if self._history is not None:
+            return self._history.push(self._obs_buffer)
+        return self._obs_buffer
+
+    def compute_reward(
+        self, current_state: torch.Tensor, actions: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Computes the reward for the current state of the robot."""
+
+        self._reward = self._select(
+            [task.compute_reward(current_state, actions) for task in self._tasks]
+        )
+        goal_reached = self._select([task._goal_reached for task in self._tasks])
+        self._in_tolerance = goal_reached > 0
+        return self._reward
+
+    def update_kills(self, step) -> torch.Tensor:
+        """
+        Updates if the platforms should be killed or not."""
+
+        return self._select([task.update_kills(step) for task in self._tasks])
+
+    def update_statistics(self, stats: dict) -> dict:
+        """
+        Updates the training statistics with the ones of the task of every environment."""
+
+        for i, task in enumerate(self._tasks):
+            for value in self._task_stats[i].values():
+                value.zero_()
+            mask = (self._task_ids == i).float()
+            for key, value in task.update_statistics(self._task_stats[i]).items():
+                stats[key] += value * mask
+        self._episode_steps += 1
+        self._episode_reward += self._reward
+        self._episode_in_tolerance += self._in_tolerance.float()
+        return stats
+
+    def reset(self, env_ids: torch.Tensor) -> None:
+        """
+        Records the statistics of the episodes that just ended, and assigns a new task
+        to the environments. The tasks only see the episodes they ran."""
+
+        for task, task_env_ids in zip(self._tasks, self._split(env_ids)):
+            if len(task_env_ids) > 0:
+                task.reset(task_env_ids)
+        env_long = env_ids.long()
+        ids = self._task_ids[env_long]
+        steps = self._episode_steps[env_long]
+        ended = steps > 0
+        success = self._in_tolerance[env_long].float()
+        in_tolerance = self._episode_in_tolerance[env_long] / steps.clamp(min=1)
+        reward = self._episode_reward[env_long] / steps.clamp(min=1)
+        self._last_episode_stats = {}
+        for i, name in enumerate(self._names):
+            mask = (ids == i) & ended
+            self._last_episode_stats[name + "_success_rate"] = success[mask]
+            self._last_episode_stats[name + "_in_tolerance"] = in_tolerance[mask]
+            self._last_episode_stats[name + "_reward"] = reward[mask]
+        self._episode_steps[env_long] = 0
+        self._episode_reward[env_long] = 0
+        self._episode_in_tolerance[env_long] = 0
+        self._in_tolerance[env_long] = False
+
+        self._task_ids[env_long] = torch.multinomial(
+            self._weights, len(env_long), replacement=True
+        )
+
+    def get_goals(
+        self,
+        env_ids: torch.Tensor,
+        target_positions: torch.Tensor,
+        target_orientations: torch.Tensor,
+    ) -> list:
+        """
+        Generates the goals of the environments with the task they are assigned."""
+
+        for task, task_env_ids in zip(self._tasks, self._split(env_ids)):
+            if len(task_env_ids) > 0:
+                target_positions, target_orientations = task.get_goals(
+                    task_env_ids, target_positions, target_orientations
+                )
+        return target_positions, target_orientations
+
+    def get_spawns(
+        self,
+        env_ids: torch.Tensor,
+        initial_position: torch.Tensor,
+        initial_orientation: torch.Tensor,
+        step: int = 0,
+    ) -> list:
+        """
+        Generates the spawns of the environments with the task they are assigned."""
+
+        for task, task_env_ids in zip(self._tasks, self._split(env_ids)):
+            if len(task_env_ids) == 0:
+                continue
+            initial_position, initial_orientation = task.get_spawns(
+                task_env_ids, initial_position, initial_orientation, step
+            )
+            if self.disturbance_scale is None:
+                continue
+            if task.disturbance_scale is None:
+                self.disturbance_scale[task_env_ids] = 1.0
+            else:
+                self.disturbance_scale[task_env_ids] = task.disturbance_scale[
+                    task_env_ids
+                ]
+        return initial_position, initial_orientation
+
+    def get_curriculum_stats(self) -> dict:
+        """
+        Returns the per-task statistics of the last episodes, and the statistics of the
+        adaptive curricula of the tasks."""
+
+        stats = dict(self._last_episode_stats)
+        for name, task in zip(self._names, self._tasks):
+            for key, value in task.get_curriculum_stats().items():
+                stats[name + "_" + key] = value
+        return stats
+
+    def generate_target(self, path, position):
+        """
+        Generates the visual marker of the first task."""
+
+        self._tasks[0].generate_target(path, position)
+
+    def add_visual_marker_to_scene(self, scene):
+        """
+        Adds the visual marker of the first task to the scene."""
+
+        return self._tasks[0].add_visual_marker_to_scene(scene)
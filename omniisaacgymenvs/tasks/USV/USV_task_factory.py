@@ -22,6 +22,8 @@ from omniisaacgymenvs.tasks.USV.USV_track_xy_velocity import (
 from omniisaacgymenvs.tasks.USV.USV_track_xyo_velocity import (
     TrackXYOVelocityTask,
 )
+from omniisaacgymenvs.tasks.USV.USV_multi_task import MultiTask
+from functools import partial
 
 
 class TaskFactory:
@@ -56,4 +58,6 @@ task_factory.register("GoToPose", GoToPoseTask)
 task_factory.register("KeepXY", KeepXYTask)
 task_factory.register("TrackXYVelocity", TrackXYVelocityTask)
 task_factory.register("TrackXYOVelocity", TrackXYOVelocityTask)
+# The multi-task builds its sub-tasks through the factory
+task_factory.register("MultiTask", partial(MultiTask, factory=task_factory))
 # task_factory.register("TrackXYVelocityHeading", TrackXYVelocityHeadingTask)
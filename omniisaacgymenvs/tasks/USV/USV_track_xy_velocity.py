@@ -98,7 +98,7 @@ class TrackXYVelocityTask(Core):
 
         return self.velocity_reward
 
-    def update_kills(self) -> torch.Tensor:
+    def update_kills(self, step=0) -> torch.Tensor:
         """
         Updates if the platforms should be killed or not."""
 
@@ -17,6 +17,10 @@ from omniisaacgymenvs.robots.articulations.views.heron_view import (
 )
 from omniisaacgymenvs.utils.pin import VisualPin
 from omniisaacgymenvs.utils.arrow import VisualArrow
+from omniisaacgymenvs.utils.randomization_ledger import RandomizationLedger
+from omniisaacgymenvs.utils.observation_history import ObservationHistory
+from omniisaacgymenvs.utils.marker_updater import MarkerUpdater
+from omniisaacgymenvs.utils.usd_utils.asset_cache import AssetCache
 
 from omniisaacgymenvs.tasks.USV.USV_task_factory import (
     task_factory,
@@ -100,6 +104,12 @@ class USVVirtual(RLTask):
         self.MDD = MassDistributionDisturbances(
             self._task_cfg["env"]["disturbances"]["mass"], self.num_envs, self._device
         )
+        # Records, or replays, the parameters randomized at reset
+        self.ledger = RandomizationLedger(
+            self._task_cfg["env"].get("randomization_ledger", {}),
+            self._num_envs,
+            self._device,
+        )
         # Collects the platform parameters
         self.dt = self._task_cfg["sim"]["dt"]
         # Collects the task parameters
@@ -201,6 +211,10 @@ class USVVirtual(RLTask):
         ]
         # Instantiate the task, reward and platform
         self.task = task_factory.get(task_cfg, reward_cfg, self._num_envs, self._device)
+        # Length of the history of each observation key, 1 (state) or 0 (actions) disables it
+        history_cfg = self._task_cfg["env"].get("observation_history", {})
+        self.task.set_history(history_cfg.get("state", 1))
+        self._action_history_length = history_cfg.get("actions", 0)
         self._penalties = parse_data_dict(Penalties(), penalty_cfg)
         self._num_observations = self.task._num_observations
         self._max_actions = 2  # Number of thrusters
@@ -212,6 +226,15 @@ class USVVirtual(RLTask):
         self._fp_position = torch.tensor([0, 0.0, 0.5])
         self._default_marker_position = torch.tensor([0, 0, 1.0])
         self._marker = None
+        # Reuses the assets built by previous runs, and times the scene setup
+        self._asset_cache = AssetCache(self._task_cfg["env"].get("asset_cache", {}))
+        # Skips the markers when nothing is rendered, and batches their pose writes
+        self._markers = MarkerUpdater(
+            self._task_cfg["env"].get("markers", {}),
+            self._env._render,
+            self._num_envs,
+            self._device,
+        )
         # Preallocate tensors
         self.actions = torch.zeros(
             (self._num_envs, self._max_actions),
@@ -287,6 +310,11 @@ class USVVirtual(RLTask):
                 ),
             }
         )
+        if self._action_history_length > 0:
+            self.observation_space.spaces["actions"] = spaces.Box(
+                np.ones(self._action_history_length * self._num_actions) * -np.Inf,
+                np.ones(self._action_history_length * self._num_actions) * np.Inf,
+            )
 
         # Defines the action space
         if self._discrete_actions == "MultiDiscrete":
@@ -333,6 +361,16 @@ class USVVirtual(RLTask):
             ),
         }
 
+        self._action_history = None
+        if self._action_history_length > 0:
+            self._action_history = ObservationHistory(
+                self._num_envs,
+                self._num_actions,
+                self._action_history_length,
+                self._device,
+            )
+            self.obs_buf["actions"] = self._action_history.get()
+
         self.states_buf = torch.zeros(
             (self._num_envs, self.num_states), device=self._device, dtype=torch.float
         )
@@ -355,11 +393,15 @@ class USVVirtual(RLTask):
             scene (Usd.Stage): the USD scene to be set up."""
 
         # Add the floating platform, and the marker
-        self.get_heron()
-        self.get_target()
+        with self._asset_cache.timed("robot"):
+            self.get_heron()
+        if self._markers.enabled:
+            self.get_target()
         self.get_USV_dynamics()
+        self.register_ledger_parameters()
 
-        RLTask.set_up_scene(self, scene, replicate_physics=False)
+        with self._asset_cache.timed("clone"):
+            RLTask.set_up_scene(self, scene, replicate_physics=False)
 
         # Collects the interactive elements in the scene
         root_path = "/World/envs/.*/heron"
@@ -373,7 +415,10 @@ class USVVirtual(RLTask):
         scene.add(self._heron.thruster_right)
 
         # Add arrows to scene if task is go to pose
-        scene, self._marker = self.task.add_visual_marker_to_scene(scene)
+        if self._markers.enabled:
+            scene, self._marker = self.task.add_visual_marker_to_scene(scene)
+        self._markers.set_view(self._marker)
+        self._asset_cache.report()
         return
 
     def get_heron(self):
@@ -385,6 +430,7 @@ class USVVirtual(RLTask):
             name="heron",
             translation=self._fp_position,
             # cfg=self._heron_cfg,
+            asset_cache=self._asset_cache,
         )
         self._sim_config.apply_articulation_settings(
             "heron",
@@ -449,6 +495,41 @@ class USVVirtual(RLTask):
             cmd_upper_range=self.cmd_upper_range,
         )
 
+    def register_ledger_parameters(self) -> None:
+        """
+        Registers the parameters randomized at reset in the ledger."""
+
+        self.ledger.register("mass", self.MDD, "platforms_mass")
+        self.ledger.register("force_const", self.UF, "disturbance_forces_const")
+        if self.UF._use_sinusoidal_force:
+            self.ledger.register("force_x_freq", self.UF, "_force_x_freq")
+            self.ledger.register("force_y_freq", self.UF, "_force_y_freq")
+            self.ledger.register("force_x_shift", self.UF, "_force_x_shift")
+            self.ledger.register("force_y_shift", self.UF, "_force_y_shift")
+            self.ledger.register("force_amp", self.UF, "_force_amp")
+        self.ledger.register("torque_const", self.TD, "disturbance_torques_const")
+        if self.TD._use_sinusoidal_torque:
+            self.ledger.register("torque_freq", self.TD, "_torque_freq")
+            self.ledger.register("torque_shift", self.TD, "_torque_shift")
+            self.ledger.register("torque_amp", self.TD, "_torque_amp")
+        self.ledger.register("linear_damping", self.hydrodynamics, "linear_damping")
+        self.ledger.register(
+            "quadratic_damping", self.hydrodynamics, "quadratic_damping"
+        )
+        self.ledger.register(
+            "thruster_multiplier", self.thrusters_dynamics, "thruster_multiplier"
+        )
+        self.ledger.register(
+            "thruster_left_multiplier",
+            self.thrusters_dynamics,
+            "thruster_left_multiplier",
+        )
+        self.ledger.register(
+            "thruster_right_multiplier",
+            self.thrusters_dynamics,
+            "thruster_right_multiplier",
+        )
+
     def update_state(self) -> None:
         """
         Updates the state of the system."""
@@ -544,6 +625,9 @@ class USVVirtual(RLTask):
             self.current_state, self._observation_frame
         )
 
+        if self._action_history is not None:
+            self.obs_buf["actions"] = self._action_history.push(self.actions.float())
+
         observations = {self._heron.name: {"obs_buf": self.obs_buf}}
 
         return observations
@@ -563,6 +647,8 @@ class USVVirtual(RLTask):
         # Reset the environments (Robots)
         if len(reset_env_ids) > 0:
             self.reset_idx(reset_env_ids)
+        # Writes the staged marker poses when they are due
+        self._markers.step()
         # Collect actions
         actions = actions.clone().to(self._device)
         self.actions = actions
@@ -602,6 +688,11 @@ class USVVirtual(RLTask):
 
         disturbance_forces = self.UF.get_disturbance_forces(self.root_pos)
         torque_disturbance = self.TD.get_torque_disturbance(self.root_pos)
+        if self.task.disturbance_scale is not None:
+            # Scale of the disturbances sampled by the adaptive curriculum
+            scale = self.task.disturbance_scale.unsqueeze(-1)
+            disturbance_forces = disturbance_forces * scale
+            torque_disturbance = torque_disturbance * scale
 
         # Hydrostatic force
         self.hydrostatic_force[:, :] = (
@@ -683,12 +774,11 @@ class USVVirtual(RLTask):
         )
         target_positions[env_long, 2] = torch.ones(num_sets, device=self._device) * 2.0
         # Apply the new goals
-        if self._marker:
-            self._marker.set_world_poses(
-                target_positions[env_long],
-                target_orientation[env_long],
-                indices=env_long,
-            )
+        self._markers.set_world_poses(
+            target_positions[env_long],
+            target_orientation[env_long],
+            indices=env_long,
+        )
 
     def set_to_pose(
         self, env_ids: torch.Tensor, positions: torch.Tensor, heading: torch.Tensor
@@ -705,6 +795,9 @@ class USVVirtual(RLTask):
         num_resets = len(env_ids)
         # Resets the counter of steps for which the goal was reached
         self.task.reset(env_ids)
+        self.task.reset_history(env_ids)
+        if self._action_history is not None:
+            self._action_history.reset(env_ids)
         # Randomizes the starting position of the platform within a disk around the target
         root_pos = torch.zeros_like(self.root_pos)
         root_pos[env_ids, :2] = positions
@@ -735,16 +828,25 @@ class USVVirtual(RLTask):
             env_ids (torch.Tensor): the indices of the environments to be reset."""
 
         num_resets = len(env_ids)
+        # Records the parameters of the episodes that just ended
+        self.ledger.record_episodes(
+            env_ids, {"episode_length": self.progress_buf, **self.episode_sums}
+        )
         # Resets the counter of steps for which the goal was reached
         self.task.reset(env_ids)
+        self.task.reset_history(env_ids)
+        if self._action_history is not None:
+            self._action_history.reset(env_ids)
         self.UF.generate_force(env_ids, num_resets)
         self.TD.generate_torque(env_ids, num_resets)
         self.MDD.randomize_masses(env_ids, num_resets)
-        self.MDD.set_masses(self._heron.base, env_ids)
         # Resets hydrodynamic coefficients
         self.hydrodynamics.reset_coefficients(env_ids, num_resets)
         # Resets thruster randomization
         self.thrusters_dynamics.reset_thruster_randomization(env_ids, num_resets)
+        # Replaces the randomized parameters by the ones of a previous run
+        self.ledger.replay_episodes(env_ids)
+        self.MDD.set_masses(self._heron.base, env_ids)
         # Randomizes the starting position of the platform within a disk around the target
         root_pos, root_rot = self.task.get_spawns(
             env_ids,
@@ -792,6 +894,8 @@ class USVVirtual(RLTask):
                 torch.mean(self.episode_sums[key][env_ids]) / self._max_episode_length
             )
             self.episode_sums[key][env_ids] = 0.0
+        self.extras["episode"].update(self.task.get_curriculum_stats())
+        self.extras["episode"].update(self._markers.get_stats())
 
     def update_state_statistics(self) -> None:
         """
@@ -30,6 +30,7 @@ from omniisaacgymenvs.tasks.base.rl_task import RLTask
 from omniisaacgymenvs.robots.articulations.anymal import Anymal
 from omniisaacgymenvs.robots.articulations.views.anymal_view import AnymalView
 from omniisaacgymenvs.tasks.utils.anymal_terrain_generator import *
+from omniisaacgymenvs.tasks.utils.height_sampler import HeightSampler
 from omniisaacgymenvs.utils.terrain_utils.terrain_utils import *
 
 from omni.isaac.core.utils.prims import get_prim_at_path
@@ -176,18 +177,22 @@ class AnymalTerrainTask(RLTask):
         grid_x, grid_y = torch.meshgrid(x, y)
 
         self.num_height_points = grid_x.numel()
-        points = torch.zeros(self.num_envs, self.num_height_points, 3, device=self.device, requires_grad=False)
-        points[:, :, 0] = grid_x.flatten()
-        points[:, :, 1] = grid_y.flatten()
+        points = torch.zeros(self.num_height_points, 2, device=self.device, requires_grad=False)
+        points[:, 0] = grid_x.flatten()
+        points[:, 1] = grid_y.flatten()
         return points
     
     def _create_trimesh(self):
-        self.terrain = Terrain(self._task_cfg["env"]["terrain"], num_robots=self.num_envs)
+        terrain_cfg = self._task_cfg["env"]["terrain"]
+        cache_dir = terrain_cfg.get("cacheDir", None) if terrain_cfg.get("useCache", False) else None
+        self.terrain = Terrain(terrain_cfg, num_robots=self.num_envs, cache_dir=cache_dir)
         vertices = self.terrain.vertices
         triangles = self.terrain.triangles
         position = torch.tensor([-self.terrain.border_size , -self.terrain.border_size , 0.0])
         add_terrain_to_stage(stage=self._stage, vertices=vertices, triangles=triangles, position=position)  
         self.height_samples = torch.tensor(self.terrain.heightsamples).view(self.terrain.tot_rows, self.terrain.tot_cols).to(self.device)
+        self.height_sampler = HeightSampler(self.terrain.heightsamples, self.terrain.horizontal_scale, self.terrain.vertical_scale, self.terrain.border_size, device=self.device)
+        self.height_sampler.add_pattern("base_scan", self.height_points)
 
     def set_up_scene(self, scene) -> None:
         self._stage = get_current_stage()
@@ -226,8 +231,7 @@ class AnymalTerrainTask(RLTask):
             self.default_dof_pos[:, i] = angle
 
     def post_reset(self):
-        for i in range(self.num_envs):
-            self.env_origins[i] = self.terrain_origins[self.terrain_levels[i], self.terrain_types[i]]
+        self.env_origins[:] = self.terrain_origins[self.terrain_levels, self.terrain_types]
         self.num_dof = self._anymals.num_dof
         self.dof_pos = torch.zeros((self.num_envs, self.num_dof), dtype=torch.float, device=self.device)
         self.dof_vel = torch.zeros((self.num_envs, self.num_dof), dtype=torch.float, device=self.device)
@@ -434,51 +438,16 @@ class AnymalTerrainTask(RLTask):
     
     def get_ground_heights_below_knees(self):
         points = self.knee_pos.reshape(self.num_envs, 4, 3)
-        points += self.terrain.border_size
-        points = (points/self.terrain.horizontal_scale).long()
-        px = points[:, :, 0].view(-1)
-        py = points[:, :, 1].view(-1)
-        px = torch.clip(px, 0, self.height_samples.shape[0]-2)
-        py = torch.clip(py, 0, self.height_samples.shape[1]-2)
-
-        heights1 = self.height_samples[px, py]
-        heights2 = self.height_samples[px+1, py+1]
-        heights = torch.min(heights1, heights2)
-        return heights.view(self.num_envs, -1) * self.terrain.vertical_scale
+        return self.height_sampler.sample(points[:, :, :2])
     
     def get_ground_heights_below_base(self):
         points = self.base_pos.reshape(self.num_envs, 1, 3)
-        points += self.terrain.border_size
-        points = (points/self.terrain.horizontal_scale).long()
-        px = points[:, :, 0].view(-1)
-        py = points[:, :, 1].view(-1)
-        px = torch.clip(px, 0, self.height_samples.shape[0]-2)
-        py = torch.clip(py, 0, self.height_samples.shape[1]-2)
-
-        heights1 = self.height_samples[px, py]
-        heights2 = self.height_samples[px+1, py+1]
-        heights = torch.min(heights1, heights2)
-        return heights.view(self.num_envs, -1) * self.terrain.vertical_scale
+        return self.height_sampler.sample(points[:, :, :2])
                                     
     def get_heights(self, env_ids=None):
-        if env_ids:
-            points = quat_apply_yaw(self.base_quat[env_ids].repeat(1, self.num_height_points), self.height_points[env_ids]) + (self.base_pos[env_ids, 0:3]).unsqueeze(1)
-        else:
-            points = quat_apply_yaw(self.base_quat.repeat(1, self.num_height_points), self.height_points) + (self.base_pos[:, 0:3]).unsqueeze(1)
- 
-        points += self.terrain.border_size
-        points = (points/self.terrain.horizontal_scale).long()
-        px = points[:, :, 0].view(-1)
-        py = points[:, :, 1].view(-1)
-        px = torch.clip(px, 0, self.height_samples.shape[0]-2)
-        py = torch.clip(py, 0, self.height_samples.shape[1]-2)
-
-        heights1 = self.height_samples[px, py]
-
-        heights2 = self.height_samples[px+1, py+1]
-        heights = torch.min(heights1, heights2)
-
-        return heights.view(self.num_envs, -1) * self.terrain.vertical_scale
+        if env_ids is not None:
+            return self.height_sampler.sample_pattern("base_scan", self.base_pos[env_ids], self.base_quat[env_ids])
+        return self.height_sampler.sample_pattern("base_scan", self.base_pos, self.base_quat)
 
 
 
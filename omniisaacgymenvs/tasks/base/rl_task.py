@@ -38,6 +38,7 @@ from omni.isaac.core.utils.prims import define_prim
 from omni.isaac.cloner import GridCloner
 from omniisaacgymenvs.tasks.utils.usd_utils import create_distant_light
 from omniisaacgymenvs.utils.domain_randomization.randomize import Randomizer
+from omniisaacgymenvs.utils.step_profiler import StepProfiler
 import omni.kit
 from omni.kit.viewport.utility.camera_state import ViewportCameraState
 from omni.kit.viewport.utility import get_viewport_from_window_name
@@ -81,6 +82,14 @@ class RLTask(BaseTask):
 
         print("RL device: ", self.rl_device)
 
+        profiler_cfg = self._cfg.get("profiler", dict())
+        self.profiler = StepProfiler(
+            device=self._device,
+            enabled=profiler_cfg.get("enabled", False),
+            sample_every=profiler_cfg.get("sample_every", 100),
+            log_every=profiler_cfg.get("log_every", 10),
+        )
+
         self._env = env
 
         if not hasattr(self, "_num_agents"):
@@ -294,10 +303,16 @@ class RLTask(BaseTask):
         self.progress_buf[:] += 1
 
         if self._env._world.is_playing():
+            self.profiler.start("get_observations")
             self.get_observations()
             self.get_states()
+            self.profiler.stop("get_observations")
+            self.profiler.start("calculate_metrics")
             self.calculate_metrics()
+            self.profiler.stop("calculate_metrics")
+            self.profiler.start("is_done")
             self.is_done()
+            self.profiler.stop("is_done")
             self.get_extras()
 
         return self.obs_buf, self.rew_buf, self.reset_buf, self.extras
@@ -30,6 +30,7 @@
 from omniisaacgymenvs.tasks.base.rl_task import RLTask
 from omniisaacgymenvs.robots.articulations.crazyflie import Crazyflie
 from omniisaacgymenvs.robots.articulations.views.crazyflie_view import CrazyflieView
+from omniisaacgymenvs.tasks.utils.rotor_actuator import RotorActuator, RotorMotorModel
 
 from omni.isaac.core.utils.torch.rotations import *
 from omni.isaac.core.objects import DynamicSphere
@@ -75,14 +76,8 @@ class CrazyflieTask(RLTask):
         self.motor_damp_time_up = 0.15
         self.motor_damp_time_down = 0.15
 
-        # I use the multiplier 4, since 4*T ~ time for a step response to finish, where
-        # T is a time constant of the first-order filter
-        self.motor_tau_up = 4 * self.dt / (self.motor_damp_time_up + EPS)
-        self.motor_tau_down = 4 * self.dt / (self.motor_damp_time_down + EPS)
-
-        self.thrusts = torch.zeros((self._num_envs, 4, 3), dtype=torch.float32, device=self._device)
-        self.thrust_cmds_damp = torch.zeros((self._num_envs, 4), dtype=torch.float32, device=self._device)
-        self.thrust_rot_damp = torch.zeros((self._num_envs, 4), dtype=torch.float32, device=self._device)
+        self.motors = RotorMotorModel(self._num_envs, 4, self.dt, self.motor_damp_time_up, self.motor_damp_time_down,
+                                      noise_std=0.01, device=self._device, eps=EPS)
 
         # thrust max
         self.mass = 0.028
@@ -123,8 +118,7 @@ class CrazyflieTask(RLTask):
         self._balls = RigidPrimView(prim_paths_expr="/World/envs/.*/ball")
         scene.add(self._copters)
         scene.add(self._balls)
-        for i in range(4):
-            scene.add(self._copters.physics_rotors[i])
+        scene.add(self._copters.rotors)
         return
 
     def get_crazyflie(self):
@@ -196,62 +190,22 @@ class CrazyflieTask(RLTask):
         # scale to [0.0, 1.0]
         thrust_cmds = (thrust_cmds + 1.0) / 2.0
         # filtering the thruster and adding noise
-        motor_tau = self.motor_tau_up * torch.ones((self._num_envs, 4), dtype=torch.float32, device=self._device)
-        motor_tau[thrust_cmds < self.thrust_cmds_damp] = self.motor_tau_down
-        motor_tau[motor_tau > 1.0] = 1.0
-
-        # Since NN commands thrusts we need to convert to rot vel and back
-        thrust_rot = thrust_cmds ** 0.5
-        self.thrust_rot_damp = motor_tau * (thrust_rot - self.thrust_rot_damp) + self.thrust_rot_damp
-        self.thrust_cmds_damp = self.thrust_rot_damp ** 2
-
-        ## Adding noise
-        thrust_noise = 0.01 * torch.randn(4, dtype=torch.float32, device=self._device)
-        thrust_noise = thrust_cmds * thrust_noise
-        self.thrust_cmds_damp = torch.clamp(self.thrust_cmds_damp + thrust_noise, min=0.0, max=1.0)
+        thrust_cmds_damp = self.motors.step(thrust_cmds)
 
-        thrusts = self.thrust_max * self.thrust_cmds_damp
+        thrusts = self.thrust_max * thrust_cmds_damp
 
         # thrusts given rotation
         root_quats = self.root_rot
         rot_x = quat_axis(root_quats, 0)
         rot_y = quat_axis(root_quats, 1)
         rot_z = quat_axis(root_quats, 2)
-        rot_matrix = torch.cat((rot_x, rot_y, rot_z), 1).reshape(-1, 3, 3)
-
-        force_x = torch.zeros(self._num_envs, 4, dtype=torch.float32, device=self._device)
-        force_y = torch.zeros(self._num_envs, 4, dtype=torch.float32, device=self._device)
-        force_xy = torch.cat((force_x, force_y), 1).reshape(-1, 4, 2)
-        thrusts = thrusts.reshape(-1, 4, 1)
-        thrusts = torch.cat((force_xy, thrusts), 2)
-
-        thrusts_0 = thrusts[:, 0]
-        thrusts_0 = thrusts_0[:, :, None]
-
-        thrusts_1 = thrusts[:, 1]
-        thrusts_1 = thrusts_1[:, :, None]
-
-        thrusts_2 = thrusts[:, 2]
-        thrusts_2 = thrusts_2[:, :, None]
-
-        thrusts_3 = thrusts[:, 3]
-        thrusts_3 = thrusts_3[:, :, None]
-
-        mod_thrusts_0 = torch.matmul(rot_matrix, thrusts_0)
-        mod_thrusts_1 = torch.matmul(rot_matrix, thrusts_1)
-        mod_thrusts_2 = torch.matmul(rot_matrix, thrusts_2)
-        mod_thrusts_3 = torch.matmul(rot_matrix, thrusts_3)
-
-        self.thrusts[:, 0] = torch.squeeze(mod_thrusts_0)
-        self.thrusts[:, 1] = torch.squeeze(mod_thrusts_1)
-        self.thrusts[:, 2] = torch.squeeze(mod_thrusts_2)
-        self.thrusts[:, 3] = torch.squeeze(mod_thrusts_3)
+        rot_matrix = torch.stack((rot_x, rot_y, rot_z), 1)
 
-        # clear actions for reset envs
-        self.thrusts[reset_env_ids] = 0
+        # rotate the thrusts of all the rotors at once, and clear actions for reset envs
+        self.thrusts = self.actuator.set_thrusts(thrusts, rot_matrix=rot_matrix, reset_env_ids=reset_env_ids)
 
         # spin spinning rotors
-        prop_rot = self.thrust_cmds_damp * self.prop_max_rot
+        prop_rot = thrust_cmds_damp * self.prop_max_rot
         self.dof_vel[:, 0] = prop_rot[:, 0]
         self.dof_vel[:, 1] = -1.0 * prop_rot[:, 1]
         self.dof_vel[:, 2] = prop_rot[:, 2]
@@ -260,8 +214,7 @@ class CrazyflieTask(RLTask):
         self._copters.set_joint_velocities(self.dof_vel)
 
         # apply actions
-        for i in range(4):
-            self._copters.physics_rotors[i].apply_forces(self.thrusts[:, i], indices=self.all_indices)
+        self.actuator.apply()
 
     def post_reset(self):
         self.root_pos, self.root_rot = self._copters.get_world_poses()
@@ -273,9 +226,9 @@ class CrazyflieTask(RLTask):
         self.initial_root_pos, self.initial_root_rot = self.root_pos.clone(), self.root_rot.clone()
 
         # control parameters
-        self.thrusts = torch.zeros((self._num_envs, 4, 3), dtype=torch.float32, device=self._device)
-        self.thrust_cmds_damp = torch.zeros((self._num_envs, 4), dtype=torch.float32, device=self._device)
-        self.thrust_rot_damp = torch.zeros((self._num_envs, 4), dtype=torch.float32, device=self._device)
+        self.actuator = RotorActuator(self._copters.rotors, self._num_envs, 4, device=self._device)
+        self.thrusts = self.actuator.forces
+        self.motors.reset()
 
         self.set_targets(self.all_indices)
 
@@ -315,8 +268,7 @@ class CrazyflieTask(RLTask):
         self.reset_buf[env_ids] = 0
         self.progress_buf[env_ids] = 0
 
-        self.thrust_cmds_damp[env_ids] = 0
-        self.thrust_rot_damp[env_ids] = 0
+        self.motors.reset(env_ids)
 
 
         # fill extras
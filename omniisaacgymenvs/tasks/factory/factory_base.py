@@ -263,6 +263,9 @@ class FactoryBase(RLTask, FactoryABCBase):
             self.cfg_ctrl['force_ctrl_axes'] = torch.tensor(self.cfg_task.ctrl.hybrid_force_motion.force_ctrl_axes,
                                                             device=self.device).repeat((self.num_envs, 1))
 
+        self._compute_dof_pos_target, self._compute_dof_torque = fc.get_compiled_controller(
+            compile=self.cfg_task.ctrl.all.get('compile', False))
+
         if self.cfg_ctrl['motor_ctrl_mode'] == 'gym':
             for i in range(7):
                 joint_prim = self._stage.GetPrimAtPath(self.default_zero_env_path + f"/franka/panda_link{i}/panda_joint{i+1}")
@@ -406,7 +409,7 @@ class FactoryBase(RLTask, FactoryABCBase):
     def _set_dof_pos_target(self):
         """Set Franka DOF position target to move fingertips towards target pose."""
 
-        self.ctrl_target_dof_pos = fc.compute_dof_pos_target(
+        self.ctrl_target_dof_pos = self._compute_dof_pos_target(
             cfg_ctrl=self.cfg_ctrl,
             arm_dof_pos=self.arm_dof_pos,
             fingertip_midpoint_pos=self.fingertip_midpoint_pos,
@@ -424,7 +427,7 @@ class FactoryBase(RLTask, FactoryABCBase):
     def _set_dof_torque(self):
         """Set Franka DOF torque to move fingertips towards target pose."""
 
-        self.dof_torque = fc.compute_dof_torque(
+        self.dof_torque = self._compute_dof_torque(
             cfg_ctrl=self.cfg_ctrl,
             dof_pos=self.dof_pos,
             dof_vel=self.dof_vel,
@@ -48,7 +48,7 @@ def compute_dof_pos_target(cfg_ctrl,
                            device):
     """Compute Franka DOF position target to move fingertips towards target pose."""
 
-    ctrl_target_dof_pos = torch.zeros((cfg_ctrl['num_envs'], 9), device=device)
+    ctrl_target_dof_pos = _get_workspace(cfg_ctrl, 'ctrl_target_dof_pos', (cfg_ctrl['num_envs'], 9), device)
 
     pos_error, axis_angle_error = get_pose_error(
         fingertip_midpoint_pos=fingertip_midpoint_pos,
@@ -62,7 +62,8 @@ def compute_dof_pos_target(cfg_ctrl,
     delta_arm_dof_pos = _get_delta_dof_pos(delta_pose=delta_fingertip_pose,
                                            ik_method=cfg_ctrl['ik_method'],
                                            jacobian=jacobian,
-                                           device=device)
+                                           device=device,
+                                           cfg_ctrl=cfg_ctrl)
 
     ctrl_target_dof_pos[:, 0:7] = arm_dof_pos + delta_arm_dof_pos
     ctrl_target_dof_pos[:, 7:9] = ctrl_target_gripper_dof_pos  # gripper finger joints
@@ -91,7 +92,8 @@ def compute_dof_torque(cfg_ctrl,
     # 1) https://ethz.ch/content/dam/ethz/special-interest/mavt/robotics-n-intelligent-systems/rsl-dam/documents/RobotDynamics2018/RD_HS2018script.pdf
     # 2) Modern Robotics
 
-    dof_torque = torch.zeros((cfg_ctrl['num_envs'], 9), device=device)
+    dof_torque = _get_workspace(cfg_ctrl, 'dof_torque', (cfg_ctrl['num_envs'], 9), device)
+    dof_torque.zero_()
 
     if cfg_ctrl['gain_space'] == 'joint':
         pos_error, axis_angle_error = get_pose_error(
@@ -107,7 +109,8 @@ def compute_dof_torque(cfg_ctrl,
         delta_arm_dof_pos = _get_delta_dof_pos(delta_pose=delta_fingertip_pose,
                                                ik_method=cfg_ctrl['ik_method'],
                                                jacobian=jacobian,
-                                               device=device)
+                                               device=device,
+                                               cfg_ctrl=cfg_ctrl)
         dof_torque[:, 0:7] = cfg_ctrl['joint_prop_gains'] * delta_arm_dof_pos + \
                              cfg_ctrl['joint_deriv_gains'] * (0.0 - dof_vel[:, 0:7])
 
@@ -117,7 +120,8 @@ def compute_dof_torque(cfg_ctrl,
             dof_torque[:, 0:7] = (arm_mass_matrix_joint @ dof_torque[:, 0:7].unsqueeze(-1)).squeeze(-1)
 
     elif cfg_ctrl['gain_space'] == 'task':
-        task_wrench = torch.zeros((cfg_ctrl['num_envs'], 6), device=device)
+        task_wrench = _get_workspace(cfg_ctrl, 'task_wrench', (cfg_ctrl['num_envs'], 6), device)
+        task_wrench.zero_()
 
         if cfg_ctrl['do_motion_ctrl']:
             pos_error, axis_angle_error = get_pose_error(
@@ -138,16 +142,16 @@ def compute_dof_torque(cfg_ctrl,
 
             if cfg_ctrl['do_inertial_comp']:
                 # Set tau = Lambda * tau, where Lambda is the task-space mass matrix
+                # Lambda = (J M^-1 J^T)^-1 (ETH eq. 3.86; geometric Jacobian is assumed), applied with solves instead of inverses
                 jacobian_T = torch.transpose(jacobian, dim0=1, dim1=2)
-                arm_mass_matrix_task = torch.inverse(jacobian @ torch.inverse(arm_mass_matrix) @ jacobian_T)  # ETH eq. 3.86; geometric Jacobian is assumed
-                task_wrench_motion = (arm_mass_matrix_task @ task_wrench_motion.unsqueeze(-1)).squeeze(-1)
+                arm_mass_matrix_task_inv = jacobian @ _solve_spd(arm_mass_matrix, jacobian_T)
+                task_wrench_motion = torch.linalg.solve(arm_mass_matrix_task_inv, task_wrench_motion.unsqueeze(-1)).squeeze(-1)
 
-            task_wrench = task_wrench + torch.tensor(cfg_ctrl['motion_ctrl_axes'], device=device).unsqueeze(0) * task_wrench_motion
+            task_wrench += torch.as_tensor(cfg_ctrl['motion_ctrl_axes'], device=device) * task_wrench_motion
 
         if cfg_ctrl['do_force_ctrl']:
             # Set tau = tau + F_t, where F_t is the target contact wrench
-            task_wrench_force = torch.zeros((cfg_ctrl['num_envs'], 6), device=device)
-            task_wrench_force = task_wrench_force + ctrl_target_fingertip_contact_wrench  # open-loop force control (building towards ETH eq. 3.96-3.98)
+            task_wrench_force = ctrl_target_fingertip_contact_wrench.clone()  # open-loop force control (building towards ETH eq. 3.96-3.98)
 
             if cfg_ctrl['force_ctrl_method'] == 'closed':
                 force_error, torque_error = _get_wrench_error(
@@ -161,8 +165,7 @@ def compute_dof_torque(cfg_ctrl,
                 task_wrench_force = task_wrench_force + cfg_ctrl['wrench_prop_gains'] * torch.cat(
                     (force_error, torque_error), dim=1)  # part of Modern Robotics eq. 11.61
 
-            task_wrench = task_wrench + torch.tensor(cfg_ctrl['force_ctrl_axes'], device=device).unsqueeze(
-                0) * task_wrench_force
+            task_wrench += torch.as_tensor(cfg_ctrl['force_ctrl_axes'], device=device) * task_wrench_force
 
         # Set tau = J^T * tau, i.e., map tau into joint space as desired
         jacobian_T = torch.transpose(jacobian, dim0=1, dim1=2)
@@ -170,7 +173,7 @@ def compute_dof_torque(cfg_ctrl,
 
     dof_torque[:, 7:9] = cfg_ctrl['gripper_prop_gains'] * (ctrl_target_gripper_dof_pos - dof_pos[:, 7:9]) + \
                          cfg_ctrl['gripper_deriv_gains'] * (0.0 - dof_vel[:, 7:9])  # gripper finger joints
-    dof_torque = torch.clamp(dof_torque, min=-100.0, max=100.0)
+    dof_torque.clamp_(min=-100.0, max=100.0)
 
     return dof_torque
 
@@ -229,7 +232,29 @@ def _get_wrench_error(left_finger_force,
     return force_error, torque_error
 
 
-def _get_delta_dof_pos(delta_pose, ik_method, jacobian, device):
+def _solve_spd(matrix, rhs):
+    """Solve a batch of symmetric positive definite systems with a Cholesky factorization.
+    The matrices that are not positive definite are solved with their pseudoinverse instead,
+    merged without branching such that the step never waits for the device."""
+
+    matrix_chol, info = torch.linalg.cholesky_ex(matrix)
+    solution = torch.cholesky_solve(rhs, matrix_chol)
+    pinv_solution = torch.linalg.pinv(matrix, hermitian=True) @ rhs
+    return torch.where((info != 0)[..., None, None], pinv_solution, solution)
+
+
+def _get_workspace(cfg_ctrl, name, shape, device):
+    """Get a persistent buffer of the controller, allocated on first use."""
+
+    workspace = cfg_ctrl.setdefault('workspace', {})
+    buffer = workspace.get(name, None)
+    if buffer is None or buffer.shape != shape:
+        buffer = torch.zeros(shape, device=device)
+        workspace[name] = buffer
+    return buffer
+
+
+def _get_delta_dof_pos(delta_pose, ik_method, jacobian, device, cfg_ctrl=None):
     """Get delta Franka DOF position from delta pose using specified IK method."""
     # References:
     # 1) https://www.cs.cmu.edu/~15464-s13/lectures/lecture6/iksurvey.pdf
@@ -250,18 +275,27 @@ def _get_delta_dof_pos(delta_pose, ik_method, jacobian, device):
     elif ik_method == 'dls':  # damped least squares (Levenberg-Marquardt)
         lambda_val = 0.1
         jacobian_T = torch.transpose(jacobian, dim0=1, dim1=2)
-        lambda_matrix = (lambda_val ** 2) * torch.eye(n=jacobian.shape[1], device=device)
-        delta_dof_pos = jacobian_T @ torch.inverse(jacobian @ jacobian_T + lambda_matrix) @ delta_pose.unsqueeze(-1)
+        if cfg_ctrl is not None:
+            lambda_matrix = cfg_ctrl.setdefault('workspace', {}).get('lambda_matrix', None)
+            if lambda_matrix is None or lambda_matrix.shape[0] != jacobian.shape[1]:
+                lambda_matrix = (lambda_val ** 2) * torch.eye(n=jacobian.shape[1], device=device)
+                cfg_ctrl['workspace']['lambda_matrix'] = lambda_matrix
+        else:
+            lambda_matrix = (lambda_val ** 2) * torch.eye(n=jacobian.shape[1], device=device)
+        # J J^T + lambda^2 I is symmetric positive definite, solve with a Cholesky factorization instead of inverting it
+        dls_matrix = torch.baddbmm(lambda_matrix.expand(jacobian.shape[0], -1, -1), jacobian, jacobian_T)
+        delta_dof_pos = jacobian_T @ _solve_spd(dls_matrix, delta_pose.unsqueeze(-1))
         delta_dof_pos = delta_dof_pos.squeeze(-1)
 
     elif ik_method == 'svd':  # adaptive SVD
         k_val = 1.0
-        U, S, Vh = torch.linalg.svd(jacobian)
+        # reduced SVD, only the first 6 right singular vectors are used
+        U, S, Vh = torch.linalg.svd(jacobian, full_matrices=False)
         S_inv = 1. / S
         min_singular_value = 1.0e-5
         S_inv = torch.where(S > min_singular_value, S_inv, torch.zeros_like(S_inv))
-        jacobian_pinv = torch.transpose(Vh, dim0=1, dim1=2)[:, :, :6] @ torch.diag_embed(S_inv) @ torch.transpose(U, dim0=1, dim1=2)
-        delta_dof_pos = k_val * jacobian_pinv @ delta_pose.unsqueeze(-1)
+        # J^+ e = V S^-1 U^T e, evaluated right to left to avoid forming J^+
+        delta_dof_pos = k_val * torch.transpose(Vh, dim0=1, dim1=2) @ (S_inv.unsqueeze(-1) * (torch.transpose(U, dim0=1, dim1=2) @ delta_pose.unsqueeze(-1)))
         delta_dof_pos = delta_dof_pos.squeeze(-1)
 
     return delta_dof_pos
@@ -274,19 +308,21 @@ def _apply_task_space_gains(delta_fingertip_pose,
                             task_deriv_gains):
     """Interpret PD gains as task-space gains. Apply to task-space error."""
 
-    task_wrench = torch.zeros_like(delta_fingertip_pose)
+    # Apply gains to lin and rot error components at once
+    fingertip_midpoint_vel = torch.cat((fingertip_midpoint_linvel, fingertip_midpoint_angvel), dim=1)
+    task_wrench = task_prop_gains * delta_fingertip_pose - task_deriv_gains * fingertip_midpoint_vel
 
-    # Apply gains to lin error components
-    lin_error = delta_fingertip_pose[:, 0:3]
-    task_wrench[:, 0:3] = task_prop_gains[:, 0:3] * lin_error + \
-                          task_deriv_gains[:, 0:3] * (0.0 - fingertip_midpoint_linvel)
+    return task_wrench
 
-    # Apply gains to rot error components
-    rot_error = delta_fingertip_pose[:, 3:6]
-    task_wrench[:, 3:6] = task_prop_gains[:, 3:6] * rot_error + \
-                          task_deriv_gains[:, 3:6] * (0.0 - fingertip_midpoint_angvel)
 
-    return task_wrench
+def get_compiled_controller(compile=True):
+    """Get the DOF position target and DOF torque controllers, compiled into single graphs with torch.compile when available."""
+
+    if compile and hasattr(torch, 'compile'):
+        return torch.compile(compute_dof_pos_target), torch.compile(compute_dof_torque)
+    if compile:
+        print("torch.compile is not available, the Factory controller runs eagerly.")
+    return compute_dof_pos_target, compute_dof_torque
 
 
 def get_analytic_jacobian(fingertip_quat, fingertip_jacobian, num_envs, device):
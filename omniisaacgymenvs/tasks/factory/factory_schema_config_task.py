@@ -73,6 +73,7 @@ class All:
     jacobian_type: str  # map between joint space and task space via geometric or analytic Jacobian {geometric, analytic}
     gripper_prop_gains: list[float]  # proportional gains on left and right Franka gripper finger DOF position (2)
     gripper_deriv_gains: list[float]  # derivative gains on left and right Franka gripper finger DOF position (2)
+    compile: bool = False  # compile the controller with torch.compile, when available
 
 
 @dataclass
@@ -30,6 +30,7 @@
 from omniisaacgymenvs.tasks.base.rl_task import RLTask
 from omniisaacgymenvs.robots.articulations.ingenuity import Ingenuity
 from omniisaacgymenvs.robots.articulations.views.ingenuity_view import IngenuityView
+from omniisaacgymenvs.tasks.utils.rotor_actuator import RotorActuator
 
 from omni.isaac.core.utils.torch.rotations import *
 from omni.isaac.core.objects import DynamicSphere
@@ -88,8 +89,8 @@ class IngenuityTask(RLTask):
         self._balls = RigidPrimView(prim_paths_expr="/World/envs/.*/ball", name="targets_view", reset_xform_properties=False)
         scene.add(self._copters)
         scene.add(self._balls)
+        scene.add(self._copters.rotors)
         for i in range(2):
-            scene.add(self._copters.physics_rotors[i])
             scene.add(self._copters.visual_rotors[i])
         return
 
@@ -157,13 +158,11 @@ class IngenuityTask(RLTask):
             self.thrust_lateral_component,
         )
 
-        self.thrusts[:, 0, 2] = self.dt * vertical_thrust_prop_0
-        self.thrusts[:, 0, 0:2] = self.thrusts[:, 0, 2, None] * lateral_fraction_prop_0
-        self.thrusts[:, 1, 2] = self.dt * vertical_thrust_prop_1
-        self.thrusts[:, 1, 0:2] = self.thrusts[:, 1, 2, None] * lateral_fraction_prop_1
+        vertical_thrusts = self.dt * torch.stack((vertical_thrust_prop_0, vertical_thrust_prop_1), dim=1)
+        lateral_fractions = torch.stack((lateral_fraction_prop_0, lateral_fraction_prop_1), dim=1)
 
         # clear actions for reset envs
-        self.thrusts[reset_env_ids] = 0
+        self.thrusts = self.actuator.set_thrusts(vertical_thrusts, lateral_fractions=lateral_fractions, reset_env_ids=reset_env_ids)
 
         # spin spinning rotors
         self.dof_vel[:, self.spinning_indices[0]] = 50
@@ -171,8 +170,7 @@ class IngenuityTask(RLTask):
         self._copters.set_joint_velocities(self.dof_vel)
 
         # apply actions
-        for i in range(2):
-            self._copters.physics_rotors[i].apply_forces(self.thrusts[:, i], indices=self.all_indices)
+        self.actuator.apply()
 
     def post_reset(self):
         self.root_pos, self.root_rot = self._copters.get_world_poses()
@@ -184,7 +182,8 @@ class IngenuityTask(RLTask):
         self.initial_root_pos, self.initial_root_rot = self.root_pos.clone(), self.root_rot.clone()
 
         # control tensors
-        self.thrusts = torch.zeros((self._num_envs, 2, 3), dtype=torch.float32, device=self._device)
+        self.actuator = RotorActuator(self._copters.rotors, self._num_envs, 2, device=self._device)
+        self.thrusts = self.actuator.forces
 
     def set_targets(self, env_ids):
         num_sets = len(env_ids)
@@ -29,6 +29,7 @@
 from omniisaacgymenvs.tasks.base.rl_task import RLTask
 from omniisaacgymenvs.robots.articulations.quadcopter import Quadcopter
 from omniisaacgymenvs.robots.articulations.views.quadcopter_view import QuadcopterView
+from omniisaacgymenvs.tasks.utils.rotor_actuator import RotorActuator
 
 from omni.isaac.core.utils.prims import get_prim_at_path
 from omni.isaac.core.utils.torch.rotations import *
@@ -141,25 +142,21 @@ class QuadcopterTask(RLTask):
         self.thrusts += self.dt * thrust_action_speed_scale * actions[:, 8:12]
         self.thrusts[:] = tensor_clamp(self.thrusts, self.thrust_lower_limits, self.thrust_upper_limits)
 
-        self.forces[:, 0, 2] = self.thrusts[:, 0]
-        self.forces[:, 1, 2] = self.thrusts[:, 1]
-        self.forces[:, 2, 2] = self.thrusts[:, 2]
-        self.forces[:, 3, 2] = self.thrusts[:, 3]
-
         # clear actions for reset envs
         self.thrusts[reset_env_ids] = 0.0
-        self.forces[reset_env_ids] = 0.0
+        self.actuator.set_thrusts(self.thrusts, reset_env_ids=reset_env_ids)
         self.dof_position_targets[reset_env_ids] = self.dof_pos[reset_env_ids]
 
         # apply actions
         self._copters.set_joint_position_targets(self.dof_position_targets)        
-        self._copters.rotors.apply_forces(self.forces, is_global=False)
+        self.actuator.apply(is_global=False)
 
     def post_reset(self):
         # control tensors
         self.dof_position_targets = torch.zeros((self._num_envs, self._copters.num_dof), dtype=torch.float32, device=self._device, requires_grad=False)
         self.thrusts = torch.zeros((self._num_envs, 4), dtype=torch.float32, device=self._device, requires_grad=False)
-        self.forces = torch.zeros((self._num_envs, self._copters.rotors.count // self._num_envs, 3), dtype=torch.float32, device=self._device, requires_grad=False)
+        self.actuator = RotorActuator(self._copters.rotors, self._num_envs, self._copters.rotors.count // self._num_envs, device=self._device)
+        self.forces = self.actuator.forces
 
         self.target_positions = torch.zeros((self._num_envs, 3), device=self._device)
         self.target_positions[:, 2] = 1.0
@@ -27,15 +27,22 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import numpy as np
+import hashlib
 import torch
 import math
+import json
+import os
 
 from omniisaacgymenvs.utils.terrain_utils.terrain_utils import *
 
 
+# terrain config entries that change the generated terrain
+TERRAIN_CACHE_KEYS = ["curriculum", "mapLength", "mapWidth", "numLevels", "numTerrains", "terrainProportions", "slopeTreshold"]
+
+
 # terrain generator
 class Terrain:
-    def __init__(self, cfg, num_robots) -> None:
+    def __init__(self, cfg, num_robots, cache_dir=None) -> None:
         self.horizontal_scale = 0.1
         self.vertical_scale = 0.005
         self.border_size = 20
@@ -57,6 +64,12 @@ class Terrain:
         self.tot_cols = int(self.env_cols * self.width_per_env_pixels) + 2 * self.border
         self.tot_rows = int(self.env_rows * self.length_per_env_pixels) + 2 * self.border
 
+        cache_path = None
+        if cache_dir:
+            cache_path = os.path.join(cache_dir, "terrain_" + self.get_cache_key(cfg, num_robots) + ".npz")
+            if self.load_cache(cache_path):
+                return
+
         self.height_field_raw = np.zeros((self.tot_rows , self.tot_cols), dtype=np.int16)
         if cfg["curriculum"]:
             self.curiculum(num_robots, num_terrains=self.env_cols, num_levels=self.env_rows)
@@ -64,6 +77,60 @@ class Terrain:
             self.randomized_terrain()   
         self.heightsamples = self.height_field_raw
         self.vertices, self.triangles = convert_heightfield_to_trimesh(self.height_field_raw, self.horizontal_scale, self.vertical_scale, cfg["slopeTreshold"])
+        if cache_path is not None:
+            self.save_cache(cache_path)
+
+    @staticmethod
+    def get_cache_key(cfg, num_robots):
+        """
+        The terrain is generated with numpy's global random generator, hence the key covers
+        the terrain config, the number of robots and the state of the generator, which
+        depends on the seed."""
+        h = hashlib.sha1(json.dumps({k: cfg[k] for k in TERRAIN_CACHE_KEYS}, sort_keys=True).encode())
+        h.update(str(num_robots).encode())
+        name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+        h.update(keys.tobytes())
+        h.update(f"{name}{pos}{has_gauss}{cached_gaussian}".encode())
+        return h.hexdigest()
+
+    def load_cache(self, path):
+        """
+        Loads a terrain generated previously, and restores the random generator to the state
+        it had after generating it, such that the rest of the run is unchanged."""
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path) as data:
+                self.height_field_raw = data["height_field_raw"]
+                self.env_origins = data["env_origins"]
+                self.vertices = data["vertices"]
+                self.triangles = data["triangles"]
+                rng_state = ("MT19937", data["rng_keys"], int(data["rng_pos"]), int(data["rng_has_gauss"]), float(data["rng_cached_gaussian"]))
+        except Exception as e:
+            print("Loading the terrain cache failed: ", e)
+            return False
+        np.random.set_state(rng_state)
+        self.heightsamples = self.height_field_raw
+        print("Loaded terrain from cache: ", path)
+        return True
+
+    def save_cache(self, path):
+        _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # write then rename, such that a cache file is always complete
+            np.savez(path + ".tmp.npz",
+                     height_field_raw=self.height_field_raw,
+                     env_origins=self.env_origins,
+                     vertices=self.vertices,
+                     triangles=self.triangles,
+                     rng_keys=keys,
+                     rng_pos=pos,
+                     rng_has_gauss=has_gauss,
+                     rng_cached_gaussian=cached_gaussian)
+            os.replace(path + ".tmp.npz", path)
+        except Exception as e:
+            print("Saving failed: ", e)
     
     def randomized_terrain(self):
         for k in range(self.num_maps):
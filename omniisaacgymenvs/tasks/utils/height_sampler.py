@@ -0,0 +1,116 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import numpy as np
+import torch
+
+
+class HeightSampler:
+    """
+    Samples the height of a terrain at arbitrary positions.
+    The heightfield is stored once on the device, in meters, and sampled with exact
+    bilinear interpolation. Scan patterns are registered as 2D offsets in the body frame,
+    they are rotated by the yaw of the robots and sampled in a single batched gather."""
+
+    def __init__(self, height_field_raw, horizontal_scale, vertical_scale, border_size, device="cuda:0"):
+        """
+        Args:
+            height_field_raw (np.array): the heightfield, in vertical_scale units.
+            horizontal_scale (float): the distance between two cells of the heightfield [meters].
+            vertical_scale (float): the vertical resolution of the heightfield [meters].
+            border_size (float): the offset between the origin of the world and the first cell [meters].
+            device (str): the device on which the heights are sampled.
+        """
+        self.device = device
+        self.horizontal_scale = horizontal_scale
+        self.border_size = border_size
+        self.heights = torch.tensor(np.asarray(height_field_raw), dtype=torch.float, device=device) * vertical_scale
+        self.num_rows, self.num_cols = self.heights.shape
+        self._flat_heights = self.heights.view(-1)
+        self.patterns = {}
+
+    def add_pattern(self, name, offsets):
+        """
+        Registers a scan pattern.
+
+        Args:
+            name (str): the name of the pattern.
+            offsets (torch.Tensor): the (num_points, 2) xy positions of the scan points in the body frame [meters].
+        """
+        self.patterns[name] = torch.as_tensor(offsets, dtype=torch.float, device=self.device)[:, :2].contiguous()
+
+    def sample(self, points):
+        """
+        Bilinear sampling of the heightfield. The points outside of the heightfield are
+        clamped to its edges.
+
+        Args:
+            points (torch.Tensor): the (..., 2) xy positions in the world frame [meters].
+
+        Returns:
+            torch.Tensor: the (...) heights of the terrain [meters].
+        """
+        u = ((points[..., 0] + self.border_size) / self.horizontal_scale).clamp(0, self.num_rows - 1)
+        v = ((points[..., 1] + self.border_size) / self.horizontal_scale).clamp(0, self.num_cols - 1)
+        # the lower corner is clamped such that the upper corner stays inside the heightfield
+        u0 = u.floor().clamp(max=self.num_rows - 2)
+        v0 = v.floor().clamp(max=self.num_cols - 2)
+        fu = u - u0
+        fv = v - v0
+        idx = u0.long() * self.num_cols + v0.long()
+        h00 = self._flat_heights[idx]
+        h01 = self._flat_heights[idx + 1]
+        h10 = self._flat_heights[idx + self.num_cols]
+        h11 = self._flat_heights[idx + self.num_cols + 1]
+        h0 = torch.lerp(h00, h01, fv)
+        h1 = torch.lerp(h10, h11, fv)
+        return torch.lerp(h0, h1, fu)
+
+    def sample_pattern(self, name, base_pos, base_quat):
+        """
+        Samples a scan pattern around each robot. The pattern follows the yaw of the robot.
+
+        Args:
+            name (str): the name of the pattern.
+            base_pos (torch.Tensor): the (num_envs, 3) positions of the robots [meters].
+            base_quat (torch.Tensor): the (num_envs, 4) orientations of the robots (w, x, y, z).
+
+        Returns:
+            torch.Tensor: the (num_envs, num_points) heights of the terrain [meters].
+        """
+        offsets = self.patterns[name]
+        # yaw-only rotation, obtained by zeroing the x and y components of the quaternion
+        w = base_quat[:, 0:1]
+        z = base_quat[:, 3:4]
+        norm = w * w + z * z
+        cos = (w * w - z * z) / norm
+        sin = 2 * w * z / norm
+        x = base_pos[:, 0:1] + cos * offsets[:, 0] - sin * offsets[:, 1]
+        y = base_pos[:, 1:2] + sin * offsets[:, 0] + cos * offsets[:, 1]
+        return self.sample(torch.stack((x, y), dim=-1))
@@ -0,0 +1,133 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import torch
+
+
+class RotorMotorModel:
+    """
+    First-order model of the rotor motors of a multirotor.
+    The thrust commands are converted to rotational speeds, filtered with different time
+    constants when spinning up or down, converted back to thrusts, and perturbed with a
+    multiplicative noise drawn independently for every env and rotor. All the state is
+    kept in persistent buffers."""
+
+    def __init__(self, num_envs, num_rotors, dt, damp_time_up, damp_time_down, noise_std=0.0, device="cuda:0", eps=1e-6):
+        """
+        Args:
+            num_envs (int): the number of environments.
+            num_rotors (int): the number of rotors of a robot.
+            dt (float): the duration of a control step [s].
+            damp_time_up (float): the time for a step response to finish when spinning up [s].
+            damp_time_down (float): the time for a step response to finish when spinning down [s].
+            noise_std (float): the standard deviation of the relative thrust noise.
+            device (str): the device on which the buffers are allocated.
+            eps (float): avoids a division by zero for instantaneous motors.
+        """
+        # the multiplier 4 is used since 4*T ~ time for a step response to finish, where
+        # T is a time constant of the first-order filter
+        self.tau_up = min(4 * dt / (damp_time_up + eps), 1.0)
+        self.tau_down = min(4 * dt / (damp_time_down + eps), 1.0)
+        self.noise_std = noise_std
+
+        self.thrust_cmds_damp = torch.zeros((num_envs, num_rotors), dtype=torch.float32, device=device)
+        self.thrust_rot_damp = torch.zeros((num_envs, num_rotors), dtype=torch.float32, device=device)
+        self.noise = torch.zeros((num_envs, num_rotors), dtype=torch.float32, device=device)
+
+    def reset(self, env_ids=None):
+        if env_ids is None:
+            self.thrust_cmds_damp.zero_()
+            self.thrust_rot_damp.zero_()
+        else:
+            self.thrust_cmds_damp[env_ids] = 0
+            self.thrust_rot_damp[env_ids] = 0
+
+    def step(self, thrust_cmds):
+        """
+        Args:
+            thrust_cmds (torch.Tensor): the (num_envs, num_rotors) thrust commands, in [0, 1].
+
+        Returns:
+            torch.Tensor: the (num_envs, num_rotors) filtered and noisy thrust commands, in [0, 1].
+        """
+        motor_tau = torch.where(thrust_cmds < self.thrust_cmds_damp, self.tau_down, self.tau_up)
+        # Since the commands are thrusts we need to convert to rot vel and back
+        self.thrust_rot_damp.addcmul_(motor_tau, thrust_cmds.sqrt() - self.thrust_rot_damp)
+        torch.square(self.thrust_rot_damp, out=self.thrust_cmds_damp)
+        if self.noise_std > 0:
+            self.noise.normal_(0.0, self.noise_std)
+            self.thrust_cmds_damp.addcmul_(self.noise, thrust_cmds).clamp_(0.0, 1.0)
+        return self.thrust_cmds_damp
+
+
+class RotorActuator:
+    """
+    Applies the thrust of all the rotors of all the environments at once.
+    The forces are written in a persistent (num_envs, num_rotors, 3) buffer, optionally
+    rotated with a single batched matmul, and applied through one rigid prim view
+    covering every rotor. The view must list the rotors env by env, in the same order
+    as the rotors of the buffer."""
+
+    def __init__(self, rotors, num_envs, num_rotors, device="cuda:0"):
+        """
+        Args:
+            rotors (RigidPrimView): a view covering all the rotors of all the environments.
+            num_envs (int): the number of environments.
+            num_rotors (int): the number of rotors of a robot.
+            device (str): the device on which the buffers are allocated.
+        """
+        self.rotors = rotors
+        self.num_envs = num_envs
+        self.num_rotors = num_rotors
+        self.forces = torch.zeros((num_envs, num_rotors, 3), dtype=torch.float32, device=device)
+        self._flat_forces = self.forces.view(-1, 3)
+
+    def set_thrusts(self, thrusts, lateral_fractions=None, rot_matrix=None, reset_env_ids=None):
+        """
+        Args:
+            thrusts (torch.Tensor): the (num_envs, num_rotors) thrusts along the rotor axes [N].
+            lateral_fractions (torch.Tensor): optional (num_envs, num_rotors, 2) lateral forces, as fractions of the thrusts.
+            rot_matrix (torch.Tensor): optional (num_envs, 3, 3) matrices applied to the forces of every rotor of an env.
+            reset_env_ids (torch.Tensor): the envs whose forces are cleared.
+        """
+        self.forces[:, :, 2] = thrusts
+        if lateral_fractions is None:
+            self.forces[:, :, 0:2] = 0
+        else:
+            self.forces[:, :, 0:2] = lateral_fractions * self.forces[:, :, 2:3]
+        if rot_matrix is not None:
+            # (M f)^T = f^T M^T, for every rotor at once
+            self.forces[:] = torch.matmul(self.forces, rot_matrix.transpose(1, 2))
+        if reset_env_ids is not None:
+            self.forces[reset_env_ids] = 0
+        return self.forces
+
+    def apply(self, is_global=True):
+        self.rotors.apply_forces(self._flat_forces, is_global=is_global)
@@ -8,6 +8,7 @@ __maintainer__ = "Antoine Richard"
 __email__ = "antoine.richard@uni.lu"
 __status__ = "development"
 
+from omniisaacgymenvs.utils.observation_history import ObservationHistory
 import torch
 from dataclasses import dataclass
 
@@ -42,6 +43,13 @@ class Core:
         self._task_data = torch.zeros(
             (self._num_envs, 4), device=self._device, dtype=torch.float32
         )
+        # History of the observations, see set_history
+        self._history = None
+        # Adaptive spawn curriculum, set by the tasks that use one
+        self._curriculum = None
+        # Scale of the disturbances of each environment, set by the tasks whose
+        # adaptive curriculum bins it. None when the disturbances are not scaled.
+        self.disturbance_scale = None
 
     def update_observation_tensor(self, current_state: dict) -> torch.Tensor:
         """
@@ -52,8 +60,34 @@ class Core:
         self._obs_buffer[:, 4] = current_state["angular_velocity"]
         self._obs_buffer[:, 5] = self._task_label
         self._obs_buffer[:, 6:10] = self._task_data
+        if self._history is not None:
+            return self._history.push(self._obs_buffer)
         return self._obs_buffer
 
+    def set_history(self, length: int) -> None:
+        """
+        Makes the state observations a history of the last length observations,
+        oldest first. Must be called before the observation space is created.
+
+        Args:
+            length (int): The number of observations in the history, 1 disables it."""
+
+        if length > 1:
+            self._history = ObservationHistory(
+                self._num_envs, self._num_observations, length, self._device
+            )
+            self._num_observations *= length
+
+    def reset_history(self, env_ids: torch.Tensor) -> None:
+        """
+        Zeroes the observation history of the given environments.
+
+        Args:
+            env_ids (torch.Tensor): The ids of the environments being reset."""
+
+        if self._history is not None:
+            self._history.reset(env_ids)
+
     def create_stats(self, stats: dict) -> dict:
         """
         Creates a dictionary to store the training statistics for the task."""
@@ -115,6 +149,12 @@ class Core:
 
         raise NotImplementedError
 
+    def get_curriculum_stats(self) -> dict:
+        """
+        Returns the statistics of the adaptive curriculum, if the task uses one."""
+
+        return {}
+
     def generate_target(self, path, position):
         """
         Generates a visual marker to help visualize the performance of the agent from the UI.
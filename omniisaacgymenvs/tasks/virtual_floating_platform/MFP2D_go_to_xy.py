@@ -19,6 +19,7 @@ from omniisaacgymenvs.tasks.virtual_floating_platform.MFP2D_task_parameters impo
     GoToXYParameters,
 )
 from omniisaacgymenvs.utils.pin import VisualPin
+from omniisaacgymenvs.utils.adaptive_curriculum import AdaptiveCurriculum
 
 from omni.isaac.core.prims import XFormPrimView
 
@@ -53,6 +54,40 @@ class GoToXYTask(Core):
         )
         self._task_label = self._task_label * 0
 
+        # Adaptive curriculum over the spawn distance, heading and disturbance scale
+        if (
+            self._task_parameters.spawn_curriculum
+            and self._task_parameters.spawn_curriculum_mode.lower() == "adaptive"
+        ):
+            ranges = [
+                (
+                    self._task_parameters.min_spawn_dist,
+                    self._task_parameters.max_spawn_dist,
+                ),
+                (0.0, math.pi),
+            ]
+            num_bins = [
+                self._task_parameters.adaptive_curriculum_distance_bins,
+                self._task_parameters.adaptive_curriculum_heading_bins,
+            ]
+            if self._task_parameters.adaptive_curriculum_disturbance_bins > 0:
+                ranges.append((0.0, 1.0))
+                num_bins.append(
+                    self._task_parameters.adaptive_curriculum_disturbance_bins
+                )
+                self.disturbance_scale = torch.ones(
+                    (self._num_envs), device=self._device, dtype=torch.float32
+                )
+            self._curriculum = AdaptiveCurriculum(
+                num_envs,
+                ranges,
+                num_bins,
+                metric=self._task_parameters.adaptive_curriculum_metric,
+                uniform_ratio=self._task_parameters.adaptive_curriculum_uniform_ratio,
+                ema=self._task_parameters.adaptive_curriculum_ema,
+                device=self._device,
+            )
+
     def create_stats(self, stats: dict) -> dict:
         """
         Creates a dictionary to store the training statistics for the task."""
@@ -137,6 +172,12 @@ class GoToXYTask(Core):
         """
         Resets the goal_reached_flag when an agent manages to solve its task."""
 
+        if self._curriculum is not None:
+            self._curriculum.update(
+                env_ids,
+                self._goal_reached[env_ids]
+                > self._task_parameters.kill_after_n_steps_in_tolerance,
+            )
         self._goal_reached[env_ids] = 0
 
     def get_goals(
@@ -172,7 +213,10 @@ class GoToXYTask(Core):
         # Resets the counter of steps for which the goal was reached
         self._goal_reached[env_ids] = 0
         # Run curriculum if selected
-        if self._task_parameters.spawn_curriculum:
+        if self._curriculum is not None:
+            rmax = self._task_parameters.max_spawn_dist
+            rmin = self._task_parameters.min_spawn_dist
+        elif self._task_parameters.spawn_curriculum:
             if step < self._task_parameters.spawn_curriculum_warmup:
                 rmax = self._task_parameters.spawn_curriculum_max_dist
                 rmin = self._task_parameters.spawn_curriculum_min_dist
@@ -205,7 +249,15 @@ class GoToXYTask(Core):
             rmin = self._task_parameters.min_spawn_dist
 
         # Randomizes the starting position of the platform
-        r = torch.rand((num_resets,), device=self._device) * (rmax - rmin) + rmin
+        if self._curriculum is not None:
+            spawn = self._curriculum.sample(env_ids)
+            r = spawn[:, 0]
+            random_orient = spawn[:, 1]
+            if self.disturbance_scale is not None:
+                self.disturbance_scale[env_ids] = spawn[:, -1]
+        else:
+            r = torch.rand((num_resets,), device=self._device) * (rmax - rmin) + rmin
+            random_orient = torch.rand(num_resets, device=self._device) * math.pi
         theta = torch.rand((num_resets,), device=self._device) * 2 * math.pi
         initial_position[env_ids, 0] += (r) * torch.cos(theta) + self._target_positions[
             env_ids, 0
@@ -216,11 +268,18 @@ class GoToXYTask(Core):
         initial_position[env_ids, 2] += 0
 
         # Randomizes the heading of the platform
-        random_orient = torch.rand(num_resets, device=self._device) * math.pi
         initial_orientation[env_ids, 0] = torch.cos(random_orient * 0.5)
         initial_orientation[env_ids, 3] = torch.sin(random_orient * 0.5)
         return initial_position, initial_orientation
 
+    def get_curriculum_stats(self) -> dict:
+        """
+        Returns the statistics of the adaptive curriculum, if the task uses one."""
+
+        if self._curriculum is None:
+            return {}
+        return self._curriculum.get_stats()
+
     def generate_target(self, path, position):
         """
         Generates a visual marker to help visualize the performance of the agent from the UI.
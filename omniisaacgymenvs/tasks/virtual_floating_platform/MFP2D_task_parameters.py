@@ -33,14 +33,25 @@ class GoToXYParameters:
     spawn_curriculum_mode: str = "linear"
     spawn_curriculum_warmup: int = 250
     spawn_curriculum_end: int = 750
+    # Adaptive curriculum: bins the spawn distance, heading and optionally the scale of
+    # the disturbances, and samples the resets according to the success rate of each
+    # bin.
+    adaptive_curriculum_distance_bins: int = 8
+    adaptive_curriculum_heading_bins: int = 4
+    # Bins of the scale of the force and torque disturbances in [0, 1], 0 disables it
+    adaptive_curriculum_disturbance_bins: int = 0
+    adaptive_curriculum_metric: str = "difficulty"
+    adaptive_curriculum_uniform_ratio: float = 0.2
+    adaptive_curriculum_ema: float = 0.05
 
     def __post_init__(self) -> None:
         """
         Checks that the curicullum parameters are valid."""
 
         assert self.spawn_curriculum_mode.lower() in [
-            "linear"
-        ], "Linear is the only currently supported mode."
+            "linear",
+            "adaptive",
+        ], "Linear and adaptive are the only currently supported modes."
         if not self.spawn_curriculum:
             self.spawn_curriculum_max_dist = 0
             self.spawn_curriculum_min_dist = 0
@@ -9,6 +9,7 @@ __email__ = "antoine.richard@uni.lu"
 __status__ = "development"
 
 import torch
+from typing import Tuple
 from dataclasses import dataclass
 
 from omniisaacgymenvs.tasks.virtual_floating_platform.MFP2D_core import Core as Core2D
@@ -36,6 +37,64 @@ def quat_to_mat(quat: torch.Tensor) -> torch.Tensor:
     return R.reshape(quat.shape[:-1] + (3, 3))
 
 
+# Integer codes of the distance rewards, for the TorchScript kernels
+REWARD_MODES = {"linear": 0, "square": 1, "exponential": 2}
+
+
+@torch.jit.script
+def _distance_reward(distance: torch.Tensor, mode: int, scale: float) -> torch.Tensor:
+    if mode == 2:
+        return torch.exp(-distance / 0.25) * scale
+    # the square mode uses the same shaping as the linear mode
+    return 1.0 / (1.0 + distance) * scale
+
+
+@torch.jit.script
+def se3_pose_error(
+    position: torch.Tensor,
+    rotation: torch.Tensor,
+    target_position: torch.Tensor,
+    target_rotation: torch.Tensor,
+    task_data: torch.Tensor,
+    position_mode: int,
+    heading_mode: int,
+    position_scale: float,
+    heading_scale: float,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Computes the pose error of the platforms and its rewards in a single pass.
+    The position error and the first two rows of R^T R_target (the 6D orientation
+    error) are written in place into task_data. The geodesic heading distance is
+    obtained from trace(R^T R_target), that is the sum of R * R_target, so the third
+    row of the relative rotation is never computed.
+
+    Args:
+        position (torch.Tensor): The (N, 3) positions of the platforms.
+        rotation (torch.Tensor): The (N, 3, 3) orientations of the platforms.
+        target_position (torch.Tensor): The (N, 3) target positions.
+        target_rotation (torch.Tensor): The (N, 3, 3) target orientations.
+        task_data (torch.Tensor): The (N, 9) task data, written in place.
+        position_mode (int): The REWARD_MODES code of the position reward.
+        heading_mode (int): The REWARD_MODES code of the heading reward.
+        position_scale (float): The scale of the position reward.
+        heading_scale (float): The scale of the heading reward.
+
+    Returns:
+        Tuple[torch.Tensor, ...]: The position error, the position distance, the
+        heading distance, the position reward and the heading reward."""
+
+    position_error = target_position - position
+    heading_error = torch.bmm(rotation[:, :, :2].transpose(1, 2), target_rotation)
+    task_data[:, :3] = position_error
+    task_data[:, 3:9] = heading_error.reshape(-1, 6)
+    position_dist = torch.sqrt(torch.square(position_error).sum(-1))
+    trace = (rotation * target_rotation).sum((1, 2))
+    heading_dist = torch.arccos(torch.clamp((trace - 1) / 2, -1.0, 1.0))
+    position_reward = _distance_reward(position_dist, position_mode, position_scale)
+    heading_reward = _distance_reward(heading_dist, heading_mode, heading_scale)
+    return position_error, position_dist, heading_dist, position_reward, heading_reward
+
+
 def axis_angle_rotation(angle: torch.Tensor, axis: str) -> torch.Tensor:
     cos = torch.cos(angle)
     sin = torch.sin(angle)
@@ -90,6 +149,13 @@ class Core(Core2D):
         self._task_data = torch.zeros(
             (self._num_envs, 9), device=self._device, dtype=torch.float32
         )
+        # History of the observations, see set_history
+        self._history = None
+        # Adaptive spawn curriculum, set by the tasks that use one
+        self._curriculum = None
+        # Scale of the disturbances of each environment, set by the tasks whose
+        # adaptive curriculum bins it. None when the disturbances are not scaled.
+        self.disturbance_scale = None
 
     def update_observation_tensor(self, current_state: dict) -> torch.Tensor:
         """
@@ -102,6 +168,8 @@ class Core(Core2D):
         self._obs_buffer[:, 9:12] = current_state["angular_velocity"]
         self._obs_buffer[:, 12] = self._task_label
         self._obs_buffer[:, 13:] = self._task_data
+        if self._history is not None:
+            return self._history.push(self._obs_buffer)
         return self._obs_buffer
 
 
@@ -12,6 +12,8 @@ from omniisaacgymenvs.tasks.virtual_floating_platform.MFP3D_core import (
     Core,
     parse_data_dict,
     quat_to_mat,
+    se3_pose_error,
+    REWARD_MODES,
 )
 from omniisaacgymenvs.tasks.virtual_floating_platform.MFP3D_task_rewards import (
     GoToPoseReward,
@@ -62,6 +64,13 @@ class GoToPoseTask(GoToPoseTask2D, Core):
         )
         # self._target_headings_as_mat = torch.zeros((self._num_envs, 3, 3), device=self._device, dtype=torch.float32)
         self._task_label = self._task_label * 1
+        # Reward codes of the fused pose error kernel
+        self._position_reward_mode = REWARD_MODES[
+            self._reward_parameters.position_reward_mode.lower()
+        ]
+        self._heading_reward_mode = REWARD_MODES[
+            self._reward_parameters.heading_reward_mode.lower()
+        ]
 
     def update_observation_tensor(self, current_state: dict) -> torch.Tensor:
         return Core.update_observation_tensor(self, current_state)
@@ -70,16 +79,23 @@ class GoToPoseTask(GoToPoseTask2D, Core):
         """
         Computes the observation tensor from the current state of the robot.""" ""
 
-        # position distance
-        self._position_error = self._target_positions - current_state["position"]
-        # heading distance
-        self._heading_error = torch.bmm(
-            torch.transpose(current_state["orientation"], -2, -1), self._target_headings
-        )
-        # Encode task data
-        self._task_data[:, :3] = self._position_error
-        self._task_data[:, 3:] = self._heading_error[:, :2, :].reshape(
-            self._num_envs, 6
+        # Position and heading errors, task data and rewards in a single kernel
+        (
+            self._position_error,
+            self.position_dist,
+            self.heading_dist,
+            self.position_reward,
+            self.heading_reward,
+        ) = se3_pose_error(
+            current_state["position"],
+            current_state["orientation"],
+            self._target_positions,
+            self._target_headings,
+            self._task_data,
+            self._position_reward_mode,
+            self._heading_reward_mode,
+            self._reward_parameters.position_scale,
+            self._reward_parameters.heading_scale,
         )
         return self.update_observation_tensor(current_state)
 
@@ -89,15 +105,7 @@ class GoToPoseTask(GoToPoseTask2D, Core):
         """
         Computes the reward for the current state of the robot."""
 
-        # position error
-        self.position_dist = torch.sqrt(torch.square(self._position_error).sum(-1))
-        trace = (
-            self._heading_error[:, 0, 0]
-            + self._heading_error[:, 1, 1]
-            + self._heading_error[:, 2, 2]
-        )
-        self.heading_dist = torch.arccos((trace - 1) / 2)
-
+        # The distances and rewards are computed by get_state_observations
         # Checks if the goal is reached
         position_goal_is_reached = (
             self.position_dist < self._task_parameters.position_tolerance
@@ -108,14 +116,6 @@ class GoToPoseTask(GoToPoseTask2D, Core):
         goal_is_reached = position_goal_is_reached * heading_goal_is_reached
         self._goal_reached *= goal_is_reached  # if not set the value to 0
         self._goal_reached += goal_is_reached  # if it is add 1
-
-        # rewards
-        (
-            self.position_reward,
-            self.heading_reward,
-        ) = self._reward_parameters.compute_reward(
-            current_state, actions, self.position_dist, self.heading_dist
-        )
         return self.position_reward + self.heading_reward
 
     def get_goals(
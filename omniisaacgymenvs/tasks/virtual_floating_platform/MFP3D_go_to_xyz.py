@@ -19,6 +19,7 @@ from omniisaacgymenvs.tasks.virtual_floating_platform.MFP3D_task_parameters impo
     GoToXYZParameters,
 )
 from omniisaacgymenvs.utils.pin3D import VisualPin3D
+from omniisaacgymenvs.utils.adaptive_curriculum import AdaptiveCurriculum
 
 from omniisaacgymenvs.tasks.virtual_floating_platform.MFP2D_go_to_xy import (
     GoToXYTask as GoToXYTask2D,
@@ -57,6 +58,37 @@ class GoToXYZTask(GoToXYTask2D, Core):
         )
         self._task_label = self._task_label * 0
 
+        # Adaptive curriculum over the spawn distance and disturbance scale, the
+        # orientation is sampled uniformly
+        if (
+            self._task_parameters.spawn_curriculum
+            and self._task_parameters.spawn_curriculum_mode.lower() == "adaptive"
+        ):
+            ranges = [
+                (
+                    self._task_parameters.min_spawn_dist,
+                    self._task_parameters.max_spawn_dist,
+                )
+            ]
+            num_bins = [self._task_parameters.adaptive_curriculum_distance_bins]
+            if self._task_parameters.adaptive_curriculum_disturbance_bins > 0:
+                ranges.append((0.0, 1.0))
+                num_bins.append(
+                    self._task_parameters.adaptive_curriculum_disturbance_bins
+                )
+                self.disturbance_scale = torch.ones(
+                    (self._num_envs), device=self._device, dtype=torch.float32
+                )
+            self._curriculum = AdaptiveCurriculum(
+                num_envs,
+                ranges,
+                num_bins,
+                metric=self._task_parameters.adaptive_curriculum_metric,
+                uniform_ratio=self._task_parameters.adaptive_curriculum_uniform_ratio,
+                ema=self._task_parameters.adaptive_curriculum_ema,
+                device=self._device,
+            )
+
     def update_observation_tensor(self, current_state: dict) -> torch.Tensor:
         return Core.update_observation_tensor(self, current_state)
 
@@ -101,7 +133,10 @@ class GoToXYZTask(GoToXYTask2D, Core):
         # Resets the counter of steps for which the goal was reached
         self._goal_reached[env_ids] = 0
         # Run curriculum if selected
-        if self._task_parameters.spawn_curriculum:
+        if self._curriculum is not None:
+            rmax = self._task_parameters.max_spawn_dist
+            rmin = self._task_parameters.min_spawn_dist
+        elif self._task_parameters.spawn_curriculum:
             if step < self._task_parameters.spawn_curriculum_warmup:
                 rmax = self._task_parameters.spawn_curriculum_max_dist
                 rmin = self._task_parameters.spawn_curriculum_min_dist
@@ -134,7 +169,13 @@ class GoToXYZTask(GoToXYTask2D, Core):
             rmin = self._task_parameters.min_spawn_dist
 
         # Randomizes the starting position of the platform
-        r = torch.rand((num_resets,), device=self._device) * (rmax - rmin) + rmin
+        if self._curriculum is not None:
+            spawn = self._curriculum.sample(env_ids)
+            r = spawn[:, 0]
+            if self.disturbance_scale is not None:
+                self.disturbance_scale[env_ids] = spawn[:, -1]
+        else:
+            r = torch.rand((num_resets,), device=self._device) * (rmax - rmin) + rmin
         theta = torch.rand((num_resets,), device=self._device) * 2 * math.pi
         phi = torch.rand((num_resets,), device=self._device) * math.pi
         initial_position[env_ids, 0] += (r) * torch.cos(theta) + self._target_positions[
@@ -0,0 +1,159 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from typing import Dict, List, Tuple
+import torch
+import math
+
+
+class AdaptiveCurriculum:
+    """
+    Samples the parameters of the resets (e.g. the spawn distance and heading) from
+    a grid of bins, in proportion to how useful each bin currently is for training.
+    The success rate of every bin is tracked on the device with two exponential moving
+    averages, a fast and a slow one. The bins are weighted either by their difficulty
+    (1 - success rate), or by their learning progress (|fast - slow|), and mixed with
+    a uniform distribution such that no bin is ever abandoned. Inside a bin, the
+    parameters are sampled uniformly."""
+
+    def __init__(
+        self,
+        num_envs: int,
+        ranges: List[Tuple[float, float]],
+        num_bins: List[int],
+        metric: str = "difficulty",
+        uniform_ratio: float = 0.2,
+        ema: float = 0.05,
+        device: str = "cuda:0",
+    ) -> None:
+        """
+        Args:
+            num_envs (int): The number of environments.
+            ranges (List[Tuple[float, float]]): The min and max of each parameter.
+            num_bins (List[int]): The number of bins of each parameter.
+            metric (str, optional): Either "difficulty" or "learning_progress". Defaults to "difficulty".
+            uniform_ratio (float, optional): The share of the resets sampled uniformly. Defaults to 0.2.
+            ema (float, optional): The rate of the fast moving average, the slow one is 5 times slower. Defaults to 0.05.
+            device (str, optional): The device on which the statistics are stored. Defaults to "cuda:0".
+        """
+
+        assert len(ranges) == len(num_bins), "One number of bins per range is required."
+        assert metric in [
+            "difficulty",
+            "learning_progress",
+        ], "The metric must be difficulty or learning_progress."
+        assert 0 <= uniform_ratio <= 1, "The uniform ratio must be in [0, 1]."
+
+        self._device = device
+        self._metric = metric
+        self._uniform_ratio = uniform_ratio
+        self._fast_rate = ema
+        self._slow_rate = ema / 5
+        self._num_bins = num_bins
+        self._total_bins = 1
+        for n in num_bins:
+            self._total_bins *= n
+        self._low = torch.tensor([r[0] for r in ranges], device=device)
+        self._width = torch.tensor(
+            [(r[1] - r[0]) / n for r, n in zip(ranges, num_bins)], device=device
+        )
+        # Strides to go from a flat bin index to the index of the bin of each parameter
+        strides = [1] * len(num_bins)
+        for i in range(len(num_bins) - 2, -1, -1):
+            strides[i] = strides[i + 1] * num_bins[i + 1]
+        self._strides = torch.tensor(strides, device=device)
+        self._bins_per_dim = torch.tensor(num_bins, device=device)
+
+        self.fast_success = torch.zeros(self._total_bins, device=device)
+        self.slow_success = torch.zeros(self._total_bins, device=device)
+        self.attempts = torch.zeros(self._total_bins, device=device)
+        self.env_bins = torch.full((num_envs,), -1, device=device, dtype=torch.long)
+
+    def get_probabilities(self) -> torch.Tensor:
+        """
+        Returns:
+            torch.Tensor: The probability of sampling each bin."""
+
+        if self._metric == "difficulty":
+            weights = 1.0 - self.fast_success
+        else:
+            weights = torch.abs(self.fast_success - self.slow_success)
+        weights = weights / weights.sum().clamp(min=1e-6)
+        # Falls back to uniform while no bin has a weight
+        weights = torch.where(
+            weights.sum() > 0, weights, torch.full_like(weights, 1 / self._total_bins)
+        )
+        return (1 - self._uniform_ratio) * weights + self._uniform_ratio / self._total_bins
+
+    def sample(self, env_ids: torch.Tensor) -> torch.Tensor:
+        """
+        Samples the parameters of the environments being reset, and remembers their bins.
+
+        Args:
+            env_ids (torch.Tensor): The ids of the environments being reset.
+
+        Returns:
+            torch.Tensor: The (num_resets, num_parameters) sampled parameters."""
+
+        num_resets = len(env_ids)
+        bins = torch.multinomial(self.get_probabilities(), num_resets, replacement=True)
+        self.env_bins[env_ids] = bins
+        idx = (bins.unsqueeze(-1) // self._strides) % self._bins_per_dim
+        offset = torch.rand((num_resets, len(self._num_bins)), device=self._device)
+        return self._low + (idx + offset) * self._width
+
+    def update(self, env_ids: torch.Tensor, success: torch.Tensor) -> None:
+        """
+        Updates the success rates with the outcome of the episodes ending in the given
+        environments. Environments whose parameters were not sampled by the curriculum
+        (e.g. on the first reset) are ignored.
+
+        Args:
+            env_ids (torch.Tensor): The ids of the environments being reset.
+            success (torch.Tensor): Whether each of these episodes was successful."""
+
+        bins = self.env_bins[env_ids]
+        valid = (bins >= 0).float()
+        bins = bins.clamp(min=0)
+        counts = torch.zeros_like(self.attempts).index_add_(0, bins, valid)
+        successes = torch.zeros_like(self.attempts).index_add_(
+            0, bins, success.float() * valid
+        )
+        visited = counts > 0
+        rate = successes / counts.clamp(min=1)
+        self.fast_success = torch.where(
+            visited,
+            self.fast_success + self._fast_rate * (rate - self.fast_success),
+            self.fast_success,
+        )
+        self.slow_success = torch.where(
+            visited,
+            self.slow_success + self._slow_rate * (rate - self.slow_success),
+            self.slow_success,
+        )
+        self.attempts += counts
+        self.env_bins[env_ids] = -1
+
+    def get_stats(self) -> Dict[str, torch.Tensor]:
+        """
+        Returns:
+            Dict[str, torch.Tensor]: The success rate averaged over the visited bins, the
+            normalized entropy of the sampling distribution, and the share of bins visited.
+        """
+
+        visited = (self.attempts > 0).float()
+        p = self.get_probabilities()
+        return {
+            "curriculum/success_rate": (self.fast_success * visited).sum()
+            / visited.sum().clamp(min=1),
+            "curriculum/entropy": -(p * torch.log(p)).sum()
+            / math.log(max(self._total_bins, 2)),
+            "curriculum/coverage": visited.mean(),
+        }
@@ -28,7 +28,9 @@
 
 
 from omniisaacgymenvs.utils.config_utils.default_scene_params import *
+from contextlib import contextmanager
 import copy
+import time
 import omni.usd
 import numpy as np
 import torch
@@ -43,6 +45,11 @@ class SimConfig():
         self._cfg = config.get("task", dict())
         self._parse_config()
 
+        # resolved actor configs, and attribute writes deferred to a single change block
+        self._actor_params = {}
+        self._pending_writes = None
+        self.settings_duration = 0.0
+
         if self._config["test"] == True:
             self._sim_params["enable_scene_query_support"] = True
 
@@ -106,6 +113,12 @@ class SimConfig():
         print("Sim Device: ", "GPU" if self._physx_params["use_gpu"] else "CPU")
 
     def parse_actor_config(self, actor_name):
+        return copy.copy(self._resolve_actor_config(actor_name))
+
+    def _resolve_actor_config(self, actor_name):
+        # the actor configs are resolved once, and shared by all the prims of the actor
+        if actor_name in self._actor_params:
+            return self._actor_params[actor_name]
         actor_params = copy.deepcopy(default_actor_options)
         if "sim" in self._cfg and actor_name in self._cfg["sim"]:
             actor_cfg = self._cfg["sim"][actor_name]
@@ -115,10 +128,11 @@ class SimConfig():
                 elif opt not in actor_params:
                     print("Actor params does not have attribute: ", opt)
 
+        self._actor_params[actor_name] = actor_params
         return actor_params
 
     def _get_actor_config_value(self, actor_name, attribute_name, attribute=None):
-        actor_params = self.parse_actor_config(actor_name)
+        actor_params = self._resolve_actor_config(actor_name)
 
         if attribute is not None:
             if attribute_name not in actor_params:
@@ -151,6 +165,44 @@ class SimConfig():
     def get_physics_params(self):
         return {**self.sim_params, **self.physx_params}
 
+    @contextmanager
+    def batched_writes(self):
+        """ Defers the attribute writes of the settings to a single Sdf change block.
+            The APIs are applied and the current values are read immediately, only the writes are deferred.
+        """
+        if self._pending_writes is not None:
+            # nested call, the outermost one writes
+            yield
+            return
+        start = time.perf_counter()
+        self._pending_writes = []
+        try:
+            yield
+            self._flush_writes(self._pending_writes)
+        finally:
+            self._pending_writes = None
+            self.settings_duration += time.perf_counter() - start
+
+    def _set(self, attribute, value):
+        if self._pending_writes is None:
+            attribute.Set(value)
+        else:
+            self._pending_writes.append((attribute, value))
+
+    def _flush_writes(self, writes):
+        from pxr import Sdf
+
+        stage = omni.usd.get_context().get_stage()
+        layer = stage.GetEditTarget().GetLayer()
+        with Sdf.ChangeBlock():
+            for attribute, value in writes:
+                path = attribute.GetPath()
+                spec = layer.GetAttributeAtPath(path)
+                if not spec:
+                    prim_spec = Sdf.CreatePrimInLayer(layer, path.GetPrimPath())
+                    spec = Sdf.AttributeSpec(prim_spec, path.name, attribute.GetTypeName())
+                spec.default = value
+
     def _get_physx_collision_api(self, prim):
         from pxr import UsdPhysics, PhysxSchema
         physx_collision_api = PhysxSchema.PhysxCollisionAPI(prim)
@@ -180,7 +232,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "contact_offset", contact_offset)
         if value != -1:
-            contact_offset.Set(value)
+            self._set(contact_offset, value)
 
     def set_rest_offset(self, name, prim, value=None):
         physx_collision_api = self._get_physx_collision_api(prim)
@@ -190,7 +242,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "rest_offset", rest_offset)
         if value != -1:
-            rest_offset.Set(value)
+            self._set(rest_offset, value)
 
     def set_position_iteration(self, name, prim, value=None):
         physx_rb_api = self._get_physx_rigid_body_api(prim)
@@ -198,15 +250,15 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "solver_position_iteration_count", solver_position_iteration_count)
         if value != -1:
-            solver_position_iteration_count.Set(value)
+            self._set(solver_position_iteration_count, value)
 
     def set_velocity_iteration(self, name, prim, value=None):
         physx_rb_api = self._get_physx_rigid_body_api(prim)
         solver_velocity_iteration_count = physx_rb_api.GetSolverVelocityIterationCountAttr()
         if value is None:
-            value = self._get_actor_config_value(name, "solver_velocity_iteration_count", solver_position_iteration_count)
+            value = self._get_actor_config_value(name, "solver_velocity_iteration_count", solver_velocity_iteration_count)
         if value != -1:
-            solver_velocity_iteration_count.Set(value)
+            self._set(solver_velocity_iteration_count, value)
 
     def set_max_depenetration_velocity(self, name, prim, value=None):
         physx_rb_api = self._get_physx_rigid_body_api(prim)
@@ -214,7 +266,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "max_depenetration_velocity", max_depenetration_velocity)
         if value != -1:
-            max_depenetration_velocity.Set(value)
+            self._set(max_depenetration_velocity, value)
 
     def set_sleep_threshold(self, name, prim, value=None):
         physx_rb_api = self._get_physx_rigid_body_api(prim)
@@ -222,7 +274,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "sleep_threshold", sleep_threshold)
         if value != -1:
-            sleep_threshold.Set(value)
+            self._set(sleep_threshold, value)
 
     def set_stabilization_threshold(self, name, prim, value=None):
         physx_rb_api = self._get_physx_rigid_body_api(prim)
@@ -230,7 +282,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "stabilization_threshold", stabilization_threshold)
         if value != -1:
-            stabilization_threshold.Set(value)
+            self._set(stabilization_threshold, value)
 
     def set_gyroscopic_forces(self, name, prim, value=None):
         physx_rb_api = self._get_physx_rigid_body_api(prim)
@@ -238,7 +290,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "enable_gyroscopic_forces", enable_gyroscopic_forces)
         if value != -1:
-            enable_gyroscopic_forces.Set(value)
+            self._set(enable_gyroscopic_forces, value)
 
     def set_density(self, name, prim, value=None):
         physx_rb_api = self._get_physx_rigid_body_api(prim)
@@ -246,7 +298,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "density", density)
         if value != -1:
-            density.Set(value)
+            self._set(density, value)
             # auto-compute mass
             self.set_mass(prim, 0.0)
 
@@ -256,13 +308,13 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "mass", mass)
         if value != -1:
-            mass.Set(value)
+            self._set(mass, value)
 
     def retain_acceleration(self, prim):
         # retain accelerations if running with more than one substep
         physx_rb_api = self._get_physx_rigid_body_api(prim)
         if self._sim_params["substeps"] > 1:
-            physx_rb_api.GetRetainAccelerationsAttr().Set(True)
+            self._set(physx_rb_api.GetRetainAccelerationsAttr(), True)
 
     def make_kinematic(self, name, prim, cfg, value=None):
         # make rigid body kinematic (fixed base and no collision)
@@ -278,7 +330,7 @@ class SimConfig():
                 rb = UsdPhysics.RigidBodyAPI.Get(stage, cur_prim.GetPath())
 
                 if rb:
-                    rb.CreateKinematicEnabledAttr().Set(True)
+                    self._set(rb.CreateKinematicEnabledAttr(), True)
 
                 children_prims = cur_prim.GetPrim().GetChildren()
                 prims = prims + children_prims
@@ -289,15 +341,15 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "solver_position_iteration_count", solver_position_iteration_count)
         if value != -1:
-            solver_position_iteration_count.Set(value)
+            self._set(solver_position_iteration_count, value)
 
     def set_articulation_velocity_iteration(self, name, prim, value=None):
         arti_api = self._get_physx_articulation_api(prim)
         solver_velocity_iteration_count = arti_api.GetSolverVelocityIterationCountAttr()
         if value is None:
-            value = self._get_actor_config_value(name, "solver_velocity_iteration_count", solver_position_iteration_count)
+            value = self._get_actor_config_value(name, "solver_velocity_iteration_count", solver_velocity_iteration_count)
         if value != -1:
-            solver_velocity_iteration_count.Set(value)
+            self._set(solver_velocity_iteration_count, value)
 
     def set_articulation_sleep_threshold(self, name, prim, value=None):
         arti_api = self._get_physx_articulation_api(prim)
@@ -305,7 +357,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "sleep_threshold", sleep_threshold)
         if value != -1:
-            sleep_threshold.Set(value)
+            self._set(sleep_threshold, value)
 
     def set_articulation_stabilization_threshold(self, name, prim, value=None):
         arti_api = self._get_physx_articulation_api(prim)
@@ -313,7 +365,7 @@ class SimConfig():
         if value is None:
             value = self._get_actor_config_value(name, "stabilization_threshold", stabilization_threshold)
         if value != -1:
-            stabilization_threshold.Set(value)
+            self._set(stabilization_threshold, value)
 
     def apply_rigid_body_settings(self, name, prim, cfg, is_articulation):
         from pxr import UsdPhysics, PhysxSchema
@@ -324,34 +376,35 @@ class SimConfig():
         if not physx_rb_api:
             physx_rb_api = PhysxSchema.PhysxRigidBodyAPI.Apply(prim)
 
-        # if it's a body in an articulation, it's handled at articulation root
-        if not is_articulation:
-            self.make_kinematic(name, prim, cfg, cfg["make_kinematic"])
-        self.set_position_iteration(name, prim, cfg["solver_position_iteration_count"])
-        self.set_velocity_iteration(name, prim, cfg["solver_velocity_iteration_count"])
-        self.set_max_depenetration_velocity(name, prim, cfg["max_depenetration_velocity"])
-        self.set_sleep_threshold(name, prim, cfg["sleep_threshold"])
-        self.set_stabilization_threshold(name, prim, cfg["stabilization_threshold"])
-        self.set_gyroscopic_forces(name, prim, cfg["enable_gyroscopic_forces"])
-        
-        # density and mass
-        mass_api = UsdPhysics.MassAPI.Get(stage, prim.GetPath())
-        if mass_api is None:
-            mass_api = UsdPhysics.MassAPI.Apply(prim)
-        mass_attr = mass_api.GetMassAttr()
-        density_attr = mass_api.GetDensityAttr()
-        if not mass_attr:
-            mass_attr = mass_api.CreateMassAttr()
-        if not density_attr:
-            density_attr = mass_api.CreateDensityAttr()
-
-        if cfg["density"] != -1:
-            density_attr.Set(cfg["density"])
-            mass_attr.Set(0.0) # mass is to be computed
-        elif cfg["override_usd_defaults"] and not density_attr.IsAuthored() and not mass_attr.IsAuthored():
-            density_attr.Set(self._physx_params["density"])
-
-        self.retain_acceleration(prim)
+        with self.batched_writes():
+            # if it's a body in an articulation, it's handled at articulation root
+            if not is_articulation:
+                self.make_kinematic(name, prim, cfg, cfg["make_kinematic"])
+            self.set_position_iteration(name, prim, cfg["solver_position_iteration_count"])
+            self.set_velocity_iteration(name, prim, cfg["solver_velocity_iteration_count"])
+            self.set_max_depenetration_velocity(name, prim, cfg["max_depenetration_velocity"])
+            self.set_sleep_threshold(name, prim, cfg["sleep_threshold"])
+            self.set_stabilization_threshold(name, prim, cfg["stabilization_threshold"])
+            self.set_gyroscopic_forces(name, prim, cfg["enable_gyroscopic_forces"])
+            
+            # density and mass
+            mass_api = UsdPhysics.MassAPI.Get(stage, prim.GetPath())
+            if mass_api is None:
+                mass_api = UsdPhysics.MassAPI.Apply(prim)
+            mass_attr = mass_api.GetMassAttr()
+            density_attr = mass_api.GetDensityAttr()
+            if not mass_attr:
+                mass_attr = mass_api.CreateMassAttr()
+            if not density_attr:
+                density_attr = mass_api.CreateDensityAttr()
+
+            if cfg["density"] != -1:
+                self._set(density_attr, cfg["density"])
+                self._set(mass_attr, 0.0) # mass is to be computed
+            elif cfg["override_usd_defaults"] and not density_attr.IsAuthored() and not mass_attr.IsAuthored():
+                self._set(density_attr, self._physx_params["density"])
+
+            self.retain_acceleration(prim)
 
     def apply_rigid_shape_settings(self, name, prim, cfg):
         from pxr import UsdPhysics, PhysxSchema
@@ -365,53 +418,49 @@ class SimConfig():
         if not physx_collision_api:
             physx_collision_api = PhysxSchema.PhysxCollisionAPI.Apply(prim)
 
-        self.set_contact_offset(name, prim, cfg["contact_offset"])
-        self.set_rest_offset(name, prim, cfg["rest_offset"])
+        with self.batched_writes():
+            self.set_contact_offset(name, prim, cfg["contact_offset"])
+            self.set_rest_offset(name, prim, cfg["rest_offset"])
 
     def apply_articulation_settings(self, name, prim, cfg):
-        from pxr import UsdPhysics, PhysxSchema
+        from pxr import Usd, UsdPhysics, PhysxSchema
 
         stage = omni.usd.get_context().get_stage()
 
+        # collects all the children prims in a single traversal
+        prims = list(Usd.PrimRange(prim))
+
         is_articulation = False
         # check if is articulation
-        prims = [prim]
-        while len(prims) > 0:
-            prim_tmp = prims.pop(0)
+        for prim_tmp in prims:
             articulation_api = UsdPhysics.ArticulationRootAPI.Get(stage, prim_tmp.GetPath())
             physx_articulation_api = PhysxSchema.PhysxArticulationAPI.Get(stage, prim_tmp.GetPath())
 
             if articulation_api or physx_articulation_api:
                 is_articulation = True
+                break
 
-            children_prims = prim_tmp.GetPrim().GetChildren()
-            prims = prims + children_prims
-
-        # parse through all children prims
-        prims = [prim]
-        while len(prims) > 0:
-            cur_prim = prims.pop(0)
-            rb = UsdPhysics.RigidBodyAPI.Get(stage, cur_prim.GetPath())
-            collision_body = UsdPhysics.CollisionAPI.Get(stage, cur_prim.GetPath())
-            articulation = UsdPhysics.ArticulationRootAPI.Get(stage, cur_prim.GetPath())
-            if rb:
-                self.apply_rigid_body_settings(name, cur_prim, cfg, is_articulation)
-            if collision_body:
-                self.apply_rigid_shape_settings(name, cur_prim, cfg)
-
-            if articulation:
-                articulation_api = UsdPhysics.ArticulationRootAPI.Get(stage, cur_prim.GetPath())
-                physx_articulation_api = PhysxSchema.PhysxArticulationAPI.Get(stage, cur_prim.GetPath())
-
-                # enable self collisions
-                enable_self_collisions = physx_articulation_api.GetEnabledSelfCollisionsAttr()
-                if cfg["enable_self_collisions"] != -1:
-                    enable_self_collisions.Set(cfg["enable_self_collisions"])
-
-                self.set_articulation_position_iteration(name, cur_prim, cfg["solver_position_iteration_count"])
-                self.set_articulation_velocity_iteration(name, cur_prim, cfg["solver_velocity_iteration_count"])
-                self.set_articulation_sleep_threshold(name, cur_prim, cfg["sleep_threshold"])
-                self.set_articulation_stabilization_threshold(name, cur_prim, cfg["stabilization_threshold"])
-
-            children_prims = cur_prim.GetPrim().GetChildren()
-            prims = prims + children_prims
+        # parse through all children prims, the writes of the whole actor are applied at once
+        with self.batched_writes():
+            for cur_prim in prims:
+                rb = UsdPhysics.RigidBodyAPI.Get(stage, cur_prim.GetPath())
+                collision_body = UsdPhysics.CollisionAPI.Get(stage, cur_prim.GetPath())
+                articulation = UsdPhysics.ArticulationRootAPI.Get(stage, cur_prim.GetPath())
+                if rb:
+                    self.apply_rigid_body_settings(name, cur_prim, cfg, is_articulation)
+                if collision_body:
+                    self.apply_rigid_shape_settings(name, cur_prim, cfg)
+
+                if articulation:
+                    articulation_api = UsdPhysics.ArticulationRootAPI.Get(stage, cur_prim.GetPath())
+                    physx_articulation_api = PhysxSchema.PhysxArticulationAPI.Get(stage, cur_prim.GetPath())
+
+                    # enable self collisions
+                    enable_self_collisions = physx_articulation_api.GetEnabledSelfCollisionsAttr()
+                    if cfg["enable_self_collisions"] != -1:
+                        self._set(enable_self_collisions, cfg["enable_self_collisions"])
+
+                    self.set_articulation_position_iteration(name, cur_prim, cfg["solver_position_iteration_count"])
+                    self.set_articulation_velocity_iteration(name, cur_prim, cfg["solver_velocity_iteration_count"])
+                    self.set_articulation_sleep_threshold(name, cur_prim, cfg["sleep_threshold"])
+                    self.set_articulation_stabilization_threshold(name, cur_prim, cfg["stabilization_threshold"])
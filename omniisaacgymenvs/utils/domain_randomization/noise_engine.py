@@ -0,0 +1,156 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import math
+import torch
+
+
+DISTRIBUTIONS = {"gaussian": 0, "normal": 0, "uniform": 1, "loguniform": 2, "log_uniform": 2}
+OPERATIONS = {"additive": 0, "scaling": 1}
+
+
+class NoiseEngine():
+    """Applies the on_reset (correlated) and on_interval (uncorrelated) noise of an observation or action buffer.
+    Standard normal and uniform samples are pre-drawn in blocks of block_size steps with a seeded device generator
+    (Philox on CUDA), and consumed one step at a time. Every env draws at every step and the noise is masked instead
+    of indexed, so the noise of an env only depends on the seed, the step and the env index, and no host synchronization
+    is needed. The distribution parameters are applied when the noise is consumed, so they can be changed at runtime."""
+
+    def __init__(self, num_envs, dim, device, seed=0, block_size=32):
+        self.num_envs = num_envs
+        self.dim = dim
+        self.device = device
+        self.block_size = block_size
+
+        self.generator = torch.Generator(device=device)
+        self.generator.manual_seed(seed)
+        self.counter = torch.zeros((num_envs), dtype=torch.int, device=device)
+        self.correlated_noise = torch.zeros((num_envs, dim), device=device)
+        self._blocks = {}
+        self._offset = block_size
+
+    def _draw(self, stream, distribution):
+        """Get the standard samples of a stream for the current step."""
+
+        if self._offset >= self.block_size:
+            self._blocks = {}
+            self._offset = 0
+        key = (stream, distribution == DISTRIBUTIONS["gaussian"])
+        if key not in self._blocks:
+            size = (self.block_size, self.num_envs, self.dim)
+            if key[1]:
+                self._blocks[key] = torch.randn(size, generator=self.generator, device=self.device)
+            else:
+                self._blocks[key] = torch.rand(size, generator=self.generator, device=self.device)
+        return self._blocks[key][self._offset]
+
+    @staticmethod
+    def _get_codes(params):
+        distribution = DISTRIBUTIONS.get(params["distribution"], -1)
+        operation = OPERATIONS.get(params["operation"], -1)
+        if distribution == -1:
+            print(f"The specified {params['distribution']} distribution is not supported.")
+        if operation == -1:
+            print(f"The specified {params['operation']} operation type is not supported.")
+        return distribution, operation
+
+    def apply(self, buffer, reset_buf, dr_params):
+        """Apply the noise described by the on_reset and on_interval entries of dr_params to buffer, in place."""
+
+        reset_mask = (reset_buf != 0).to(self.device)
+        self.counter.masked_fill_(reset_mask, 0)
+        self.counter += 1
+
+        correlated_op = -1
+        if "on_reset" in dr_params.keys():
+            params = dr_params["on_reset"]
+            distribution, correlated_op = self._get_codes(params)
+            if distribution != -1:
+                samples = self._draw("on_reset", distribution)
+                _resample_correlated_noise(self.correlated_noise, samples, reset_mask, distribution,
+                                           float(params["distribution_parameters"][0]),
+                                           float(params["distribution_parameters"][1]))
+            else:
+                correlated_op = -1
+
+        uncorrelated_op = -1
+        samples = self.correlated_noise
+        interval_mask = torch.zeros_like(self.counter, dtype=torch.bool)
+        distribution = 0
+        p0 = 0.0
+        p1 = 0.0
+        if "on_interval" in dr_params.keys():
+            params = dr_params["on_interval"]
+            interval_mask = self.counter >= params["frequency_interval"]
+            self.counter.masked_fill_(interval_mask, 0)
+            distribution, uncorrelated_op = self._get_codes(params)
+            if distribution != -1:
+                samples = self._draw("on_interval", distribution)
+                p0 = float(params["distribution_parameters"][0])
+                p1 = float(params["distribution_parameters"][1])
+            else:
+                uncorrelated_op = -1
+
+        self._offset += 1
+        buffer[:] = _apply_noise(buffer, self.correlated_noise, samples, interval_mask, correlated_op, uncorrelated_op,
+                                 distribution, p0, p1)
+        return buffer
+
+
+@torch.jit.script
+def _sample(samples, distribution: int, p0: float, p1: float):
+    if distribution == 0:
+        return p0 + p1 * samples
+    elif distribution == 1:
+        return p0 + (p1 - p0) * samples
+    log_p0 = math.log(p0)
+    log_p1 = math.log(p1)
+    return torch.exp(log_p0 + (log_p1 - log_p0) * samples)
+
+
+@torch.jit.script
+def _resample_correlated_noise(correlated_noise, samples, reset_mask, distribution: int, p0: float, p1: float):
+    correlated_noise[:] = torch.where(reset_mask.unsqueeze(-1), _sample(samples, distribution, p0, p1), correlated_noise)
+
+
+@torch.jit.script
+def _apply_noise(buffer, correlated_noise, samples, interval_mask, correlated_op: int, uncorrelated_op: int,
+                 distribution: int, p0: float, p1: float):
+    if correlated_op == 0:
+        buffer = buffer + correlated_noise
+    elif correlated_op == 1:
+        buffer = buffer * correlated_noise
+    if uncorrelated_op >= 0:
+        mask = interval_mask.unsqueeze(-1).to(buffer.dtype)
+        noise = _sample(samples, distribution, p0, p1)
+        if uncorrelated_op == 0:
+            buffer = buffer + noise * mask
+        else:
+            buffer = buffer * (1.0 + (noise - 1.0) * mask)
+    return buffer
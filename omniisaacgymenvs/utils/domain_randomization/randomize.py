@@ -35,6 +35,7 @@ import numpy as np
 import torch
 
 from omni.isaac.core.prims import RigidPrimView
+from omniisaacgymenvs.utils.domain_randomization.noise_engine import NoiseEngine
 
 class Randomizer():
     def __init__(self, sim_config):
@@ -54,6 +55,7 @@ class Randomizer():
             if randomize and randomization_params is not None:
                 self.randomize = True
                 self.min_frequency = dr_config.get("min_frequency", 1)
+                self.noise_block_size = dr_config.get("noise_block_size", 32)
 
     def apply_on_startup_domain_randomization(self, task):
         if self.randomize:
@@ -188,8 +190,8 @@ class Randomizer():
                 raise ValueError(f"Please ensure the following observations on_interval randomization parameters are provided: " + \
                     "frequency_interval, operation, distribution, distribution_parameters.")
             self.active_domain_randomizations[("observations", "on_interval")] = np.array(self._observations_dr_params["on_interval"]["distribution_parameters"])
-        self._observations_counter_buffer = torch.zeros((self._cfg["env"]["numEnvs"]), dtype=torch.int, device=self._config["rl_device"])
-        self._observations_correlated_noise = torch.zeros((self._cfg["env"]["numEnvs"], task.num_observations), device=self._config["rl_device"])
+        self._observations_noise = NoiseEngine(num_envs=self._cfg["env"]["numEnvs"], dim=task.num_observations, device=self._config["rl_device"],
+                                               seed=self._config["seed"], block_size=self.noise_block_size)
         
     def _set_up_actions_randomization(self, task):
         task.randomize_actions = True
@@ -206,104 +208,14 @@ class Randomizer():
                 raise ValueError(f"Please ensure the following actions on_interval randomization parameters are provided: " + \
                     "frequency_interval, operation, distribution, distribution_parameters.")
             self.active_domain_randomizations[("actions", "on_interval")] = np.array(self._actions_dr_params["on_interval"]["distribution_parameters"])
-        self._actions_counter_buffer = torch.zeros((self._cfg["env"]["numEnvs"]), dtype=torch.int, device=self._config["rl_device"])
-        self._actions_correlated_noise = torch.zeros((self._cfg["env"]["numEnvs"], task.num_actions), device=self._config["rl_device"])
+        self._actions_noise = NoiseEngine(num_envs=self._cfg["env"]["numEnvs"], dim=task.num_actions, device=self._config["rl_device"],
+                                          seed=self._config["seed"] + 1, block_size=self.noise_block_size)
 
     def apply_observations_randomization(self, observations, reset_buf):
-        env_ids = reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        self._observations_counter_buffer[env_ids] = 0
-        self._observations_counter_buffer += 1
-
-        if "on_reset" in self._observations_dr_params.keys():
-            observations[:] = self._apply_correlated_noise(
-                buffer_type="observations",
-                buffer=observations,
-                reset_ids=env_ids,
-                operation=self._observations_dr_params["on_reset"]["operation"], 
-                distribution=self._observations_dr_params["on_reset"]["distribution"], 
-                distribution_parameters=self._observations_dr_params["on_reset"]["distribution_parameters"],
-            )
-        
-        if "on_interval" in self._observations_dr_params.keys():
-            randomize_ids = (self._observations_counter_buffer >= self._observations_dr_params["on_interval"]["frequency_interval"]).nonzero(as_tuple=False).squeeze(-1)
-            self._observations_counter_buffer[randomize_ids] = 0
-            observations[:] = self._apply_uncorrelated_noise(
-                buffer=observations,
-                randomize_ids=randomize_ids,
-                operation=self._observations_dr_params["on_interval"]["operation"], 
-                distribution=self._observations_dr_params["on_interval"]["distribution"], 
-                distribution_parameters=self._observations_dr_params["on_interval"]["distribution_parameters"],
-            )
-        return observations
+        return self._observations_noise.apply(observations, reset_buf, self._observations_dr_params)
     
     def apply_actions_randomization(self, actions, reset_buf):
-        env_ids = reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        self._actions_counter_buffer[env_ids] = 0
-        self._actions_counter_buffer += 1
-
-        if "on_reset" in self._actions_dr_params.keys():
-            actions[:] = self._apply_correlated_noise(
-                buffer_type="actions",
-                buffer=actions,
-                reset_ids=env_ids,
-                operation=self._actions_dr_params["on_reset"]["operation"], 
-                distribution=self._actions_dr_params["on_reset"]["distribution"], 
-                distribution_parameters=self._actions_dr_params["on_reset"]["distribution_parameters"],
-            )
-        if "on_interval" in self._actions_dr_params.keys():
-            randomize_ids = (self._actions_counter_buffer >= self._actions_dr_params["on_interval"]["frequency_interval"]).nonzero(as_tuple=False).squeeze(-1)
-            self._actions_counter_buffer[randomize_ids] = 0
-            actions[:] = self._apply_uncorrelated_noise(
-                buffer=actions,
-                randomize_ids=randomize_ids,
-                operation=self._actions_dr_params["on_interval"]["operation"], 
-                distribution=self._actions_dr_params["on_interval"]["distribution"], 
-                distribution_parameters=self._actions_dr_params["on_interval"]["distribution_parameters"],
-            )
-        return actions
-    
-    def _apply_uncorrelated_noise(self, buffer, randomize_ids, operation, distribution, distribution_parameters):
-        if distribution == "gaussian" or distribution == "normal":
-            noise = torch.normal(mean=distribution_parameters[0], std=distribution_parameters[1], size=(len(randomize_ids), buffer.shape[1]), device=self._config["rl_device"])
-        elif distribution == "uniform":
-            noise = (distribution_parameters[1] - distribution_parameters[0]) * torch.rand((len(randomize_ids), buffer.shape[1]), device=self._config["rl_device"]) + distribution_parameters[0]
-        elif distribution == "loguniform" or distribution == "log_uniform":
-            noise = torch.exp((np.log(distribution_parameters[1]) - np.log(distribution_parameters[0])) * torch.rand((len(randomize_ids), buffer.shape[1]), device=self._config["rl_device"]) + np.log(distribution_parameters[0]))
-        else:
-            print(f"The specified {distribution} distribution is not supported.")
-
-        if operation == "additive":
-            buffer[randomize_ids] += noise
-        elif operation == "scaling":
-            buffer[randomize_ids] *= noise
-        else:
-            print(f"The specified {operation} operation type is not supported.")
-        return buffer
-    
-    def _apply_correlated_noise(self, buffer_type, buffer, reset_ids, operation, distribution, distribution_parameters):
-        if buffer_type == "observations":
-            correlated_noise_buffer = self._observations_correlated_noise
-        elif buffer_type == "actions":
-            correlated_noise_buffer = self._actions_correlated_noise
-
-        if len(reset_ids) > 0:
-            if distribution == "gaussian" or distribution == "normal":
-                correlated_noise_buffer[reset_ids] = torch.normal(mean=distribution_parameters[0], std=distribution_parameters[1], size=(len(reset_ids), buffer.shape[1]), device=self._config["rl_device"])
-            elif distribution == "uniform":
-                correlated_noise_buffer[reset_ids] = (distribution_parameters[1] - distribution_parameters[0]) * torch.rand((len(reset_ids), buffer.shape[1]), device=self._config["rl_device"]) + distribution_parameters[0]
-            elif distribution == "loguniform" or distribution == "log_uniform":
-                correlated_noise_buffer[reset_ids] = torch.exp((np.log(distribution_parameters[1]) - np.log(distribution_parameters[0])) * torch.rand((len(reset_ids), buffer.shape[1]), device=self._config["rl_device"]) + np.log(distribution_parameters[0]))
-            else:
-                print(f"The specified {distribution} distribution is not supported.")
-        
-        if operation == "additive":
-            buffer += correlated_noise_buffer
-        elif operation == "scaling":
-            buffer *= correlated_noise_buffer
-        else:
-            print(f"The specified {operation} operation type is not supported.")
-        return buffer        
-
+        return self._actions_noise.apply(actions, reset_buf, self._actions_dr_params)
 
     def _set_up_simulation_randomization(self, attribute, params):
         if params is None:
@@ -0,0 +1,119 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from typing import Dict
+import torch
+
+
+class MarkerUpdater:
+    """
+    Throttles the pose writes of the visual markers of a task (pins and arrows).
+    In "auto" mode the markers are disabled when nothing is rendered: the task does
+    not create their prims, and all the pose writes are dropped. When enabled, the
+    poses are staged on the device and sent to the stage in one batched write every
+    update_period steps, only for the environments whose marker moved since the last
+    write. The number of environment poses that were not written is counted."""
+
+    def __init__(
+        self,
+        cfg: Dict[str, object],
+        render: bool,
+        num_envs: int,
+        device: str = "cuda:0",
+    ) -> None:
+        """
+        Args:
+            cfg (Dict[str, object]): The markers config, with mode (auto, on or off, default auto)
+                and update_period (default 1).
+            render (bool): Whether the simulation is rendered.
+            num_envs (int): The number of environments.
+            device (str, optional): The device on which the poses are staged. Defaults to "cuda:0".
+        """
+
+        mode = cfg.get("mode", "auto")
+        assert mode in [
+            "auto",
+            "on",
+            "off",
+        ], "The markers mode must be auto, on or off."
+        self._update_period = cfg.get("update_period", 1)
+        assert self._update_period > 0, "The update period must be positive."
+        self.enabled = (mode == "on") or (mode == "auto" and render)
+        self._view = None
+        self._positions = torch.zeros(
+            (num_envs, 3), device=device, dtype=torch.float32
+        )
+        self._orientations = torch.zeros(
+            (num_envs, 4), device=device, dtype=torch.float32
+        )
+        self._pending = torch.zeros(num_envs, device=device, dtype=torch.bool)
+        self._step = 0
+        self._requested_writes = 0
+        self._written = 0
+
+    def set_view(self, view) -> None:
+        """
+        Sets the prim view the poses are written to.
+
+        Args:
+            view (XFormPrimView): The view of the markers, or None."""
+
+        self._view = view if self.enabled else None
+
+    def set_world_poses(
+        self, positions: torch.Tensor, orientations: torch.Tensor, indices: torch.Tensor
+    ) -> None:
+        """
+        Stages the poses of the markers of some environments.
+
+        Args:
+            positions (torch.Tensor): The (N, 3) positions of the markers.
+            orientations (torch.Tensor): The (N, 4) orientations of the markers.
+            indices (torch.Tensor): The N indices of the environments."""
+
+        self._requested_writes += len(indices)
+        if self._view is None:
+            return
+        indices = indices.long()
+        self._positions[indices] = positions
+        self._orientations[indices] = orientations
+        self._pending[indices] = True
+        if self._update_period == 1:
+            self.flush()
+
+    def step(self) -> None:
+        """
+        Advances the update clock, and writes the staged poses when it is due."""
+
+        self._step += 1
+        if self._step % self._update_period == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes all the staged poses to the stage in a single call."""
+
+        if self._view is None:
+            return
+        indices = self._pending.nonzero(as_tuple=False).squeeze(-1)
+        if len(indices) == 0:
+            return
+        self._view.set_world_poses(
+            self._positions[indices], self._orientations[indices], indices=indices
+        )
+        self._pending[indices] = False
+        self._written += len(indices)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: The number of marker pose writes avoided so far."""
+
+        return {"marker_writes_avoided": self._requested_writes - self._written}
@@ -0,0 +1,119 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from typing import Dict, List
+import torch
+
+
+class DoubleBufferExchange:
+    """
+    Hands the data of the simulation thread over to the training thread through two
+    preallocated sets of buffers. The simulation thread copies its data into one set,
+    and only sends the index of that set through the data queue. The next step is
+    written into the other set, such that the training thread can keep using the data
+    of the previous step while the simulation steps, without cloning it.
+    The data of a step stays valid until the data of the step after next is written.
+    The tensors of the dictionaries are copied recursively. The static keys (e.g. the
+    episode-static observations of a task) are only copied when their source tensor
+    was modified since it was last copied into the same set.
+    """
+
+    def __init__(self, static_keys: List[str] = []) -> None:
+        """
+        Args:
+            static_keys (List[str], optional): The keys of the tensors that rarely change. Defaults to [].
+        """
+
+        self._static_keys = set(static_keys)
+        self._buffers = [None, None]
+        # (source, version) of the static tensors last copied into each set
+        self._sources = [{}, {}]
+        self._index = 0
+
+    @staticmethod
+    def _allocate(data: Dict[str, object]) -> Dict[str, object]:
+        buffers = {}
+        for key, value in data.items():
+            if isinstance(value, torch.Tensor):
+                buffers[key] = value.clone()
+            elif isinstance(value, dict):
+                buffers[key] = DoubleBufferExchange._allocate(value)
+            else:
+                buffers[key] = value
+        return buffers
+
+    @staticmethod
+    def _fits(buffers: Dict[str, object], data: Dict[str, object]) -> bool:
+        if (not isinstance(buffers, dict)) or buffers.keys() != data.keys():
+            return False
+        for key, value in data.items():
+            if isinstance(value, torch.Tensor) and (
+                (not isinstance(buffers[key], torch.Tensor))
+                or buffers[key].shape != value.shape
+                or buffers[key].dtype != value.dtype
+                or buffers[key].device != value.device
+            ):
+                return False
+        return True
+
+    def _copy(
+        self, buffers: Dict[str, object], data: Dict[str, object], sources: dict
+    ) -> None:
+        for key in list(buffers.keys()):
+            if key not in data:
+                del buffers[key]
+        for key, value in data.items():
+            if isinstance(value, torch.Tensor):
+                if key not in self._static_keys:
+                    buffers[key].copy_(value)
+                elif (key not in sources) or (
+                    sources[key][0] is not value
+                    or sources[key][1] != value._version
+                ):
+                    buffers[key].copy_(value)
+                    # keeps a reference to the source, such that its id is not reused
+                    sources[key] = (value, value._version)
+            elif isinstance(value, dict):
+                if key not in buffers or not self._fits(buffers[key], value):
+                    buffers[key] = self._allocate(value)
+                self._copy(buffers[key], value, sources.setdefault(key, {}))
+            else:
+                buffers[key] = value
+
+    def write(self, data: Dict[str, object]) -> Dict[str, int]:
+        """
+        Copies the data into the next set of buffers. Called by the simulation thread.
+
+        Args:
+            data (Dict[str, object]): The data of the step.
+
+        Returns:
+            Dict[str, int]: The message to send through the data queue."""
+
+        if not self._fits(self._buffers[self._index], data):
+            # first step, or the layout of the data changed
+            self._buffers[self._index] = self._allocate(data)
+            self._sources[self._index] = {}
+        self._copy(self._buffers[self._index], data, self._sources[self._index])
+        message = {"buffer": self._index}
+        self._index = 1 - self._index
+        return message
+
+    def read(self, message: Dict[str, int]) -> Dict[str, object]:
+        """
+        Returns the set of buffers designated by a message. Called by the training thread.
+
+        Args:
+            message (Dict[str, int]): The message received from the data queue.
+
+        Returns:
+            Dict[str, object]: The data of the step."""
+
+        return self._buffers[message["buffer"]]
@@ -0,0 +1,74 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+import torch
+
+
+class ObservationHistory:
+    """
+    Circular buffer holding the last length observations of every environment.
+    Every observation is written twice, at head and at head + length, in a buffer of
+    2 x length slots. The window going from the oldest to the newest observation is
+    then always a contiguous slice of that buffer, and is returned as a
+    (num_envs, length x dim) view: no concatenation or copy is made when the history
+    is read."""
+
+    def __init__(
+        self, num_envs: int, dim: int, length: int, device: str = "cuda:0"
+    ) -> None:
+        """
+        Args:
+            num_envs (int): The number of environments.
+            dim (int): The size of an observation.
+            length (int): The number of observations in the history.
+            device (str, optional): The device on which the history is stored. Defaults to "cuda:0".
+        """
+
+        assert length > 0, "The length of the history must be positive."
+        self._num_envs = num_envs
+        self._length = length
+        self._buffer = torch.zeros(
+            (num_envs, 2 * length, dim), device=device, dtype=torch.float32
+        )
+        self._head = length - 1
+
+    def push(self, observations: torch.Tensor) -> torch.Tensor:
+        """
+        Adds the newest observations to the history.
+
+        Args:
+            observations (torch.Tensor): The (num_envs, dim) observations.
+
+        Returns:
+            torch.Tensor: The (num_envs, length x dim) history, oldest first."""
+
+        self._head = (self._head + 1) % self._length
+        self._buffer[:, self._head] = observations
+        self._buffer[:, self._head + self._length] = observations
+        return self.get()
+
+    def get(self) -> torch.Tensor:
+        """
+        Returns:
+            torch.Tensor: The (num_envs, length x dim) history, oldest first."""
+
+        start = self._head + 1
+        return self._buffer[:, start : start + self._length].reshape(
+            self._num_envs, -1
+        )
+
+    def reset(self, env_ids: torch.Tensor) -> None:
+        """
+        Zeroes the history of the given environments.
+
+        Args:
+            env_ids (torch.Tensor): The ids of the environments to reset."""
+
+        self._buffer.index_fill_(0, env_ids.long(), 0)
@@ -13,15 +13,170 @@ import array
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import json
+import math
+import hashlib
 import pandas as pd
 import matplotlib.cm as cm
+from concurrent.futures import ProcessPoolExecutor
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes, mark_inset
 import seaborn as sns
 from matplotlib.collections import LineCollection
+from typing import Callable, Dict, List, Tuple
+
+# Metrics that aggregate every time step, they are always drawn at full resolution.
+FULL_RESOLUTION_METRICS = [
+    "plot_actions_histogram",
+    "plot_actions_box_plot",
+    "plot_single_actions",
+    "plot_single_action_histogram",
+]
+# Inputs of the metrics that are indexed by time step.
+TIME_SERIES_KEYS = ["state_history", "control_history", "reward_history", "tgrid"]
+PLOT_CACHE_FILE = ".plot_cache.json"
+
+
+def downsample_plot_inputs(args: dict, max_points: int) -> dict:
+    """
+    Downsamples the time series given to a metric, such that at most max_points are drawn.
+
+    Args:
+    args: dict: arguments of the metric
+    max_points: int: maximum number of time steps to draw, 0 to disable downsampling
+    """
+
+    num_steps = len(args["tgrid"])
+    if (max_points <= 0) or (num_steps <= max_points):
+        return args
+    stride = math.ceil(num_steps / max_points)
+    args = dict(args)
+    for key in TIME_SERIES_KEYS:
+        if (key in args) and (len(args[key]) == num_steps):
+            args[key] = np.asarray(args[key])[::stride]
+    return args
+
+
+def hash_plot_inputs(metric: Callable, args: dict) -> str:
+    """
+    Hashes the inputs of a metric, such that unchanged figures can be skipped.
+
+    Args:
+    metric: Callable: the plotting function
+    args: dict: arguments of the metric
+    """
+
+    h = hashlib.sha1(metric.__name__.encode())
+    for key in sorted(args.keys()):
+        if key == "fig_count":
+            continue
+        value = args[key]
+        h.update(key.encode())
+        if isinstance(value, (np.ndarray, list)):
+            value = np.ascontiguousarray(value)
+            h.update(f"{value.dtype}{value.shape}".encode())
+            h.update(value.tobytes())
+        else:
+            h.update(repr(value).encode())
+    return h.hexdigest()
+
+
+def _init_plot_worker() -> None:
+    """
+    Makes sure the workers render off-screen."""
+
+    plt.switch_backend("Agg")
+
+
+def _render_plot(metric: Callable, args: dict) -> None:
+    """
+    Renders a single metric, and releases its figures."""
+
+    try:
+        metric(**args)
+    finally:
+        plt.close("all")
+
+
+def render_plots(
+    jobs: List[Tuple[Callable, dict]],
+    num_workers: int = None,
+    use_cache: bool = True,
+    max_points: int = 2000,
+) -> None:
+    """
+    Renders a set of metrics. The time series are downsampled, the figures whose inputs
+    did not change since the last call are skipped, and the remaining ones are rendered
+    in a pool of processes using the Agg backend.
+
+    Args:
+    jobs: List[Tuple[Callable, dict]]: the plotting functions and their arguments
+    num_workers: int: number of processes, defaults to one per figure up to the number of cpus. 0 or 1 renders in the current process
+    use_cache: bool: if True, skip the figures whose inputs are unchanged
+    max_points: int: maximum number of time steps to draw, 0 to disable downsampling
+    """
+
+    caches = {}
+    todo = []
+    for metric, args in jobs:
+        if metric.__name__ not in FULL_RESOLUTION_METRICS:
+            args = downsample_plot_inputs(args, max_points)
+        key = hash_plot_inputs(metric, args)
+        save_dir = args["save_dir"]
+        if save_dir not in caches:
+            caches[save_dir] = load_plot_cache(save_dir) if use_cache else {}
+        if use_cache and (caches[save_dir].get(metric.__name__) == key):
+            continue
+        todo.append((metric, args, key))
+
+    if num_workers is None:
+        num_workers = min(len(todo), os.cpu_count() or 1)
+    if num_workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_plot_worker
+        ) as executor:
+            futures = [
+                executor.submit(_render_plot, metric, args) for metric, args, _ in todo
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for metric, args, _ in todo:
+            _render_plot(metric, args)
+
+    if use_cache:
+        for metric, args, key in todo:
+            caches[args["save_dir"]][metric.__name__] = key
+        for save_dir, cache in caches.items():
+            save_plot_cache(save_dir, cache)
+
+
+def load_plot_cache(save_dir: str) -> Dict[str, str]:
+    """
+    Loads the hashes of the figures already rendered in a directory."""
+
+    try:
+        with open(os.path.join(save_dir, PLOT_CACHE_FILE), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_plot_cache(save_dir: str, cache: Dict[str, str]) -> None:
+    """
+    Saves the hashes of the figures rendered in a directory."""
+
+    os.makedirs(save_dir, exist_ok=True)
+    with open(os.path.join(save_dir, PLOT_CACHE_FILE), "w") as f:
+        json.dump(cache, f)
 
 
 def plot_episode_data_virtual(
-    ep_data: dict, save_dir: str, all_agents: bool = False
+    ep_data: dict,
+    save_dir: str,
+    all_agents: bool = False,
+    num_workers: int = None,
+    use_cache: bool = True,
+    max_points: int = 2000,
 ) -> None:
     """
     Plots the evaluation data for a single agent across a set of evaluation episodes.
@@ -36,6 +191,9 @@ def plot_episode_data_virtual(
     ep_data: dict: dictionary containing episode data
     save_dir: str: directory where to save the plots
     all_agents: bool: if True, plot average results over all agents, if False only the first agent is plotted
+    num_workers: int: number of rendering processes, see render_plots
+    use_cache: bool: if True, skip the figures whose inputs are unchanged
+    max_points: int: maximum number of time steps to draw, 0 to disable downsampling
     """
 
     reward_history = ep_data["rews"]
@@ -63,18 +221,18 @@ def plot_episode_data_virtual(
             rand_agent,
         )
         # plot best and worst episodes data
-        plot_one_episode(
+        jobs = get_one_episode_jobs(
             {k: np.array([v[best_agent] for v in vals]) for k, vals in ep_data.items()},
             save_dir + "best_ep/",
         )
-        plot_one_episode(
+        jobs += get_one_episode_jobs(
             {
                 k: np.array([v[worst_agent] for v in vals])
                 for k, vals in ep_data.items()
             },
             save_dir + "worst_ep/",
         )
-        plot_one_episode(
+        jobs += get_one_episode_jobs(
             {k: np.array([v[rand_agent] for v in vals]) for k, vals in ep_data.items()},
             save_dir + f"rand_ep_{rand_agent}/",
         )
@@ -124,16 +282,18 @@ def plot_episode_data_virtual(
             task_metrics = []
         metrics = shared_metrics + task_metrics
 
-        for metric in metrics:
-            fig_count = metric(**args)
-            args["fig_count"] = fig_count
+        jobs += [(metric, args) for metric in metrics]
 
     else:
-        fig_count = plot_one_episode(
+        jobs = get_one_episode_jobs(
             {k: np.array([v[0] for v in vals]) for k, vals in ep_data.items()},
             save_dir + "first_ep/",
         )
 
+    render_plots(
+        jobs, num_workers=num_workers, use_cache=use_cache, max_points=max_points
+    )
+
 
 def plot_distance_GoToXY(
     state_history: np.ndarray,
@@ -867,13 +1027,45 @@ def plot_one_episode(
     show: bool = False,
     debug: bool = False,
     fig_count: int = 0,
+    num_workers: int = None,
+    use_cache: bool = True,
+    max_points: int = 2000,
 ) -> None:
     """
     Plot episode metrics for a single agent.
 
     ep_data: dictionary containing episode data
     save_dir: directory where to save the plots
-    all_agents: if True, plot average results over all agents, if False only the first agent is plotted.
+    show: if True, the figures are displayed and rendered in the current process
+    debug: if True, plot additional metrics
+    num_workers: number of rendering processes, see render_plots
+    use_cache: if True, skip the figures whose inputs are unchanged
+    max_points: maximum number of time steps to draw, 0 to disable downsampling
+    """
+
+    jobs = get_one_episode_jobs(ep_data, save_dir, show, debug, fig_count)
+    if show:
+        num_workers = 0
+        use_cache = False
+    render_plots(
+        jobs, num_workers=num_workers, use_cache=use_cache, max_points=max_points
+    )
+
+
+def get_one_episode_jobs(
+    ep_data: dict,
+    save_dir: str = None,
+    show: bool = False,
+    debug: bool = False,
+    fig_count: int = 0,
+) -> List[Tuple[Callable, dict]]:
+    """
+    Saves the episode data of a single agent, and collects the metrics to plot.
+
+    ep_data: dictionary containing episode data
+    save_dir: directory where to save the plots
+    show: if True, the figures are displayed
+    debug: if True, plot additional metrics
     """
     os.makedirs(save_dir, exist_ok=True)
 
@@ -955,10 +1147,6 @@ def plot_one_episode(
         "tgrid": tgrid,
     }
 
-    for metric in metrics:
-        fig_count = metric(**args)
-        args["fig_count"] = fig_count
-
     df_cols = [
         "cos_theta",
         "sin_theta",
@@ -972,7 +1160,7 @@ def plot_one_episode(
         save_dir + "states_episode.csv",
     )
 
-    fig_count = 0
+    return [(metric, args) for metric in metrics]
 
 
 def plot_single_linear_vel(
@@ -0,0 +1,222 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from typing import Dict, List, Tuple
+import atexit
+import torch
+import os
+
+
+def load_ledger(path: str) -> Tuple[List[str], torch.Tensor]:
+    """
+    Loads a randomization ledger. The path can either be a single batch, or a directory
+    containing the batches of a run. The batches are concatenated in the order they
+    were written.
+
+    Args:
+        path (str): The path to the batch, or to the directory.
+
+    Returns:
+        Tuple[List[str], torch.Tensor]: The names of the columns, and the rows."""
+
+    if os.path.isdir(path):
+        files = sorted(
+            [
+                os.path.join(path, f)
+                for f in os.listdir(path)
+                if f.startswith("ledger_") and f.endswith(".pt")
+            ]
+        )
+    else:
+        files = [path]
+    assert len(files) > 0, "No ledger found in " + path
+    batches = [torch.load(f, map_location="cpu") for f in files]
+    columns = batches[0]["columns"]
+    for batch in batches[1:]:
+        assert batch["columns"] == columns, "The ledger batches have different columns."
+    return columns, torch.cat([batch["rows"] for batch in batches], dim=0)
+
+
+class RandomizationLedger:
+    """
+    Per-episode record of the parameters randomized at reset.
+    The parameters are registered as attributes of the objects that draw them (e.g.
+    the damping coefficients of the hydrodynamics), and are read when the episodes
+    end, along with metrics describing the outcome of the episodes. The rows are
+    accumulated in a device tensor, and written to disk in batches of batch_size.
+    In replay mode, the rows of a previous ledger are written back into the registered
+    attributes, one row per reset, in the order they were recorded."""
+
+    def __init__(
+        self,
+        cfg: dict,
+        num_envs: int,
+        device: str = "cuda:0",
+    ) -> None:
+        """
+        Args:
+            cfg (dict): The configuration of the ledger: record (default False), path (default
+                "ledgers"), batch_size (default 4096), replay (default False) and replay_path,
+                the recorded ledger (file or directory) to replay, required by replay.
+            num_envs (int): The number of environments.
+            device (str, optional): The device on which the rows are stored. Defaults to "cuda:0".
+        """
+
+        self.record = cfg.get("record", False)
+        self.replay = cfg.get("replay", False)
+        self.path = cfg.get("path", "ledgers")
+        self.batch_size = cfg.get("batch_size", 4096)
+        self.num_envs = num_envs
+        self.device = device
+
+        self._parameters = {}
+        self._columns = None
+        self._rows = None
+        self._num_rows = 0
+        self._num_episodes = 0
+        self._num_batches = 0
+
+        if self.replay:
+            columns, rows = load_ledger(cfg["replay_path"])
+            self._replay_columns = columns
+            self._replay_rows = rows.to(device)
+            self._replay_cursor = 0
+            self._replay_indices = {}
+        if self.record:
+            os.makedirs(self.path, exist_ok=True)
+            # writes the last, partial batch
+            atexit.register(self.dump)
+
+    def register(self, name: str, owner: object, attribute: str) -> None:
+        """
+        Registers a randomized parameter. The attribute is looked up every time it is
+        accessed, so it can be reassigned by its owner. The attribute must exist, the
+        parameters of disabled disturbances must not be registered.
+
+        Args:
+            name (str): The name of the parameter in the ledger.
+            owner (object): The object holding the parameter.
+            attribute (str): The name of the attribute, a (num_envs, ...) tensor."""
+
+        assert hasattr(owner, attribute), (
+            "The parameter " + name + " has no attribute " + attribute + "."
+        )
+        self._parameters[name] = (owner, attribute)
+
+    def _get(self, name: str) -> torch.Tensor:
+        owner, attribute = self._parameters[name]
+        return getattr(owner, attribute)
+
+    def _build_columns(self, metrics: Dict[str, torch.Tensor]) -> None:
+        self._columns = ["episode", "env_id"]
+        self._slices = {}
+        for name in self._parameters.keys():
+            width = self._get(name)[0].numel()
+            start = len(self._columns)
+            if width == 1:
+                self._columns.append(name)
+            else:
+                self._columns += [name + "_" + str(i) for i in range(width)]
+            self._slices[name] = slice(start, start + width)
+        self._metric_names = list(metrics.keys())
+        self._metric_start = len(self._columns)
+        self._columns += ["metric_" + name for name in self._metric_names]
+        self._rows = torch.zeros(
+            (self.batch_size, len(self._columns)), device=self.device
+        )
+
+    def record_episodes(
+        self, env_ids: torch.Tensor, metrics: Dict[str, torch.Tensor]
+    ) -> None:
+        """
+        Records the parameters of the episodes ending in the given environments. Must be
+        called before the parameters are randomized again.
+
+        Args:
+            env_ids (torch.Tensor): The ids of the environments being reset.
+            metrics (Dict[str, torch.Tensor]): (num_envs) tensors describing the outcome
+                of the episodes, e.g. their length or their rewards."""
+
+        if not self.record:
+            return
+        if self._columns is None:
+            self._build_columns(metrics)
+        num_resets = len(env_ids)
+        row = 0
+        while row < num_resets:
+            # fill the batch, and write it once it is full
+            count = min(num_resets - row, self.batch_size - self._num_rows)
+            ids = env_ids[row : row + count]
+            rows = self._rows[self._num_rows : self._num_rows + count]
+            rows[:, 0] = torch.arange(
+                self._num_episodes, self._num_episodes + count, device=self.device
+            )
+            rows[:, 1] = ids
+            for name, columns in self._slices.items():
+                rows[:, columns] = self._get(name)[ids].reshape(count, -1)
+            for i, name in enumerate(self._metric_names):
+                rows[:, self._metric_start + i] = metrics[name][ids]
+            self._num_rows += count
+            self._num_episodes += count
+            row += count
+            if self._num_rows == self.batch_size:
+                self.dump()
+
+    def replay_episodes(self, env_ids: torch.Tensor) -> None:
+        """
+        Overwrites the randomized parameters of the given environments with the next
+        rows of the replayed ledger. Must be called after the parameters are randomized.
+        The ledger is looped over once all its rows have been used.
+
+        Args:
+            env_ids (torch.Tensor): The ids of the environments being reset."""
+
+        if not self.replay:
+            return
+        num_resets = len(env_ids)
+        num_rows = self._replay_rows.shape[0]
+        idx = (
+            torch.arange(num_resets, device=self.device) + self._replay_cursor
+        ) % num_rows
+        self._replay_cursor = (self._replay_cursor + num_resets) % num_rows
+        rows = self._replay_rows[idx]
+        for name in self._parameters.keys():
+            parameter = self._get(name)
+            parameter[env_ids] = (
+                rows[:, self._get_replay_columns(name, parameter[0].numel())]
+                .reshape((num_resets,) + parameter.shape[1:])
+                .to(parameter.dtype)
+            )
+
+    def _get_replay_columns(self, name: str, width: int) -> List[int]:
+        if name not in self._replay_indices:
+            if width == 1:
+                names = [name]
+            else:
+                names = [name + "_" + str(i) for i in range(width)]
+            assert all(
+                n in self._replay_columns for n in names
+            ), "The parameter " + name + " is not in the replayed ledger."
+            self._replay_indices[name] = [self._replay_columns.index(n) for n in names]
+        return self._replay_indices[name]
+
+    def dump(self) -> None:
+        """
+        Writes the recorded rows to disk, in a single transfer."""
+
+        if (not self.record) or (self._num_rows == 0):
+            return
+        path = os.path.join(self.path, "ledger_" + str(self._num_batches).zfill(5) + ".pt")
+        torch.save(
+            {"columns": self._columns, "rows": self._rows[: self._num_rows].cpu()},
+            path,
+        )
+        self._num_batches += 1
+        self._num_rows = 0
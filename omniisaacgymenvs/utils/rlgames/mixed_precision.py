@@ -0,0 +1,76 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+import torch
+
+PRECISIONS = {"fp32": None, "bf16": torch.bfloat16, "fp16": torch.float16}
+REDUCED_FLOATS = [torch.float16, torch.bfloat16]
+COMPACT_OBSERVATIONS = [torch.float16, torch.bfloat16, torch.int8, torch.bool]
+
+
+def _to_float(data, dtypes: list):
+    """
+    Casts the tensors of a (nested) container whose dtype is in dtypes to fp32."""
+
+    if isinstance(data, dict):
+        return {key: _to_float(value, dtypes) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return type(data)(_to_float(value, dtypes) for value in data)
+    if isinstance(data, torch.Tensor) and data.dtype in dtypes:
+        return data.float()
+    return data
+
+
+def set_policy_precision(model: torch.nn.Module, config: dict) -> None:
+    """
+    Runs the forward pass of an rl_games model in reduced precision.
+    The compact observations (fp16 transforms, int8 masks) are cast back to fp32 when
+    they enter the model, except the ones listed in the compact_inputs of the network,
+    which it casts itself. The forward pass runs under autocast, and the outputs are
+    cast back to fp32, such that the losses are always computed in fp32.
+    With fp16, autocast is only used when gradients are disabled (rollouts and
+    evaluation), since the losses are not scaled. With bf16, it is also used for the
+    forward pass of the training.
+
+    Args:
+        model (torch.nn.Module): The model of the agent or the player.
+        config (dict): The config of the agent, the precision is read from policy_precision.
+    """
+
+    precision = config.get("policy_precision", "fp32")
+    assert precision in PRECISIONS.keys(), "The policy precision must be fp32, bf16 or fp16."
+    dtype = PRECISIONS[precision]
+    forward = model.forward
+
+    # Inputs the network casts itself, e.g. to cache what it computes from them
+    network = getattr(model, "a2c_network", model)
+    keep_compact = getattr(network, "compact_inputs", ())
+
+    def reduced_precision_forward(input_dict):
+        input_dict = dict(input_dict)
+        obs = input_dict["obs"]
+        if isinstance(obs, dict):
+            input_dict["obs"] = {
+                key: value if key in keep_compact else _to_float(value, COMPACT_OBSERVATIONS)
+                for key, value in obs.items()
+            }
+        else:
+            input_dict["obs"] = _to_float(obs, COMPACT_OBSERVATIONS)
+        enabled = (dtype is not None) and (
+            (dtype == torch.bfloat16) or (not torch.is_grad_enabled())
+        )
+        device_type = "cuda" if torch.cuda.is_available() else "cpu"
+        with torch.autocast(device_type=device_type, dtype=dtype, enabled=enabled):
+            outputs = forward(input_dict)
+        if enabled:
+            outputs = _to_float(outputs, REDUCED_FLOATS)
+        return outputs
+
+    model.forward = reduced_precision_forward
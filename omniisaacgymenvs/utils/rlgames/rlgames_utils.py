@@ -30,11 +30,82 @@
 from rl_games.common import env_configurations, vecenv
 from rl_games.common.algo_observer import AlgoObserver
 from rl_games.algos_torch import torch_ext
+from omniisaacgymenvs.utils.rlgames.mixed_precision import set_policy_precision
 import torch
 import numpy as np
 from typing import Callable
 
 
+class EpisodeStatistics:
+    """Running sum, count, min and max of the episode infos, kept on the device.
+    The statistics of all the keys are stored in a single (num_keys, 4) tensor, so that they are read back with one transfer."""
+
+    def __init__(self, device, cache_size=16):
+        self.device = device
+        self.keys = {}
+        self.stats = torch.zeros((0, 4), device=device)
+        # row of every value, per layout (keys and sizes) of the infos
+        self._segments = {}
+        self._cache_size = cache_size
+
+    def clear(self):
+        self.stats[:, 0:2] = 0
+        self.stats[:, 2] = float('inf')
+        self.stats[:, 3] = -float('inf')
+
+    def _add_key(self, key):
+        self.keys[key] = len(self.keys)
+        new_stats = torch.tensor([[0.0, 0.0, float('inf'), -float('inf')]], device=self.device)
+        self.stats = torch.cat((self.stats, new_stats))
+
+    def _get_segments(self, keys, sizes):
+        layout = (keys, sizes)
+        segments = self._segments.get(layout)
+        if segments is None:
+            for key in keys:
+                if key not in self.keys:
+                    self._add_key(key)
+            rows = torch.tensor([self.keys[key] for key in keys], device=self.device)
+            counts = torch.tensor(sizes, device=self.device)
+            segments = torch.repeat_interleave(rows, counts, output_size=sum(sizes))
+            if len(self._segments) >= self._cache_size:
+                self._segments.pop(next(iter(self._segments)))
+            self._segments[layout] = segments
+        return segments
+
+    def update(self, ep_info):
+        tensors, scalars = {}, {}
+        for key, value in ep_info.items():
+            # python and numpy scalars are sent to the device together
+            if not isinstance(value, torch.Tensor) and np.ndim(value) == 0:
+                scalars[key] = float(value)
+                continue
+            value = torch.as_tensor(value).reshape(-1)
+            if value.numel() > 0:
+                tensors[key] = value
+        values = [value.to(self.device, torch.float) for value in tensors.values()]
+        if len(scalars) > 0:
+            values.append(torch.tensor(list(scalars.values()), device=self.device))
+        if len(values) == 0:
+            return
+        # the infos usually keep the same layout, so their rows are built once on the device
+        keys = tuple(tensors) + tuple(scalars)
+        sizes = tuple(value.numel() for value in tensors.values()) + (1,) * len(scalars)
+        segments = self._get_segments(keys, sizes)
+        values = torch.cat(values)
+        # sums and counts, then min and max, of all the keys at once
+        self.stats[:, 0:2].index_add_(0, segments, torch.stack((values, torch.ones_like(values)), dim=1))
+        self.stats[:, 2].scatter_reduce_(0, segments, values, reduce='amin')
+        self.stats[:, 3].scatter_reduce_(0, segments, values, reduce='amax')
+
+    def read(self):
+        """Returns the mean, min and max of the keys updated since the last clear."""
+
+        stats = self.stats.cpu()
+        return {key: ((stats[i, 0] / stats[i, 1]).item(), stats[i, 2].item(), stats[i, 3].item())
+                for key, i in self.keys.items() if stats[i, 1] > 0}
+
+
 class RLGPUAlgoObserver(AlgoObserver):
     """Allows us to log stats from the env along with the algorithm running stats. """
 
@@ -44,15 +115,16 @@ class RLGPUAlgoObserver(AlgoObserver):
     def after_init(self, algo):
         self.algo = algo
         self.mean_scores = torch_ext.AverageMeter(1, self.algo.games_to_track).to(self.algo.ppo_device)
-        self.ep_infos = []
+        self.ep_stats = EpisodeStatistics(self.algo.device)
         self.direct_info = {}
         self.writer = self.algo.writer
+        set_policy_precision(self.algo.model, self.algo.config)
 
     def process_infos(self, infos, done_indices):
         assert isinstance(infos, dict), "RLGPUAlgoObserver expects dict info"
         if isinstance(infos, dict):
             if 'episode' in infos:
-                self.ep_infos.append(infos['episode'])
+                self.ep_stats.update(infos['episode'])
 
             if len(infos) > 0 and isinstance(infos, dict):  # allow direct logging from env
                 self.direct_info = {}
@@ -65,20 +137,12 @@ class RLGPUAlgoObserver(AlgoObserver):
         self.mean_scores.clear()
 
     def after_print_stats(self, frame, epoch_num, total_time):
-        if self.ep_infos:
-            for key in self.ep_infos[0]:
-                    infotensor = torch.tensor([], device=self.algo.device)
-                    for ep_info in self.ep_infos:
-                        # handle scalar and zero dimensional tensor infos
-                        if not isinstance(ep_info[key], torch.Tensor):
-                            ep_info[key] = torch.Tensor([ep_info[key]])
-                        if len(ep_info[key].shape) == 0:
-                            ep_info[key] = ep_info[key].unsqueeze(0)
-                        infotensor = torch.cat((infotensor, ep_info[key].to(self.algo.device)))
-                    value = torch.mean(infotensor)
-                    self.writer.add_scalar('Episode/' + key, value, epoch_num)
-            self.ep_infos.clear()
-        
+        for key, (mean, lowest, highest) in self.ep_stats.read().items():
+            self.writer.add_scalar('Episode/' + key, mean, epoch_num)
+            self.writer.add_scalar('Episode_min/' + key, lowest, epoch_num)
+            self.writer.add_scalar('Episode_max/' + key, highest, epoch_num)
+        self.ep_stats.clear()
+
         for k, v in self.direct_info.items():
             self.writer.add_scalar(f'{k}/frame', v, frame)
             self.writer.add_scalar(f'{k}/iter', v, epoch_num)
@@ -90,6 +154,12 @@ class RLGPUAlgoObserver(AlgoObserver):
             self.writer.add_scalar('scores/iter', mean_scores, epoch_num)
             self.writer.add_scalar('scores/time', mean_scores, total_time)
 
+        # per-phase step timings, only available if the profiler is enabled
+        env = getattr(getattr(self.algo, 'vec_env', None), 'env', None)
+        task = getattr(env, '_task', None)
+        if getattr(task, 'profiler', None) is not None:
+            task.profiler.write(self.writer, epoch_num)
+
 
 class RLGPUEnv(vecenv.IVecEnv):
     def __init__(self, config_name, num_actors, **kwargs):
@@ -0,0 +1,243 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from rl_games.algos_torch.network_builder import NetworkBuilder
+from rl_games.algos_torch import model_builder
+import torch.nn.functional as F
+import torch.nn as nn
+import torch
+import math
+
+
+def register_networks() -> None:
+    """
+    Registers the networks of this module in rl_games."""
+
+    model_builder.register_network("actor_critic_thruster_set", ThrusterSetBuilder)
+
+
+def _attention(
+    q: torch.Tensor, k: torch.Tensor, v: torch.Tensor, attend: torch.Tensor
+) -> torch.Tensor:
+    """
+    Scaled dot product attention, fused when the installed torch provides it.
+
+    Args:
+        q, k, v (torch.Tensor): The (N, heads, L, head_dim) queries, keys and values.
+        attend (torch.Tensor): The (N, 1, 1, L) boolean mask of the keys that can be attended.
+
+    Returns:
+        torch.Tensor: The (N, heads, L, head_dim) attention outputs."""
+
+    if hasattr(F, "scaled_dot_product_attention"):
+        return F.scaled_dot_product_attention(q, k, v, attn_mask=attend)
+    scores = q @ k.transpose(-2, -1) / math.sqrt(q.shape[-1])
+    scores = scores.masked_fill(~attend, float("-inf"))
+    return torch.softmax(scores, dim=-1) @ v
+
+
+class ThrusterSetBlock(nn.Module):
+    """
+    Pre-norm Transformer encoder block, whose keys are masked by a key padding mask."""
+
+    def __init__(self, d_model: int, num_head: int, dim_feedforward: int) -> None:
+        super().__init__()
+        assert d_model % num_head == 0, "d_model must be a multiple of num_head."
+        self.num_head = num_head
+        self.norm1 = nn.LayerNorm(d_model)
+        self.qkv = nn.Linear(d_model, 3 * d_model)
+        self.out = nn.Linear(d_model, d_model)
+        self.norm2 = nn.LayerNorm(d_model)
+        self.feedforward = nn.Sequential(
+            nn.Linear(d_model, dim_feedforward),
+            nn.GELU(),
+            nn.Linear(dim_feedforward, d_model),
+        )
+
+    def forward(self, x: torch.Tensor, attend: torch.Tensor) -> torch.Tensor:
+        n, length, d_model = x.shape
+        qkv = self.qkv(self.norm1(x)).view(n, length, 3, self.num_head, -1)
+        q, k, v = qkv.permute(2, 0, 3, 1, 4)
+        y = _attention(q, k, v, attend).transpose(1, 2).reshape(n, length, d_model)
+        x = x + self.out(y)
+        return x + self.feedforward(self.norm2(x))
+
+
+class ThrusterSetBuilder(NetworkBuilder):
+    """
+    Actor-critic encoding the thrusters as a set of tokens.
+    The state is embedded into a first token, and every thruster transform into one
+    token. Unusable thrusters (mask = 1) are removed from the keys with a key padding
+    mask, and the sequence is cut after the last usable thruster of the batch. Each
+    thruster token is decoded into the logits of its thruster, and the state token
+    into the value. Since the transforms only change at reset, the thruster
+    embeddings are reused across rollout steps as long as neither the transforms nor
+    the embedding weights were modified."""
+
+    def __init__(self, **kwargs) -> None:
+        NetworkBuilder.__init__(self)
+
+    def load(self, params: dict) -> None:
+        self.params = params
+
+    class Network(NetworkBuilder.BaseNetwork):
+        def __init__(self, params: dict, **kwargs) -> None:
+            actions_num = kwargs.pop("actions_num")
+            input_shape = kwargs.pop("input_shape")
+            self.value_size = kwargs.pop("value_size", 1)
+            kwargs.pop("num_seqs", 1)
+            NetworkBuilder.BaseNetwork.__init__(self)
+
+            cfg = params["thruster_set"]
+            d_model = cfg["d_model"]
+            activation = cfg.get("activation", "tanh")
+            self.separate = params.get("separate", False)
+            self.truncate_padding = cfg.get("truncate_padding", True)
+            num_obs = input_shape["state"][0]
+            transform_dim = input_shape["transforms"][-1]
+
+            def mlp(input_size, units, output_size):
+                layers = [
+                    self._build_mlp(input_size, units, activation, nn.Linear),
+                    nn.Linear(units[-1] if len(units) > 0 else input_size, output_size),
+                ]
+                return nn.Sequential(*layers)
+
+            self.state_embedding = mlp(num_obs, cfg["state_mlp_dim"], d_model)
+            self.transforms_embedding = mlp(
+                transform_dim, cfg["transforms_mlp_dim"], d_model
+            )
+            self.blocks = nn.ModuleList(
+                [
+                    ThrusterSetBlock(d_model, cfg["num_head"], cfg["dim_feedforward"])
+                    for _ in range(cfg["num_layer"])
+                ]
+            )
+            self.norm = nn.LayerNorm(d_model)
+            # One multi-discrete head per thruster, shared across the thrusters
+            assert all(
+                n == actions_num[0] for n in actions_num
+            ), "All the thrusters must have the same number of actions."
+            self.num_thrusters = len(actions_num)
+            self.logits = mlp(d_model, cfg["decoder_mlp_dim"], actions_num[0])
+            self.value = mlp(d_model + num_obs, cfg["critic_mlp_dim"], self.value_size)
+            self.value_act = self.activations_factory.create("None")
+
+            # One cache entry per source tensor, since the double-buffered exchange
+            # alternates the data of the task between two sets of buffers
+            self._cache_size = 2
+            self._transforms_cache = []
+            self._masks_cache = []
+            # Longest sequence of the rollouts, bounds the ones of the training minibatches
+            self._rollout_length = 0
+            self._training = False
+
+        # The transforms and masks are received as stored by the task (e.g. fp16 and
+        # int8), such that the caches below are keyed on the tensors of the task.
+        compact_inputs = ("transforms", "masks")
+
+        def _cached(self, cache: list, source: torch.Tensor, key: tuple, compute):
+            """
+            Returns the value cached for a source tensor if its key is unchanged,
+            otherwise computes it and caches it."""
+
+            for entry in cache:
+                if entry[0] is source:
+                    if entry[1] == key:
+                        return entry[2]
+                    cache.remove(entry)
+                    break
+            value = compute()
+            cache.append((source, key, value))
+            if len(cache) > self._cache_size:
+                cache.pop(0)
+            return value
+
+        def _embed_transforms(self, transforms: torch.Tensor) -> torch.Tensor:
+            if torch.is_grad_enabled():
+                return self.transforms_embedding(transforms.float())
+            # Rollouts: reuse the embeddings while the transforms and weights are unchanged
+            key = (
+                transforms._version,
+                tuple(p._version for p in self.transforms_embedding.parameters()),
+            )
+            return self._cached(
+                self._transforms_cache,
+                transforms,
+                key,
+                lambda: self.transforms_embedding(transforms.float()),
+            )
+
+        def _sequence_length(self, masks: torch.Tensor) -> int:
+            """
+            Returns the length of the sequence after the last usable thruster.
+            In rollouts, it is only recomputed when the masks were written (at reset).
+            The training minibatches are drawn from the last rollouts, so they use the
+            longest length of these rollouts, and never wait for the device."""
+
+            if torch.is_grad_enabled():
+                self._training = True
+                if self._rollout_length > 0:
+                    return self._rollout_length
+                return self.num_thrusters
+            if self._training:
+                # First rollout step after an update, starts a new rollout
+                self._training = False
+                self._rollout_length = 0
+
+            def compute():
+                usable = (masks == 0).any(0).nonzero()
+                return int(usable[-1]) + 1 if usable.shape[0] > 0 else 1
+
+            length = self._cached(self._masks_cache, masks, (masks._version,), compute)
+            self._rollout_length = max(self._rollout_length, length)
+            return length
+
+        def forward(self, obs_dict: dict):
+            obs = obs_dict["obs"]
+            states = obs_dict.get("rnn_states", None)
+            state = obs["state"]
+            masks = obs["masks"]
+            thrusters = self._embed_transforms(obs["transforms"])
+            if self.truncate_padding:
+                # Cuts the sequence after the last usable thruster of the batch
+                length = self._sequence_length(masks)
+                thrusters = thrusters[:, :length]
+                masks = masks[:, :length]
+            masks = masks.float()
+            x = torch.cat([self.state_embedding(state).unsqueeze(1), thrusters], dim=1)
+            # The state token is always attended, such that no row is fully masked
+            attend = torch.cat([torch.ones_like(masks[:, :1]), 1 - masks], dim=1)
+            attend = attend.bool()[:, None, None, :]
+            for block in self.blocks:
+                x = block(x, attend)
+            x = self.norm(x)
+
+            logits = self.logits(x[:, 1:])
+            if logits.shape[1] < self.num_thrusters:
+                # The cut thrusters are unusable, their logits are set to 0
+                logits = F.pad(logits, (0, 0, 0, self.num_thrusters - logits.shape[1]))
+            value = self.value_act(self.value(torch.cat([x[:, 0], state], dim=-1)))
+            return list(logits.unbind(1)), value, states
+
+        def is_separate_critic(self) -> bool:
+            return False
+
+        def is_rnn(self) -> bool:
+            return False
+
+        def get_default_rnn_state(self):
+            return None
+
+        def get_value_layer(self):
+            return self.value
+
+    def build(self, name: str, **kwargs) -> nn.Module:
+        return ThrusterSetBuilder.Network(self.params, **kwargs)
@@ -0,0 +1,180 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from typing import Dict
+import torch
+import time
+
+
+class StepProfiler:
+    """
+    Opt-in, low-overhead profiler of the phases of an environment step.
+    Only one step every sample_every steps is timed. On the sampled steps, the phases are
+    timed with CUDA events (or time.perf_counter on CPU), and the device is synchronized
+    once, at the end of the step. On the other steps, the start/stop calls return
+    immediately. The number of resets is accumulated on the device at every step, and
+    the number of CUDA allocations is measured on the sampled steps."""
+
+    def __init__(
+        self,
+        device: str = "cuda:0",
+        enabled: bool = False,
+        sample_every: int = 100,
+        log_every: int = 10,
+    ) -> None:
+        """
+        Args:
+            device (str, optional): The device on which the task runs. Defaults to "cuda:0".
+            enabled (bool, optional): Whether the profiler is active. Defaults to False.
+            sample_every (int, optional): Number of steps between two timed steps. Defaults to 100.
+            log_every (int, optional): Number of epochs between two writes to tensorboard. Defaults to 10.
+        """
+
+        assert sample_every > 0, "The sampling period must be strictly positive."
+        assert log_every > 0, "The logging period must be strictly positive."
+
+        self.device = torch.device(device)
+        self.enabled = enabled
+        self.sample_every = sample_every
+        self.log_every = log_every
+        self.use_cuda = self.device.type == "cuda" and torch.cuda.is_available()
+
+        self.step_count = 0
+        self.sampling = False
+        self._events = {}
+        self._starts = {}
+        self._allocations_start = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Clears the accumulated statistics."""
+
+        self.phase_time = {}
+        self.phase_count = {}
+        self.sampled_steps = 0
+        self.total_steps = 0
+        self.allocations = 0
+        self.resets = torch.zeros((), device=self.device, dtype=torch.long)
+
+    def start_step(self) -> None:
+        """
+        Marks the start of an environment step, and decides whether it is sampled."""
+
+        if not self.enabled:
+            return
+        self.sampling = self.step_count % self.sample_every == 0
+        self.step_count += 1
+        self.total_steps += 1
+        if self.sampling and self.use_cuda:
+            self._allocations_start = torch.cuda.memory_stats(self.device).get(
+                "allocation.all.allocated", 0
+            )
+
+    def start(self, name: str) -> None:
+        """
+        Starts timing a phase. Does nothing if the current step is not sampled.
+
+        Args:
+            name (str): The name of the phase."""
+
+        if not self.sampling:
+            return
+        if self.use_cuda:
+            event = torch.cuda.Event(enable_timing=True)
+            event.record()
+            self._starts[name] = event
+        else:
+            self._starts[name] = time.perf_counter()
+
+    def stop(self, name: str) -> None:
+        """
+        Stops timing a phase. Does nothing if the current step is not sampled.
+        A phase timed several times during a step (e.g. the physics substeps) is
+        accumulated.
+
+        Args:
+            name (str): The name of the phase."""
+
+        if not self.sampling:
+            return
+        start = self._starts.pop(name)
+        if self.use_cuda:
+            end = torch.cuda.Event(enable_timing=True)
+            end.record()
+            self._events.setdefault(name, []).append((start, end))
+        else:
+            self._add(name, time.perf_counter() - start)
+
+    def count_resets(self, resets: torch.Tensor) -> None:
+        """
+        Accumulates the number of environments flagged for reset, without synchronizing.
+
+        Args:
+            resets (torch.Tensor): The reset buffer of the task."""
+
+        if not self.enabled:
+            return
+        self.resets += resets.to(self.resets.device).sum()
+
+    def stop_step(self) -> None:
+        """
+        Marks the end of an environment step. On sampled steps, synchronizes the device
+        and accumulates the duration of the phases."""
+
+        if not self.sampling:
+            return
+        self.sampling = False
+        self.sampled_steps += 1
+        if self.use_cuda:
+            torch.cuda.synchronize(self.device)
+            for name, events in self._events.items():
+                for start, end in events:
+                    # CUDA events measure milliseconds.
+                    self._add(name, start.elapsed_time(end) * 1e-3)
+            self._events = {}
+            self.allocations += (
+                torch.cuda.memory_stats(self.device).get("allocation.all.allocated", 0)
+                - self._allocations_start
+            )
+
+    def _add(self, name: str, duration: float) -> None:
+        self.phase_time[name] = self.phase_time.get(name, 0.0) + duration
+        self.phase_count[name] = self.phase_count.get(name, 0) + 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: The mean time spent in each phase per sampled step, in
+            milliseconds, the number of resets per step and the number of allocations
+            per sampled step."""
+
+        stats = {}
+        if self.sampled_steps > 0:
+            for name, total in self.phase_time.items():
+                stats["time_ms/" + name] = total * 1e3 / self.sampled_steps
+            stats["allocations_per_step"] = self.allocations / self.sampled_steps
+        if self.total_steps > 0:
+            stats["resets_per_step"] = self.resets.item() / self.total_steps
+        return stats
+
+    def write(self, writer, epoch_num: int) -> None:
+        """
+        Writes the statistics to tensorboard every log_every epochs, and clears them.
+
+        Args:
+            writer (SummaryWriter): The tensorboard writer of the algorithm.
+            epoch_num (int): The current epoch."""
+
+        if (not self.enabled) or (epoch_num % self.log_every != 0):
+            return
+        for key, value in self.get_stats().items():
+            writer.add_scalar("profiler/" + key, value, epoch_num)
+        self.clear()
@@ -347,20 +347,14 @@ def convert_heightfield_to_trimesh(height_field_raw, horizontal_scale, vertical_
     vertices[:, 0] = xx.flatten()
     vertices[:, 1] = yy.flatten()
     vertices[:, 2] = hf.flatten() * vertical_scale
-    triangles = -np.ones((2*(num_rows-1)*(num_cols-1), 3), dtype=np.uint32)
-    for i in range(num_rows - 1):
-        ind0 = np.arange(0, num_cols-1) + i*num_cols
-        ind1 = ind0 + 1
-        ind2 = ind0 + num_cols
-        ind3 = ind2 + 1
-        start = 2*i*(num_cols-1)
-        stop = start + 2*(num_cols-1)
-        triangles[start:stop:2, 0] = ind0
-        triangles[start:stop:2, 1] = ind3
-        triangles[start:stop:2, 2] = ind1
-        triangles[start+1:stop:2, 0] = ind0
-        triangles[start+1:stop:2, 1] = ind2
-        triangles[start+1:stop:2, 2] = ind3
+    # each grid cell (i, j) is split into two triangles, stored row by row
+    ind0 = (np.arange(num_rows-1, dtype=np.uint32)[:, None]*num_cols + np.arange(num_cols-1, dtype=np.uint32)[None, :]).flatten()
+    ind1 = ind0 + 1
+    ind2 = ind0 + num_cols
+    ind3 = ind2 + 1
+    triangles = np.empty((2*(num_rows-1)*(num_cols-1), 3), dtype=np.uint32)
+    triangles[0::2] = np.stack([ind0, ind3, ind1], axis=1)
+    triangles[1::2] = np.stack([ind0, ind2, ind3], axis=1)
 
     return vertices, triangles
     
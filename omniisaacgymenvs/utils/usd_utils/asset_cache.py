@@ -0,0 +1,180 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from typing import Callable, Dict, List
+from contextlib import contextmanager
+import hashlib
+import json
+import time
+import os
+
+from pxr import Usd, UsdUtils
+
+from omniisaacgymenvs.utils.usd_utils.create_instanceable_assets import (
+    add_parent_xforms,
+    make_instanceable,
+)
+
+
+class AssetCache:
+    """
+    Content-addressed cache of the USD assets built at scene setup.
+    An asset is stored under the hash of its sources (USD files, or the modules that
+    generate it) and of the options used to build it. When the hash is already in
+    the cache the asset is referenced as is, otherwise it is built once into the
+    cache directory. The time spent in every step of the scene setup is recorded,
+    and can be printed with report()."""
+
+    def __init__(self, cfg: Dict[str, object]) -> None:
+        """
+        Args:
+            cfg (Dict[str, object]): The asset_cache config of the task: enabled (opt-in,
+                defaults to False), path (defaults to ~/.cache/omniisaacgymenvs/assets)
+                and instanceable (defaults to False).
+        """
+
+        self.enabled = cfg.get("enabled", False)
+        self.instanceable = cfg.get("instanceable", False)
+        self._path = os.path.expanduser(
+            cfg.get("path", "~/.cache/omniisaacgymenvs/assets")
+        )
+        self.timings = []
+        self.assets = []
+        if self.enabled:
+            os.makedirs(self._path, exist_ok=True)
+
+    @staticmethod
+    def _dependencies(source: str) -> List[str]:
+        """
+        Lists the files a source depends on. For a USD file, these are the layers it
+        references or sublayers, and the assets they use, resolved recursively.
+
+        Args:
+            source (str): The path of the source file.
+
+        Returns:
+            List[str]: The paths of the source and of its dependencies."""
+
+        if os.path.splitext(source)[1] not in [".usd", ".usda", ".usdc"]:
+            return [source]
+        layers, assets, unresolved = UsdUtils.ComputeAllDependencies(source)
+        paths = [layer.realPath for layer in layers] + list(assets) + list(unresolved)
+        return [source] + sorted(set(paths) - {source})
+
+    @staticmethod
+    def make_key(sources: List[str], options: Dict[str, object]) -> str:
+        """
+        Hashes the content of the source files, of their dependencies and the build
+        options. The dependencies that are not local files (e.g. remote or unresolved
+        assets) are hashed by path.
+
+        Args:
+            sources (List[str]): The paths of the files the asset is built from.
+            options (Dict[str, object]): The options of the build, must be json serializable.
+
+        Returns:
+            str: The key of the asset."""
+
+        key = hashlib.sha256()
+        for source in sources:
+            for path in AssetCache._dependencies(source):
+                key.update(path.encode())
+                if os.path.isfile(path):
+                    with open(path, "rb") as f:
+                        key.update(hashlib.sha256(f.read()).digest())
+        key.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return key.hexdigest()[:32]
+
+    @contextmanager
+    def timed(self, name: str):
+        """
+        Records the time spent in a step of the scene setup.
+
+        Args:
+            name (str): The name of the step."""
+
+        start = time.perf_counter()
+        yield
+        self.timings.append((name, time.perf_counter() - start))
+
+    def get(
+        self,
+        name: str,
+        sources: List[str],
+        options: Dict[str, object],
+        build: Callable[[str], None],
+    ) -> str:
+        """
+        Returns the path of a cached asset, building it if it is not in the cache.
+
+        Args:
+            name (str): The name of the asset.
+            sources (List[str]): The paths of the files the asset is built from.
+            options (Dict[str, object]): The options of the build.
+            build (Callable[[str], None]): Writes the asset to the given path.
+
+        Returns:
+            str: The path of the cached asset."""
+
+        path = os.path.join(
+            self._path, name + "_" + self.make_key(sources, options) + ".usd"
+        )
+        cache_hit = os.path.exists(path)
+        start = time.perf_counter()
+        if not cache_hit:
+            # Builds next to the final file, such that concurrent jobs never reference a partial asset
+            tmp_path = path[:-4] + "_" + str(os.getpid()) + ".tmp.usd"
+            build(tmp_path)
+            os.replace(tmp_path, path)
+        self.assets.append((name, time.perf_counter() - start, cache_hit))
+        return path
+
+    def get_instanceable(self, name: str, usd_path: str) -> str:
+        """
+        Returns the path of a flattened copy of a USD asset, whose meshes are made
+        instanceable when the cache is configured to.
+
+        Args:
+            name (str): The name of the asset.
+            usd_path (str): The path of the source USD file.
+
+        Returns:
+            str: The path of the cached asset."""
+
+        def build(path: str) -> None:
+            Usd.Stage.Open(usd_path).Export(path)
+            if not self.instanceable:
+                return
+            stage = Usd.Stage.Open(path)
+            root_path = str(stage.GetDefaultPrim().GetPath())
+            add_parent_xforms(stage, root_path)
+            # The meshes are referenced from a copy of the asset, next to it in the cache.
+            # The copy is written atomically too, and before the asset referencing it.
+            suffix = "_" + str(os.getpid()) + ".tmp.usd"
+            instance_path = path[: -len(suffix)] + "_meshes.usd"
+            instance_tmp_path = instance_path[:-4] + suffix
+            stage.GetRootLayer().Export(instance_tmp_path)
+            os.replace(instance_tmp_path, instance_path)
+            make_instanceable(stage, root_path, instance_path)
+            stage.GetRootLayer().Save()
+
+        return self.get(name, [usd_path], {"instanceable": self.instanceable}, build)
+
+    def report(self) -> None:
+        """
+        Prints the time spent in every step of the scene setup."""
+
+        print("============ Scene setup timings ============")
+        for name, duration, cache_hit in self.assets:
+            status = "cached" if cache_hit else "built"
+            print(f"asset {name:<24} {duration * 1e3:10.1f} ms ({status})")
+        for name, duration in self.timings:
+            print(f"{name:<30} {duration * 1e3:10.1f} ms")
+        print(f"{'total':<30} {sum(t[1] for t in self.timings) * 1e3:10.1f} ms")
@@ -50,18 +50,13 @@ def update_reference(source_prim_path, source_reference_path, target_reference_p
 
         prims = prims + prim.GetChildren()
 
-def create_parent_xforms(asset_usd_path, source_prim_path, save_as_path=None):
-    """ Adds a new UsdGeom.Xform prim for each Mesh/Geometry prim under source_prim_path.
-        Moves material assignment to new parent prim if any exists on the Mesh/Geometry prim.
+def add_parent_xforms(stage, source_prim_path):
+    """ Adds a new UsdGeom.Xform prim for each Mesh/Geometry prim under source_prim_path, on an open stage.
 
         Args:
-            asset_usd_path (str): USD file path for asset
+            stage (Usd.Stage): Stage holding the asset
             source_prim_path (str): USD path of root prim
-            save_as_path (str): USD file path for modified USD stage. Defaults to None, will save in same file.
     """
-    omni.usd.get_context().open_stage(asset_usd_path)
-    stage = omni.usd.get_context().get_stage()
-
     prims = [stage.GetPrimAtPath(source_prim_path)]
     edits = Sdf.BatchNamespaceEdit()
     while len(prims) > 0:
@@ -78,11 +73,48 @@ def create_parent_xforms(asset_usd_path, source_prim_path, save_as_path=None):
 
     stage.GetRootLayer().Apply(edits)
 
+def create_parent_xforms(asset_usd_path, source_prim_path, save_as_path=None):
+    """ Adds a new UsdGeom.Xform prim for each Mesh/Geometry prim under source_prim_path.
+        Moves material assignment to new parent prim if any exists on the Mesh/Geometry prim.
+
+        Args:
+            asset_usd_path (str): USD file path for asset
+            source_prim_path (str): USD path of root prim
+            save_as_path (str): USD file path for modified USD stage. Defaults to None, will save in same file.
+    """
+    omni.usd.get_context().open_stage(asset_usd_path)
+    stage = omni.usd.get_context().get_stage()
+
+    add_parent_xforms(stage, source_prim_path)
+
     if save_as_path is None:
         omni.usd.get_context().save_stage()
     else:
         omni.usd.get_context().save_as_stage(save_as_path)
 
+def make_instanceable(stage, source_prim_path, instance_usd_path):
+    """ Makes the parents of all mesh/geometry prims instanceable, on an open stage.
+        The parents reference the same prim in instance_usd_path, a copy of the asset holding the meshes.
+
+        Args:
+            stage (Usd.Stage): Stage holding the asset
+            source_prim_path (str): USD path of root prim
+            instance_usd_path (str): USD file path of the copy of the asset
+    """
+    prims = [stage.GetPrimAtPath(source_prim_path)]
+    while len(prims) > 0:
+        prim = prims.pop(0)
+        if prim:
+            if prim.GetTypeName() in ["Mesh", "Capsule", "Sphere", "Box"]:
+                parent_prim = prim.GetParent()
+                if parent_prim and not parent_prim.IsInstance():
+                    parent_prim.GetReferences().AddReference(assetPath=instance_usd_path, primPath=str(parent_prim.GetPath()))
+                    parent_prim.SetInstanceable(True)
+                    continue
+
+            children_prims = prim.GetChildren()
+            prims = prims + children_prims
+
 def convert_asset_instanceable(asset_usd_path, source_prim_path, save_as_path=None, create_xforms=True):
     """ Makes all mesh/geometry prims instanceable.
         Can optionally add UsdGeom.Xform prim as parent for all mesh/geometry prims.
@@ -105,19 +137,7 @@ def convert_asset_instanceable(asset_usd_path, source_prim_path, save_as_path=No
     omni.usd.get_context().open_stage(asset_usd_path)
     stage = omni.usd.get_context().get_stage()
     
-    prims = [stage.GetPrimAtPath(source_prim_path)]
-    while len(prims) > 0:
-        prim = prims.pop(0)
-        if prim:
-            if prim.GetTypeName() in ["Mesh", "Capsule", "Sphere", "Box"]:
-                parent_prim = prim.GetParent()
-                if parent_prim and not parent_prim.IsInstance():
-                    parent_prim.GetReferences().AddReference(assetPath=instance_usd_path, primPath=str(parent_prim.GetPath()))
-                    parent_prim.SetInstanceable(True)
-                    continue
-
-            children_prims = prim.GetChildren()
-            prims = prims + children_prims
+    make_instanceable(stage, source_prim_path, instance_usd_path)
 
     if save_as_path is None:
         omni.usd.get_context().save_stage()
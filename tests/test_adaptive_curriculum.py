@@ -0,0 +1,70 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from omniisaacgymenvs.utils.adaptive_curriculum import AdaptiveCurriculum
+
+import torch
+
+
+def make_curriculum(**kwargs) -> AdaptiveCurriculum:
+    return AdaptiveCurriculum(
+        16, [(0.0, 4.0), (-1.0, 1.0)], [4, 2], device="cpu", **kwargs
+    )
+
+
+def test_samples_fall_in_their_bin():
+    curriculum = make_curriculum()
+    env_ids = torch.arange(16)
+    spawn = curriculum.sample(env_ids)
+    assert spawn.shape == (16, 2)
+    bins = curriculum.env_bins
+    # Bins are flattened with the last parameter varying fastest
+    assert torch.equal(spawn[:, 0].floor().long(), bins // 2)
+    assert torch.equal((spawn[:, 1] >= 0).long(), bins % 2)
+
+
+def test_probabilities_start_uniform_and_sum_to_one():
+    curriculum = make_curriculum()
+    p = curriculum.get_probabilities()
+    assert torch.allclose(p, torch.full((8,), 1 / 8))
+    curriculum.fast_success[0] = 1.0
+    assert torch.isclose(curriculum.get_probabilities().sum(), torch.tensor(1.0))
+
+
+def test_update_ignores_unsampled_environments():
+    curriculum = make_curriculum()
+    curriculum.update(torch.arange(16), torch.ones(16, dtype=torch.bool))
+    assert torch.all(curriculum.attempts == 0)
+    assert torch.all(curriculum.fast_success == 0)
+
+
+def test_update_moves_the_sampling_away_from_solved_bins():
+    curriculum = make_curriculum(ema=0.5, uniform_ratio=0.0)
+    env_ids = torch.arange(16)
+    curriculum.sample(env_ids)
+    bins = curriculum.env_bins.clone()
+    success = bins == bins[0]
+    curriculum.update(env_ids, success)
+    assert torch.all(curriculum.env_bins == -1)
+    assert curriculum.attempts.sum() == 16
+    assert curriculum.fast_success[bins[0]] == 0.5
+    p = curriculum.get_probabilities()
+    assert torch.all(p[bins[0]] <= p)
+    stats = curriculum.get_stats()
+    assert 0 < stats["curriculum/coverage"] <= 1
+    assert 0 < stats["curriculum/entropy"] <= 1
+
+
+def test_learning_progress_weights_the_gap_between_the_averages():
+    curriculum = make_curriculum(metric="learning_progress", uniform_ratio=0.0)
+    curriculum.fast_success[3] = 0.6
+    curriculum.slow_success[3] = 0.1
+    p = curriculum.get_probabilities()
+    assert p[3] == 1.0
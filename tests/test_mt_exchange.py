@@ -0,0 +1,66 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from omniisaacgymenvs.utils.mt_exchange import DoubleBufferExchange
+
+import torch
+
+
+def test_previous_step_stays_valid_while_the_next_is_written():
+    exchange = DoubleBufferExchange()
+    obs = torch.zeros(4, 3)
+    first = exchange.read(exchange.write({"obs": obs, "step": 0}))
+    obs += 1.0
+    second = exchange.read(exchange.write({"obs": obs, "step": 1}))
+    assert torch.equal(first["obs"], torch.zeros(4, 3)) and first["step"] == 0
+    assert torch.equal(second["obs"], torch.ones(4, 3)) and second["step"] == 1
+    obs += 1.0
+    third = exchange.read(exchange.write({"obs": obs, "step": 2}))
+    # The step after next reuses the buffers of the first one
+    assert third is first
+    assert torch.equal(first["obs"], torch.full((4, 3), 2.0))
+
+
+def test_nested_dicts_are_copied():
+    exchange = DoubleBufferExchange()
+    data = {"obs": {"state": torch.rand(2, 5), "masks": torch.ones(2, 8)}}
+    read = exchange.read(exchange.write(data))
+    assert read["obs"]["state"] is not data["obs"]["state"]
+    assert torch.equal(read["obs"]["state"], data["obs"]["state"])
+    data["obs"]["state"].zero_()
+    assert not torch.equal(read["obs"]["state"], data["obs"]["state"])
+
+
+def test_static_keys_are_only_copied_when_modified():
+    exchange = DoubleBufferExchange(static_keys=["masks"])
+    masks = torch.ones(2, 8)
+    sets = [exchange.read(exchange.write({"masks": masks})) for _ in range(2)]
+    # Marks the buffers, an unmodified source must not overwrite them
+    for buffers in sets:
+        buffers["masks"].fill_(5.0)
+    for buffers in sets:
+        assert exchange.read(exchange.write({"masks": masks})) is buffers
+        assert torch.all(buffers["masks"] == 5.0)
+    masks[0] = 0.0
+    for buffers in sets:
+        exchange.write({"masks": masks})
+        assert torch.equal(buffers["masks"], masks)
+    # A new source tensor is always copied
+    new_masks = torch.zeros(2, 8)
+    read = exchange.read(exchange.write({"masks": new_masks}))
+    assert torch.equal(read["masks"], new_masks)
+
+
+def test_layout_change_reallocates_the_buffers():
+    exchange = DoubleBufferExchange()
+    exchange.write({"obs": torch.zeros(4, 3)})
+    exchange.write({"obs": torch.zeros(4, 3)})
+    read = exchange.read(exchange.write({"obs": torch.ones(6, 3), "extra": 1}))
+    assert read["obs"].shape == (6, 3) and read["extra"] == 1
@@ -0,0 +1,141 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from omniisaacgymenvs.utils.domain_randomization.noise_engine import NoiseEngine
+
+import math
+import pytest
+import torch
+
+NUM_ENVS = 16
+DIM = 3
+
+
+def sample(distribution, params, size):
+    """Noise as drawn by the index-based randomization the engine replaced."""
+
+    if distribution in ["gaussian", "normal"]:
+        return torch.normal(mean=params[0], std=params[1], size=size)
+    elif distribution == "uniform":
+        return (params[1] - params[0]) * torch.rand(size) + params[0]
+    log_p0, log_p1 = math.log(params[0]), math.log(params[1])
+    return torch.exp((log_p1 - log_p0) * torch.rand(size) + log_p0)
+
+
+class IndexedNoise:
+    """Index-based randomization the engine replaced, one nonzero() per step."""
+
+    def __init__(self):
+        self.counter = torch.zeros(NUM_ENVS, dtype=torch.int)
+        self.correlated_noise = torch.zeros(NUM_ENVS, DIM)
+
+    def apply(self, buffer, reset_buf, dr_params):
+        env_ids = reset_buf.nonzero(as_tuple=False).squeeze(-1)
+        self.counter[env_ids] = 0
+        self.counter += 1
+        if "on_reset" in dr_params:
+            params = dr_params["on_reset"]
+            if len(env_ids) > 0:
+                self.correlated_noise[env_ids] = sample(
+                    params["distribution"],
+                    params["distribution_parameters"],
+                    (len(env_ids), DIM),
+                )
+            if params["operation"] == "additive":
+                buffer += self.correlated_noise
+            else:
+                buffer *= self.correlated_noise
+        if "on_interval" in dr_params:
+            params = dr_params["on_interval"]
+            ids = (self.counter >= params["frequency_interval"]).nonzero().squeeze(-1)
+            self.counter[ids] = 0
+            noise = sample(
+                params["distribution"],
+                params["distribution_parameters"],
+                (len(ids), DIM),
+            )
+            if params["operation"] == "additive":
+                buffer[ids] += noise
+            else:
+                buffer[ids] *= noise
+        return buffer
+
+
+def make_params(distribution, operation, reset_value, interval_value):
+    # Degenerate distributions, such that both paths draw the same noise
+    if distribution == "gaussian":
+        reset_params, interval_params = [reset_value, 0.0], [interval_value, 0.0]
+    else:
+        reset_params = [reset_value, reset_value]
+        interval_params = [interval_value, interval_value]
+    return {
+        "on_reset": {
+            "operation": operation,
+            "distribution": distribution,
+            "distribution_parameters": reset_params,
+        },
+        "on_interval": {
+            "frequency_interval": 3,
+            "operation": operation,
+            "distribution": distribution,
+            "distribution_parameters": interval_params,
+        },
+    }
+
+
+@pytest.mark.parametrize("distribution", ["gaussian", "uniform", "loguniform"])
+@pytest.mark.parametrize("operation", ["additive", "scaling"])
+def test_matches_the_indexed_randomization(distribution, operation):
+    torch.manual_seed(0)
+    dr_params = make_params(distribution, operation, 1.5, 0.5)
+    engine = NoiseEngine(NUM_ENVS, DIM, "cpu", seed=0, block_size=4)
+    reference = IndexedNoise()
+    for step in range(12):
+        reset_buf = (torch.rand(NUM_ENVS) < 0.2).long()
+        if step == 0:
+            reset_buf[:] = 1
+        buffer = torch.rand(NUM_ENVS, DIM)
+        expected = reference.apply(buffer.clone(), reset_buf, dr_params)
+        result = engine.apply(buffer, reset_buf, dr_params)
+        assert result is buffer
+        assert torch.allclose(result, expected)
+
+
+def test_noise_follows_the_distribution_parameters():
+    dr_params = {
+        "on_reset": {
+            "operation": "additive",
+            "distribution": "gaussian",
+            "distribution_parameters": [1.0, 0.5],
+        },
+    }
+    engine = NoiseEngine(4096, DIM, "cpu", seed=0)
+    noise = engine.apply(torch.zeros(4096, DIM), torch.ones(4096), dr_params)
+    assert abs(noise.mean().item() - 1.0) < 0.05
+    assert abs(noise.std().item() - 0.5) < 0.05
+    # The correlated noise is kept until the next reset
+    kept = engine.apply(torch.zeros(4096, DIM), torch.zeros(4096), dr_params)
+    assert torch.equal(kept, noise)
+
+
+def test_noise_is_reproducible_per_seed():
+    dr_params = make_params("uniform", "additive", 0.0, 0.0)
+    dr_params["on_interval"]["distribution_parameters"] = [-1.0, 1.0]
+    dr_params["on_interval"]["frequency_interval"] = 1
+    runs = []
+    for _ in range(2):
+        engine = NoiseEngine(NUM_ENVS, DIM, "cpu", seed=7, block_size=2)
+        buffers = [torch.zeros(NUM_ENVS, DIM) for _ in range(5)]
+        runs.append(
+            [engine.apply(b, torch.zeros(NUM_ENVS), dr_params) for b in buffers]
+        )
+    for first, second in zip(*runs):
+        assert torch.equal(first, second)
+        assert torch.all((first >= -1.0) & (first <= 1.0))
@@ -0,0 +1,48 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from omniisaacgymenvs.utils.observation_history import ObservationHistory
+
+import torch
+
+
+def test_history_matches_a_concatenation_of_the_last_observations():
+    num_envs, dim, length = 4, 3, 5
+    history = ObservationHistory(num_envs, dim, length, "cpu")
+    reference = [torch.zeros(num_envs, dim)] * length
+    for step in range(2 * length + 3):
+        obs = torch.rand(num_envs, dim)
+        reference = reference[1:] + [obs]
+        assert torch.equal(history.push(obs), torch.cat(reference, dim=-1))
+
+
+def test_history_is_a_view_of_the_buffer():
+    history = ObservationHistory(2, 3, 4, "cpu")
+    window = history.push(torch.ones(2, 3))
+    history._buffer += 1.0
+    assert torch.equal(window[:, -3:], torch.full((2, 3), 2.0))
+
+
+def test_reset_only_zeroes_the_given_environments():
+    history = ObservationHistory(3, 2, 2, "cpu")
+    history.push(torch.ones(3, 2))
+    history.push(torch.full((3, 2), 2.0))
+    history.reset(torch.tensor([1]))
+    window = history.get()
+    assert torch.equal(window[1], torch.zeros(4))
+    assert torch.equal(window[0], torch.tensor([1.0, 1.0, 2.0, 2.0]))
+    history.push(torch.full((3, 2), 3.0))
+    assert torch.equal(history.get()[1], torch.tensor([0.0, 0.0, 3.0, 3.0]))
+
+
+def test_length_one_keeps_the_current_observation():
+    history = ObservationHistory(2, 3, 1, "cpu")
+    obs = torch.rand(2, 3)
+    assert torch.equal(history.push(obs), obs)
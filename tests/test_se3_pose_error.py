@@ -0,0 +1,91 @@
+__author__ = "Antoine Richard, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Antoine Richard"
+__email__ = "antoine.richard@uni.lu"
+__status__ = "development"
+
+from omniisaacgymenvs.tasks.virtual_floating_platform.MFP3D_core import (
+    quat_to_mat,
+    se3_pose_error,
+    REWARD_MODES,
+)
+from omniisaacgymenvs.tasks.virtual_floating_platform.MFP3D_task_rewards import (
+    GoToPoseReward,
+)
+
+import pytest
+import torch
+
+NUM_ENVS = 64
+
+
+def random_rotations(num: int) -> torch.Tensor:
+    quat = torch.randn(num, 4, dtype=torch.float64)
+    return quat_to_mat(quat / quat.norm(dim=-1, keepdim=True))
+
+
+@pytest.mark.parametrize("mode", ["linear", "square", "exponential"])
+def test_matches_the_go_to_pose_reward(mode):
+    torch.manual_seed(0)
+    position = torch.randn(NUM_ENVS, 3, dtype=torch.float64)
+    target_position = torch.randn(NUM_ENVS, 3, dtype=torch.float64)
+    rotation = random_rotations(NUM_ENVS)
+    target_rotation = random_rotations(NUM_ENVS)
+    reward = GoToPoseReward(
+        position_reward_mode=mode,
+        heading_reward_mode=mode,
+        position_scale=2.0,
+        heading_scale=0.5,
+    )
+
+    # Reference: the full relative rotation, as computed by the GoToPose task
+    ref_position_error = target_position - position
+    ref_heading_error = torch.bmm(rotation.transpose(-2, -1), target_rotation)
+    ref_position_dist = torch.sqrt(torch.square(ref_position_error).sum(-1))
+    trace = ref_heading_error.diagonal(dim1=-2, dim2=-1).sum(-1)
+    ref_heading_dist = torch.arccos(torch.clamp((trace - 1) / 2, -1.0, 1.0))
+    ref_position_reward, ref_heading_reward = reward.compute_reward(
+        None, None, ref_position_dist, ref_heading_dist
+    )
+
+    task_data = torch.zeros(NUM_ENVS, 9, dtype=torch.float64)
+    (
+        position_error,
+        position_dist,
+        heading_dist,
+        position_reward,
+        heading_reward,
+    ) = se3_pose_error(
+        position,
+        rotation,
+        target_position,
+        target_rotation,
+        task_data,
+        REWARD_MODES[mode],
+        REWARD_MODES[mode],
+        reward.position_scale,
+        reward.heading_scale,
+    )
+    assert torch.allclose(position_error, ref_position_error)
+    assert torch.allclose(task_data[:, :3], ref_position_error)
+    assert torch.allclose(task_data[:, 3:], ref_heading_error[:, :2].reshape(-1, 6))
+    assert torch.allclose(position_dist, ref_position_dist)
+    assert torch.allclose(heading_dist, ref_heading_dist)
+    assert torch.allclose(position_reward, ref_position_reward)
+    assert torch.allclose(heading_reward, ref_heading_reward)
+
+
+def test_identical_rotations_have_no_heading_distance():
+    rotation = random_rotations(NUM_ENVS).float()
+    position = torch.zeros(NUM_ENVS, 3)
+    task_data = torch.zeros(NUM_ENVS, 9)
+    heading_dist = se3_pose_error(
+        position, rotation, position, rotation, task_data, 0, 0, 1.0, 1.0
+    )[2]
+    # Rounding can push the trace above 3, the clamp keeps the distance finite
+    assert torch.all(torch.isfinite(heading_dist))
+    assert torch.all(heading_dist < 1e-2)
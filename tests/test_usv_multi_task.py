@@ -0,0 +1,113 @@
+__author__ = "Antoine Richard, Junghwan Ro, Matteo El Hariry"
+__copyright__ = (
+    "Copyright 2023, Space Robotics Lab, SnT, University of Luxembourg, SpaceR"
+)
+__license__ = "GPL"
+__version__ = "1.0.0"
+__maintainer__ = "Junghwan Ro"
+__email__ = "jro37@gatech.edu"
+__status__ = "development"
+
+from omniisaacgymenvs.tasks.USV.USV_multi_task import MultiTask, TASK_IDS
+
+import torch
+
+NUM_ENVS = 8
+
+
+class ConstantTask:
+    """
+    Task returning its index everywhere, and recording the environments it sees."""
+
+    def __init__(self, task_dict: dict, reward_dict: dict, num_envs: int, device):
+        self._value = float(task_dict["value"])
+        self._num_observations = 11
+        self._goal_reached = torch.full((num_envs,), self._value)
+        self.disturbance_scale = None
+        self.reset_ids = []
+        self.spawn_ids = []
+
+    def create_stats(self, stats: dict) -> dict:
+        if "reward" not in stats:
+            stats["reward"] = torch.zeros(NUM_ENVS)
+        return stats
+
+    def get_state_observations(self, current_state, observation_frame):
+        return torch.full((NUM_ENVS, 11), self._value)
+
+    def compute_reward(self, current_state, actions):
+        return torch.full((NUM_ENVS,), self._value)
+
+    def update_kills(self, step):
+        return torch.zeros(NUM_ENVS)
+
+    def update_statistics(self, stats: dict) -> dict:
+        stats["reward"] += self._value
+        return stats
+
+    def reset(self, env_ids):
+        self.reset_ids.append(env_ids.clone())
+
+    def get_spawns(self, env_ids, initial_position, initial_orientation, step=0):
+        self.spawn_ids.append(env_ids.clone())
+        initial_position[env_ids, 0] = self._value
+        return initial_position, initial_orientation
+
+    def get_curriculum_stats(self):
+        return {}
+
+
+class ConstantFactory:
+    def get(self, task_dict, reward_dict, num_envs, device):
+        return ConstantTask(task_dict, reward_dict, num_envs, device)
+
+
+def make_multi_task() -> MultiTask:
+    names = ["CaptureXY", "GoToPose"]
+    task_param = {"tasks": [{"name": n, "value": i} for i, n in enumerate(names)]}
+    reward_param = {"tasks": [{"name": n} for n in names]}
+    task = MultiTask(task_param, reward_param, NUM_ENVS, "cpu", ConstantFactory())
+    task._task_ids = torch.tensor([0, 1, 0, 1, 1, 0, 0, 1])
+    return task
+
+
+def test_select_picks_the_task_of_every_environment():
+    task = make_multi_task()
+    reward = task.compute_reward(None, None)
+    assert torch.equal(reward, task._task_ids.float())
+
+
+def test_observations_carry_the_task_dict_label():
+    task = make_multi_task()
+    obs = task.get_state_observations({}, "world")
+    labels = torch.tensor([TASK_IDS["CaptureXY"], TASK_IDS["GoToPose"]])
+    assert torch.equal(obs[:, 5], labels[task._task_ids].float())
+
+
+def test_tasks_only_see_their_environments():
+    task = make_multi_task()
+    env_ids = torch.tensor([0, 1, 2])
+    task.reset(env_ids)
+    assert torch.equal(task._tasks[0].reset_ids[0], torch.tensor([0, 2]))
+    assert torch.equal(task._tasks[1].reset_ids[0], torch.tensor([1]))
+    position, _ = task.get_spawns(env_ids, torch.zeros(NUM_ENVS, 3), None)
+    for i, sub_task in enumerate(task._tasks):
+        seen = torch.cat(sub_task.spawn_ids)
+        assert torch.all(task._task_ids[seen] == i)
+        assert torch.all(position[seen, 0] == i)
+
+
+def test_per_task_statistics():
+    task = make_multi_task()
+    stats = task.update_statistics(task.create_stats({}))
+    assert torch.equal(stats["reward"], task._task_ids.float())
+    task.compute_reward(None, None)
+    task.update_statistics(stats)
+    task._in_tolerance[:] = task._task_ids == 0
+    ids = task._task_ids.clone()
+    task.reset(torch.arange(NUM_ENVS))
+    episode = task.get_curriculum_stats()
+    assert torch.equal(episode["CaptureXY_success_rate"], torch.ones(4))
+    assert torch.equal(episode["GoToPose_success_rate"], torch.zeros(4))
+    assert torch.equal(episode["GoToPose_reward"], torch.full((4,), 0.5))
+    assert int((ids == 0).sum()) == len(episode["CaptureXY_reward"])